@@ -0,0 +1,298 @@
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from predictor_avansat import AWAY_STATS, DEFAULT_DATA_PATH, DEFAULT_MODEL_PATH, FEATURES, HOME_STATS
+from staking import cap_exposure, kelly_fractions, pick_bets
+
+# Casele de pariuri din fișierele football-data.co.uk: cotele de deschidere sunt <casă>H/D/A,
+# cele de închidere <casă>CH/CD/CA
+BOOKMAKERS = ('B365', 'BW', 'PS', 'WH', '1XB', 'Max', 'Avg')
+RESULTS = ('H', 'D', 'A')
+
+
+def load_seasons(paths) -> pd.DataFrame:
+    """
+    Citește unul sau mai multe fișiere în formatul E0.csv (câte un sezon) într-un singur tabel,
+    cu coloana `season` (indicele fișierului), ordonat cronologic în cadrul fiecărui sezon.
+    """
+    frames = []
+    for season, path in enumerate(paths):
+        data = pd.read_csv(path, encoding='utf-8-sig')
+        data = data[data['FTR'].isin(RESULTS)].copy()
+        data['season'] = season
+        data['kickoff'] = pd.to_datetime(data['Date'], dayfirst=True, format='mixed')
+        frames.append(data.sort_values('kickoff', kind='stable'))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _pre_match_means(data: pd.DataFrame, team_col: str, stats):
+    """
+    Pentru fiecare meci, media statisticilor `stats` din meciurile anterioare ale echipei din
+    `team_col` în același sezon (doar acasă pentru gazde, doar în deplasare pentru oaspeți).
+    Meciul curent este scăzut din suma cumulată, deci nu intră niciodată în propria medie.
+    Întoarce (medii, numărul de meciuri anterioare).
+    """
+    values = data[stats].astype(float)
+    present = values.notna()
+    groups = [data['season'], data[team_col]]
+    sums = values.fillna(0.0).groupby(groups).cumsum() - values.fillna(0.0)
+    counts = present.astype(int).groupby(groups).cumsum() - present.astype(int)
+    return sums / counts.where(counts > 0), data.groupby(groups).cumcount().to_numpy()
+
+
+def upcoming_means(data: pd.DataFrame, team_col: str, stats):
+    """
+    Mediile cu care pre_match_features ar descrie următorul meci al fiecărei echipe din ultimul
+    sezon (acasă pentru gazde, în deplasare pentru oaspeți): fiecărei echipe i se adaugă un meci
+    viitor fără statistici și i se aplică aceeași medie cumulată. Folosit la servire
+    (PredictorAvansat), ca modelul să primească aceleași caracteristici ca la antrenare.
+    Întoarce (medii indexate după echipă, numărul de meciuri anterioare).
+    """
+    season = data[data['season'] == data['season'].iloc[-1]]
+    teams = pd.unique(season[team_col])
+    upcoming = pd.DataFrame({'season': season['season'].iloc[-1], team_col: teams})
+    extended = pd.concat([season[['season', team_col] + list(stats)], upcoming], ignore_index=True)
+    means, played = _pre_match_means(extended, team_col, stats)
+    index = pd.Index(teams, name=team_col)
+    return means.iloc[len(season):].set_index(index), pd.Series(played[len(season):], index=index)
+
+
+def pre_match_features(data: pd.DataFrame, min_history: int = 3):
+    """
+    Caracteristicile modelului (FEATURES) calculate doar din meciurile jucate înaintea fiecărui
+    meci, în aceeași formă ca PredictorAvansat._feature_frame (care le ia din upcoming_means).
+    Al doilea rezultat marchează meciurile la care ambele echipe au cel puțin
+    `min_history` meciuri anterioare (acasă, respectiv în deplasare).
+    """
+    home, home_played = _pre_match_means(data, 'HomeTeam', HOME_STATS + ['B365D'])
+    away, away_played = _pre_match_means(data, 'AwayTeam', AWAY_STATS + ['B365D'])
+    columns = {'HomeTeam': data['HomeTeam'].to_numpy(), 'AwayTeam': data['AwayTeam'].to_numpy()}
+    columns.update({c: home[c].to_numpy() for c in HOME_STATS})
+    columns.update({c: away[c].to_numpy() for c in AWAY_STATS})
+    columns['B365D'] = (home['B365D'].to_numpy() + away['B365D'].to_numpy()) / 2
+    frame = pd.DataFrame(columns, columns=FEATURES)
+    ready = (home_played >= min_history) & (away_played >= min_history)
+    return frame, ready & frame[FEATURES[2:]].notna().all(axis=1).to_numpy()
+
+
+def _odds(data: pd.DataFrame, bookmakers, closing: bool = False) -> np.ndarray:
+    suffix = 'C' if closing else ''
+    odds = np.full((len(data), len(bookmakers), 3), np.nan)
+    for b, bookmaker in enumerate(bookmakers):
+        for k, result in enumerate(RESULTS):
+            column = f"{bookmaker}{suffix}{result}"
+            if column in data:
+                odds[:, b, k] = pd.to_numeric(data[column], errors='coerce').to_numpy()
+    return np.where(odds > 1.0, odds, np.nan)
+
+
+def _max_drawdown(curve: np.ndarray) -> float:
+    if not len(curve):
+        return 0.0
+    peaks = np.maximum.accumulate(np.concatenate([[curve[0]], curve]))[1:]
+    return float((1.0 - curve / peaks).max()) if (peaks > 0).all() else 1.0
+
+
+class Backtest:
+    """
+    Reia cronologic unul sau mai multe sezoane: probabilitățile modelului sunt calculate o singură
+    dată, cu un predict_proba pe caracteristicile de dinaintea fiecărui meci, apoi orice regulă
+    de pariere (prag de valoare, miză fixă sau Kelly fracționar, casa de pariuri) este evaluată
+    prin operații pe matricele (meciuri x case x 3) de cote de deschidere și închidere.
+    Implicit probabilitățile vin din reantrenarea walk-forward din train_predictor (fiecare meci
+    este prezis de un model antrenat doar pe meciurile terminate înaintea lui); un `model` dat
+    explicit (de exemplu predictor_avansat.pkl, antrenat pe E0.csv, cu --in-sample) este folosit
+    ca atare, deci rezultatul este în afara eșantionului doar dacă modelul nu a văzut sezoanele.
+    """
+
+    def __init__(self, data: pd.DataFrame, probs: np.ndarray, bookmakers=BOOKMAKERS):
+        self.data = data
+        self.probs = probs
+        self.bookmakers = [b for b in bookmakers if f"{b}H" in data]
+        self.opening = _odds(data, self.bookmakers)
+        self.closing = _odds(data, self.bookmakers, closing=True)
+        self.outcome = data['FTR'].map({r: k for k, r in enumerate(RESULTS)}).to_numpy()
+        self.season = data['season'].to_numpy()
+        # Indicele zilei de joc (crescător în timp, peste toate sezoanele) pentru evoluția băncii
+        days = data['season'].astype('int64') * 1_000_000 + data['kickoff'].map(pd.Timestamp.toordinal)
+        self.day = np.unique(days.to_numpy(), return_inverse=True)[1]
+
+    @classmethod
+    def from_csv(cls, paths=(DEFAULT_DATA_PATH,), model=None, min_history: int = 3, bookmakers=BOOKMAKERS,
+                 step_days: int = 7):
+        data = load_seasons(paths)
+        if model is None:
+            # Import târziu: train_predictor importă la rândul lui din acest modul
+            from train_predictor import walk_forward
+            probs, _ = walk_forward(data, step_days=step_days, pre_match=True)
+            return cls(data, probs, bookmakers)
+        frame, ready = pre_match_features(data, min_history)
+        probs = np.full((len(data), 3), np.nan)
+        if ready.any():
+            columns = [list(model.classes_).index(r) for r in RESULTS]
+            probs[ready] = model.predict_proba(frame[ready])[:, columns]
+        return cls(data, probs, bookmakers)
+
+    def _bets(self, b: int, min_edge: float):
+        odds = self.opening[:, b]
+        choice, p, o, edge = pick_bets(self.probs, odds, min_edge)
+        rows = np.arange(len(choice))
+        bet = choice >= 0
+        won = bet & (choice == self.outcome)
+        ret = np.where(won, o - 1.0, -1.0) * bet
+        close = self.closing[rows, b, choice]
+        with np.errstate(invalid='ignore'):
+            clv = np.where(bet & ~np.isnan(close), o / close - 1.0, np.nan)
+        return choice, p, o, edge, bet, won, ret, clv
+
+    def run(self, bookmaker: str = 'Avg', min_edge: float = 0.02, staking: str = 'flat',
+            fraction: float = 0.25, max_bet: float = 0.05, max_total: float = 0.25,
+            units: float = 100.0) -> dict:
+        """
+        O singură regulă: la fiecare meci pariem pe rezultatul cu cea mai mare valoare așteptată
+        la cotele de deschidere ale casei `bookmaker`, dacă depășește `min_edge`. Miza este o
+        unitate dintr-o bancă de `units` unități ('flat') sau Kelly fracționar ('kelly', plafonat
+        la `max_bet` din bancă per pariu și la `max_total` pentru toate pariurile aceleiași zile,
+        cu staking.cap_exposure, iar banca este recalculată după fiecare zi de joc). Banca finală și
+        drawdown-ul sunt relative la banca inițială. CLV compară cota luată cu cota de închidere.
+        """
+        b = self.bookmakers.index(bookmaker)
+        choice, p, o, edge, bet, won, ret, clv = self._bets(b, min_edge)
+        if staking == 'kelly':
+            stake = cap_exposure(np.where(bet, kelly_fractions(p, o, fraction), 0.0), max_bet, max_total, self.day)
+            daily = np.bincount(self.day, weights=stake * ret, minlength=self.day.max() + 1)
+            curve = np.cumprod(1.0 + daily)
+        else:
+            stake = bet.astype(float)
+            curve = 1.0 + np.cumsum(np.bincount(self.day, weights=ret, minlength=self.day.max() + 1)) / units
+        turnover = stake.sum()
+        profit = (stake * ret).sum()
+        seasons = np.unique(self.season)
+        season_profit = np.bincount(self.season, weights=stake * ret, minlength=seasons.max() + 1)
+        season_turnover = np.bincount(self.season, weights=stake, minlength=seasons.max() + 1)
+        return {
+            'bookmaker': bookmaker,
+            'min_edge': min_edge,
+            'staking': staking if staking != 'kelly' else f"kelly {fraction:g}",
+            'matches': int((~np.isnan(self.probs[:, 0])).sum()),
+            'bets': int(bet.sum()),
+            'hit_rate': round(float(won.sum() / bet.sum()), 4) if bet.any() else None,
+            'avg_odds': round(float(o[bet].mean()), 3) if bet.any() else None,
+            'turnover': round(float(turnover), 4),
+            'profit': round(float(profit), 4),
+            'roi_pct': round(float(profit / turnover * 100), 2) if turnover else None,
+            'clv_pct': round(float(np.nanmean(clv) * 100), 2) if (~np.isnan(clv)).any() else None,
+            'beat_close_pct': round(float((clv[~np.isnan(clv)] > 0).mean() * 100), 1) if (~np.isnan(clv)).any() else None,
+            'final_bankroll': round(float(curve[-1]), 4),
+            'max_drawdown': round(_max_drawdown(curve), 4),
+            'roi_pct_by_season': [round(float(season_profit[s] / season_turnover[s] * 100), 2)
+                                  if season_turnover[s] else None for s in seasons],
+        }
+
+    def grid(self, min_edges=np.arange(0.0, 0.21, 0.01), fractions=(0.1, 0.25, 0.5), bookmakers=None,
+             max_bet: float = 0.05):
+        """
+        Evaluează toate combinațiile (casă, prag, regulă de miză) deodată: pentru fiecare casă,
+        alegerea pariului nu depinde de prag, deci profitul tuturor pragurilor și regulilor de
+        miză este un produs matriceal (praguri x meciuri) @ (meciuri x reguli). Regulile sunt
+        miza fixă și Kelly cu fiecare fracțiune din `fractions` (fără compunere, pentru ROI).
+        Întoarce lista de rezultate, ordonată descrescător după ROI.
+        """
+        min_edges = np.asarray(min_edges, dtype=float)
+        rules = ['flat'] + [f"kelly {f:g}" for f in fractions]
+        results = []
+        for bookmaker in bookmakers or self.bookmakers:
+            b = self.bookmakers.index(bookmaker)
+            choice, p, o, edge, bet, won, ret, clv = self._bets(b, -np.inf)
+            full_kelly = np.where(bet, kelly_fractions(p, o, 1.0), 0.0)
+            stakes = np.vstack([bet.astype(float)] + [np.minimum(f * full_kelly, max_bet) for f in fractions])
+
+            taken = (edge[None, :] > min_edges[:, None]) & bet[None, :]        # (praguri, meciuri)
+            taken_f = taken.astype(float)
+            profit = taken_f @ (stakes * ret).T                              # (praguri, reguli)
+            turnover = taken_f @ stakes.T
+            n_bets = taken.sum(axis=1)
+            wins = (taken & won[None, :]).sum(axis=1)
+            has_clv = ~np.isnan(clv)
+            clv_mean = (taken_f @ np.where(has_clv, clv, 0.0)) / np.maximum(taken_f @ has_clv, 1)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                roi = np.where(turnover > 0, profit / turnover * 100, np.nan)
+            for t, min_edge in enumerate(min_edges):
+                for r, rule in enumerate(rules):
+                    if not n_bets[t] or not turnover[t, r]:
+                        continue
+                    results.append({
+                        'bookmaker': bookmaker,
+                        'min_edge': round(float(min_edge), 4),
+                        'staking': rule,
+                        'bets': int(n_bets[t]),
+                        'hit_rate': round(float(wins[t] / n_bets[t]), 4),
+                        'roi_pct': round(float(roi[t, r]), 2),
+                        'profit': round(float(profit[t, r]), 4),
+                        'clv_pct': round(float(clv_mean[t] * 100), 2),
+                    })
+        results.sort(key=lambda r: r['roi_pct'], reverse=True)
+        return results
+
+    def calibration(self, bins: int = 10, market: str = 'PS') -> dict:
+        """
+        Calibrarea modelului pe meciurile prezise: scorul Brier, log loss și tabelul de fiabilitate
+        (probabilitatea medie prezisă vs frecvența observată pe `bins` intervale), comparate cu
+        probabilitățile implicite (fără marjă) din cotele de închidere ale casei `market`.
+        """
+        predicted = ~np.isnan(self.probs).any(axis=1)
+        y = np.eye(3)[self.outcome]
+
+        def scores(p, mask):
+            if not mask.any():
+                return None
+            p, target = p[mask], y[mask]
+            return {
+                'matches': int(mask.sum()),
+                'brier': round(float(((p - target) ** 2).sum(axis=1).mean()), 4),
+                'log_loss': round(float(-np.log(np.clip((p * target).sum(axis=1), 1e-15, 1)).mean()), 4),
+            }
+
+        report = {'model': scores(self.probs, predicted)}
+        if market in self.bookmakers:
+            inv = 1.0 / self.closing[:, self.bookmakers.index(market)]
+            implied = inv / inv.sum(axis=1, keepdims=True)
+            both = predicted & ~np.isnan(implied).any(axis=1)
+            report['model_same_matches'] = scores(self.probs, both)
+            report[f"market_{market}"] = scores(implied, both)
+
+        p, target = self.probs[predicted].ravel(), y[predicted].ravel()
+        which = np.minimum((p * bins).astype(int), bins - 1)
+        counts = np.bincount(which, minlength=bins)
+        mean_pred = np.bincount(which, weights=p, minlength=bins) / np.maximum(counts, 1)
+        observed = np.bincount(which, weights=target, minlength=bins) / np.maximum(counts, 1)
+        report['ece'] = round(float((counts * np.abs(mean_pred - observed)).sum() / max(counts.sum(), 1)), 4)
+        report['reliability'] = [{
+            'bin': f"{i / bins:.1f}-{(i + 1) / bins:.1f}",
+            'count': int(counts[i]),
+            'predicted': round(float(mean_pred[i]), 3),
+            'observed': round(float(observed[i]), 3),
+        } for i in range(bins) if counts[i]]
+        return report
+
+
+if __name__ == '__main__':
+    # python backtest.py [E0.csv E0_2023.csv ...] [--grid] [--in-sample]
+    args = sys.argv[1:]
+    show_grid = '--grid' in args
+    in_sample = '--in-sample' in args
+    paths = [a for a in args if a not in ('--grid', '--in-sample')] or [DEFAULT_DATA_PATH]
+
+    # --in-sample: modelul publicat (antrenat pe E0.csv), doar pentru comparație
+    bt = Backtest.from_csv(paths, model=joblib.load(DEFAULT_MODEL_PATH) if in_sample else None)
+    for bookmaker in ('Avg', 'PS', 'Max'):
+        for staking in ('flat', 'kelly'):
+            print(bt.run(bookmaker, staking=staking))
+    print(bt.calibration())
+    if show_grid:
+        for row in bt.grid()[:15]:
+            print(row)
@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest import Backtest
+from predictor_avansat import DEFAULT_DATA_PATH
+
+
+def make_seasons(directory, n, seed=0):
+    """
+    Scrie `n` sezoane sintetice pornind de la E0.csv: aceleași meciuri mutate cu câte un an,
+    în altă ordine și cu cotele perturbate, ca fiecare sezon să fie diferit. Rândurile sunt
+    amestecate întregi, deci fiecare rezultat rămâne cu cotele lui; datele sunt doar pentru
+    măsurarea timpilor, ROI-ul configurațiilor nu spune nimic despre o strategie.
+    """
+    rnd = np.random.default_rng(seed)
+    base = pd.read_csv(DEFAULT_DATA_PATH, encoding='utf-8-sig')
+    dates = pd.to_datetime(base['Date'], dayfirst=True)
+    odds_columns = [c for c in base.columns if c[-1] in 'HDA' and base[c].dtype.kind == 'f' and 'AH' not in c]
+    paths = []
+    for s in range(n):
+        season = base.iloc[rnd.permutation(len(base))].reset_index(drop=True)
+        season['Date'] = (dates - pd.DateOffset(years=s + 1)).dt.strftime('%d/%m/%Y')
+        season[odds_columns] = (season[odds_columns] * rnd.normal(1.0, 0.03, (len(season), len(odds_columns)))).round(2)
+        path = os.path.join(directory, f"E0_{s}.csv")
+        season.to_csv(path, index=False)
+        paths.append(path)
+    return paths
+
+
+if __name__ == '__main__':
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_seasons(tmp, seasons)
+
+        started = time.perf_counter()
+        bt = Backtest.from_csv(paths)
+        load_s = time.perf_counter() - started
+        print(f"{seasons} sezoane, {len(bt.data)} meciuri, {len(bt.bookmakers)} case: încărcare + predicții {load_s:.2f} s")
+
+        min_edges = np.arange(0.0, 0.21, 0.005)
+        fractions = (0.1, 0.25, 0.5, 1.0)
+        started = time.perf_counter()
+        results = bt.grid(min_edges, fractions)
+        grid_s = time.perf_counter() - started
+        print(f"grid vectorizat: {len(results)} configurații în {grid_s:.3f} s")
+
+        # Aceeași căutare cu câte un backtest complet per configurație, pe un eșantion
+        configs = [(b, e, f) for b in bt.bookmakers for e in min_edges for f in fractions][:200]
+        started = time.perf_counter()
+        for bookmaker, min_edge, fraction in configs:
+            bt.run(bookmaker, float(min_edge), 'kelly', fraction)
+        loop_s = (time.perf_counter() - started) / len(configs) * len(results)
+        print(f"o rulare per configurație (extrapolat): {loop_s:.2f} s  ({loop_s / grid_s:.0f}x mai lent)")
@@ -0,0 +1,61 @@
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from predictor_avansat import MODEL_DIR, PredictorAvansat
+
+
+def make_fixtures(teams, n, seed=0):
+    rnd = random.Random(seed)
+    fixtures = [tuple(rnd.sample(teams, 2)) for _ in range(n)]
+    # Câteva nume necunoscute, ca să măsurăm și raportarea erorilor per rând
+    for i in range(0, n, 97):
+        fixtures[i] = ('Echipa Necunoscută', fixtures[i][1])
+    return fixtures
+
+
+def cli_seconds_per_call(fixtures, samples):
+    """
+    Timpul mediu al unui apel `python predict_match.py <home> <away>` (proces nou de fiecare dată).
+    Rulăm doar `samples` apeluri și extrapolăm, altfel benchmark-ul ar dura minute întregi.
+    """
+    script = os.path.join(MODEL_DIR, 'predict_match.py')
+    with tempfile.TemporaryDirectory() as cwd:
+        started = time.perf_counter()
+        for home, away in fixtures[:samples]:
+            subprocess.run([sys.executable, script, home, away], cwd=cwd, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return (time.perf_counter() - started) / samples
+
+
+if __name__ == '__main__':
+    # python bench_batch_predict.py [număr_meciuri] [apeluri_cli_măsurate]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    started = time.perf_counter()
+    predictor = PredictorAvansat()
+    load_time = time.perf_counter() - started
+    fixtures = make_fixtures(sorted(predictor.teams), n)
+
+    per_call = cli_seconds_per_call(fixtures, samples)
+    print(f"CLI (proces per meci)      {per_call * n:9.2f} s  (extrapolat din {samples} apeluri, {per_call * 1000:.0f} ms/apel)")
+
+    started = time.perf_counter()
+    for home, away in fixtures:
+        try:
+            predictor.predict(home, away)
+        except ValueError:
+            pass
+    loop_time = time.perf_counter() - started
+    print(f"predict() în buclă         {loop_time:9.2f} s  (model deja încărcat)")
+
+    started = time.perf_counter()
+    results = list(predictor.predict_many(fixtures))
+    batch_time = time.perf_counter() - started
+    errors = sum('error' in r for r in results)
+    print(f"predict_many()             {batch_time:9.3f} s  (+{load_time:.2f} s încărcare model; {errors} erori raportate)")
+    print(f"Accelerare față de CLI: {per_call * n / (batch_time + load_time):.0f}x")
@@ -0,0 +1,260 @@
+import ast
+import math
+import os
+import struct
+import sys
+import zipfile
+from array import array
+
+from predictor_avansat import (AWAY_STATS, DEFAULT_DATA_PATH, DEFAULT_MODEL_PATH, FEATURES, HOME_STATS,
+                               MODEL_DIR, PredictorAvansat, check_feature_mode, file_sha256, get_index)
+
+DEFAULT_COMPILED_PATH = os.path.join(MODEL_DIR, 'predictor_avansat.npz')
+
+
+def export_model(model_path: str = DEFAULT_MODEL_PATH, data_path: str = DEFAULT_DATA_PATH,
+                 output: str = DEFAULT_COMPILED_PATH) -> str:
+    """
+    Compilează pipeline-ul din .pkl (OneHotEncoder pe echipe + StandardScaler pe statistici +
+    LogisticRegression) și mediile echipelor din E0.csv într-un .npz cu doar tabele simple:
+    categoriile encoder-ului, media/scala scaler-ului, coeficienții și mediile pe echipe.
+    Singurul pas care are nevoie de scikit-learn și NumPy; CompiledPredictor citește rezultatul
+    fără ele. Artefactul este verificat cu check_parity înainte de a înlocui fișierul `output`.
+    """
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+
+    predictor = PredictorAvansat(model_path, data_path)
+    columns, classifier = predictor.model[0], predictor.model[-1]
+    transformers = {name: (transformer, list(cols)) for name, transformer, cols in columns.transformers_
+                    if transformer != 'drop'}
+    encoder, team_columns = transformers.get('teams', (None, None))
+    scaler, stat_columns = transformers.get('stats', (None, None))
+    if (encoder is None or scaler is None or len(transformers) != 2 or team_columns != FEATURES[:2]
+            or getattr(encoder, 'drop', None) is not None or not _is_softmax(classifier, LogisticRegression)):
+        raise ValueError("Pipeline neacceptat: se compilează doar OneHotEncoder + StandardScaler + "
+                         "LogisticRegression multinomială")
+
+    teams = sorted(predictor.teams)
+    arrays = {
+        'classes': np.array([str(c) for c in classifier.classes_]),
+        'home_categories': np.array([str(c) for c in encoder.categories_[0]]),
+        'away_categories': np.array([str(c) for c in encoder.categories_[1]]),
+        'stat_columns': np.array(stat_columns),
+        'mean': scaler.mean_.astype(np.float64),
+        'scale': scaler.scale_.astype(np.float64),
+        'coef': classifier.coef_.astype(np.float64),
+        'intercept': classifier.intercept_.astype(np.float64),
+        'teams': np.array(teams),
+        'home_stat_columns': np.array(HOME_STATS + ['B365D']),
+        'away_stat_columns': np.array(AWAY_STATS + ['B365D']),
+        'home_stats': predictor.home_stats.loc[teams].to_numpy(np.float64),
+        'away_stats': predictor.away_stats.loc[teams].to_numpy(np.float64),
+        # Din ce a fost compilat, ca load_predictor să recunoască un artefact învechit
+        'source_sha256': np.array([file_sha256(model_path), file_sha256(data_path)]),
+    }
+    tmp_path = output + '.tmp.npz'
+    np.savez(tmp_path, **{name: np.ascontiguousarray(a) for name, a in arrays.items()})
+    parity = check_parity(tmp_path, model_path, data_path)
+    if not parity['ok']:
+        os.remove(tmp_path)
+        raise ValueError(f"Artefactul compilat diferă de pipeline-ul original: {parity}")
+    os.replace(tmp_path, output)
+    return output
+
+
+def _is_softmax(classifier, logistic_regression) -> bool:
+    """
+    CompiledPredictor aplică softmax peste toți coeficienții, ceea ce reproduce doar o
+    LogisticRegression multinomială cu cel puțin trei clase. One-vs-rest (multi_class='ovr'
+    sau solver-ul liblinear) ori alt estimator ar da alte probabilități.
+    """
+    if type(classifier) is not logistic_regression or len(classifier.classes_) < 3:
+        return False
+    if classifier.coef_.shape[0] != len(classifier.classes_):
+        return False
+    multi_class = getattr(classifier, 'multi_class', 'auto')
+    return multi_class == 'multinomial' or (multi_class in ('auto', 'deprecated') and classifier.solver != 'liblinear')
+
+
+def _read_npy(data: bytes):
+    """
+    Citește un .npy din arhivă fără NumPy, pentru tipurile scrise de export_model:
+    float64 ('<f8') și șiruri Unicode ('<U..'), 1D sau 2D (2D devine listă de rânduri).
+    """
+    if data[:6] != b'\x93NUMPY':
+        raise ValueError("Fișier .npy invalid")
+    if data[6] == 1:
+        header_len, start = struct.unpack('<H', data[8:10])[0], 10
+    else:
+        header_len, start = struct.unpack('<I', data[8:12])[0], 12
+    header = ast.literal_eval(data[start:start + header_len].decode('latin1'))
+    body = data[start + header_len:]
+    descr, shape = header['descr'], header['shape']
+    if header['fortran_order']:
+        raise ValueError("Ordinea Fortran nu este acceptată")
+
+    if descr == '<f8':
+        values = array('d', body)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        values = values.tolist()
+    elif descr.startswith('<U'):
+        width = int(descr[2:]) * 4
+        values = [body[i:i + width].decode('utf-32-le').rstrip('\x00') for i in range(0, len(body), width)]
+    else:
+        raise ValueError(f"Tip neacceptat în artefact: {descr}")
+
+    if len(shape) == 2:
+        rows, cols = shape
+        return [values[r * cols:(r + 1) * cols] for r in range(rows)]
+    return values
+
+
+class CompiledPredictor(PredictorAvansat):
+    """
+    Același API ca PredictorAvansat (canonical_team, probabilities, predict, predict_many),
+    dar pornind din artefactul .npz: încărcarea folosește doar biblioteca standard, iar o
+    predicție este un produs scalar pe câteva zeci de coeficienți. NumPy este importat
+    doar de proba_matrix, pentru loturi.
+    """
+
+    def __init__(self, path: str = DEFAULT_COMPILED_PATH):
+        with zipfile.ZipFile(path) as archive:
+            arrays = {os.path.splitext(name)[0]: _read_npy(archive.read(name)) for name in archive.namelist()}
+        self.model_path = path
+        self.source_sha256 = arrays['source_sha256']
+        self.classes = arrays['classes']
+        self.coef = arrays['coef']
+        self.intercept = arrays['intercept']
+        self.mean, self.scale = arrays['mean'], arrays['scale']
+
+        # Coloanele one-hot: gazdele primele, apoi oaspeții, apoi statisticile standardizate
+        n_home = len(arrays['home_categories'])
+        self._home_col = {team: i for i, team in enumerate(arrays['home_categories'])}
+        self._away_col = {team: n_home + i for i, team in enumerate(arrays['away_categories'])}
+        self._stats_offset = n_home + len(arrays['away_categories'])
+
+        home_cols = {c: i for i, c in enumerate(arrays['home_stat_columns'])}
+        away_cols = {c: i for i, c in enumerate(arrays['away_stat_columns'])}
+        # Pentru fiecare statistică: (sursa, indicele); B365D este media celor două echipe
+        self._stat_source = [('both', home_cols[c]) if c == 'B365D' else
+                             ('home', home_cols[c]) if c in home_cols else ('away', away_cols[c])
+                             for c in arrays['stat_columns']]
+        self._home_stats = dict(zip(arrays['teams'], arrays['home_stats']))
+        self._away_stats = dict(zip(arrays['teams'], arrays['away_stats']))
+        self.teams = set(arrays['teams'])
+        self.team_index = get_index()
+
+    def _stat_vector(self, home: str, away: str):
+        h, a = self._home_stats[home], self._away_stats[away]
+        values = []
+        for (source, i), mean, scale in zip(self._stat_source, self.mean, self.scale):
+            x = h[i] if source == 'home' else a[i] if source == 'away' else (h[i] + a[i]) / 2
+            values.append((x - mean) / scale)
+        return values
+
+    def probabilities(self, home: str, away: str) -> dict:
+        home, away = self.canonical_pair(home, away)
+        stats = self._stat_vector(home, away)
+        home_col, away_col, offset = self._home_col.get(home), self._away_col.get(away), self._stats_offset
+        logits = []
+        for coef, intercept in zip(self.coef, self.intercept):
+            z = intercept + sum(c * x for c, x in zip(coef[offset:], stats))
+            if home_col is not None:
+                z += coef[home_col]
+            if away_col is not None:
+                z += coef[away_col]
+            logits.append(z)
+        top = max(logits)
+        exp = [math.exp(z - top) for z in logits]
+        total = sum(exp)
+        return {label: e / total for label, e in zip(self.classes, exp)}
+
+    def proba_matrix(self, fixtures, order=('H', 'D', 'A')):
+        import numpy as np
+
+        if not hasattr(self, '_coef_np'):
+            self._coef_np = np.array(self.coef)
+            self._intercept_np = np.array(self.intercept)
+        proba = np.full((len(fixtures), len(order)), np.nan)
+        errors, valid = {}, []
+        for pos, (home, away) in enumerate(fixtures):
+            try:
+                valid.append((pos, *self.canonical_pair(home, away)))
+            except ValueError as e:
+                errors[pos] = str(e)
+        if valid:
+            positions = [v[0] for v in valid]
+            onehot_home = [self._home_col.get(h, -1) for _, h, _ in valid]
+            onehot_away = [self._away_col.get(a, -1) for _, _, a in valid]
+            stats = np.array([self._stat_vector(h, a) for _, h, a in valid])
+            logits = stats @ self._coef_np[:, self._stats_offset:].T + self._intercept_np
+            for cols in (np.array(onehot_home), np.array(onehot_away)):
+                known = cols >= 0
+                logits[known] += self._coef_np[:, cols[known]].T
+            logits -= logits.max(axis=1, keepdims=True)
+            exp = np.exp(logits)
+            columns = [self.classes.index(label) for label in order]
+            proba[positions] = (exp / exp.sum(axis=1, keepdims=True))[:, columns]
+        return proba, errors
+
+
+def load_predictor(model_path: str = DEFAULT_MODEL_PATH, compiled_path: str = DEFAULT_COMPILED_PATH,
+                   data_path: str = DEFAULT_DATA_PATH):
+    """
+    CompiledPredictor dacă artefactul compilat există și a fost exportat din exact aceste
+    fișiere .pkl și E0.csv (sumele sha256 coincid), altfel PredictorAvansat (cu scikit-learn).
+    """
+    check_feature_mode(model_path)
+    if os.path.exists(compiled_path):
+        compiled = CompiledPredictor(compiled_path)
+        if compiled.source_sha256 == [file_sha256(model_path), file_sha256(data_path)]:
+            return compiled
+        print(f"Atenție: '{compiled_path}' nu a fost exportat din modelul curent, folosesc scikit-learn "
+              f"(python compiled_model.py export)", file=sys.stderr)
+    return PredictorAvansat(model_path, data_path)
+
+
+def check_parity(compiled_path: str = DEFAULT_COMPILED_PATH, model_path: str = DEFAULT_MODEL_PATH,
+                 data_path: str = DEFAULT_DATA_PATH, tolerance: float = 1e-9) -> dict:
+    """
+    Compară artefactul compilat cu pipeline-ul original pe toate meciurile din E0.csv, atât
+    pe calea scalară (probabilities) cât și pe cea vectorizată (proba_matrix).
+    """
+    import csv
+
+    import numpy as np
+
+    with open(data_path, newline='', encoding='utf-8-sig') as f:
+        fixtures = [(row['HomeTeam'], row['AwayTeam']) for row in csv.DictReader(f) if row.get('HomeTeam')]
+    original, compiled = PredictorAvansat(model_path, data_path), CompiledPredictor(compiled_path)
+
+    expected, _ = original.proba_matrix(fixtures)
+    batch, _ = compiled.proba_matrix(fixtures)
+    scalar = np.array([[compiled.probabilities(h, a)[label] for label in ('H', 'D', 'A')] for h, a in fixtures])
+    max_diff = max(float(np.abs(batch - expected).max()), float(np.abs(scalar - expected).max()))
+    return {
+        'fixtures': len(fixtures),
+        'max_abs_diff': max_diff,
+        'same_predictions': bool((batch.argmax(axis=1) == expected.argmax(axis=1)).all()),
+        'ok': max_diff <= tolerance,
+    }
+
+
+if __name__ == '__main__':
+    # python compiled_model.py export [model.pkl] [output.npz]
+    # python compiled_model.py check
+    if len(sys.argv) >= 2 and sys.argv[1] == 'export':
+        model_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_MODEL_PATH
+        output = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_COMPILED_PATH
+        print(f"Artefact compilat: {export_model(model_path, output=output)}")
+        print(check_parity(output, model_path))
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'check':
+        result = check_parity()
+        print(result)
+        sys.exit(0 if result['ok'] else 1)
+    else:
+        print("Usage: python compiled_model.py export [model.pkl] [output.npz]")
+        print("       python compiled_model.py check")
+        sys.exit(1)
@@ -0,0 +1,238 @@
+import csv
+import os
+import sys
+from bisect import bisect_left
+from datetime import date, datetime
+
+import numpy as np
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_PATH = os.path.join(MODEL_DIR, 'E0.csv')
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(MODEL_DIR), 'scripts')
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+from team_index import get_index
+
+# Coloanele păstrate din E0.csv (din cele ~100) și tipul lor compact
+INT_COLUMNS = ['FTHG', 'FTAG', 'HS', 'AS', 'HST', 'AST', 'HC', 'AC', 'HY', 'AY', 'HR', 'AR']
+ODDS_COLUMNS = ['AvgH', 'AvgD', 'AvgA', 'B365H', 'B365D', 'B365A']
+
+# Ce reține fereastra de formă pentru fiecare meci al unei echipe (din perspectiva ei)
+_RESULT_FIELDS = ['points', 'goals_for', 'goals_against', 'shots_for', 'shots_against',
+                  'sot_for', 'sot_against', 'implied_win', 'implied_draw']
+
+# Vectorul de caracteristici al unei echipe
+TEAM_FEATURES = ['played', 'season_ppg', 'form_ppg', 'form_goals_for', 'form_goals_against',
+                 'form_shot_ratio', 'form_sot_ratio', 'form_implied_win', 'form_implied_draw']
+
+
+def _parse_date(s: str) -> date:
+    # football-data.co.uk folosește atât DD/MM/YYYY, cât și DD/MM/YY
+    return datetime.strptime(s, "%d/%m/%Y" if len(s) > 8 else "%d/%m/%y").date()
+
+
+def _as_ordinal(d) -> int:
+    if d is None:
+        return np.iinfo(np.int32).max
+    if isinstance(d, str):
+        d = _parse_date(d)
+    if isinstance(d, datetime):
+        d = d.date()
+    return d.toordinal()
+
+
+def load_matches(csv_path: str = DEFAULT_DATA_PATH, cache: bool = True) -> dict:
+    """
+    Citește E0.csv o singură dată într-un set de coloane NumPy tipizate:
+    day (int32, zi ordinală), home/away (int16, indici în `teams`), statisticile
+    meciului (int16) și cotele (float32, NaN unde lipsesc), ordonate cronologic.
+    Cu `cache`, coloanele sunt salvate lângă CSV (<nume>.features.npz) și
+    refolosite cât timp CSV-ul nu s-a modificat.
+    """
+    cache_path = os.path.splitext(csv_path)[0] + '.features.npz'
+    if cache and os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+        with np.load(cache_path, allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        rows = [row for row in csv.DictReader(f) if row.get('HomeTeam') and row.get('FTHG')]
+
+    teams = sorted({row['HomeTeam'] for row in rows} | {row['AwayTeam'] for row in rows})
+    team_ids = {team: i for i, team in enumerate(teams)}
+    columns = {
+        'teams': np.array(teams),
+        'day': np.array([_parse_date(row['Date']).toordinal() for row in rows], dtype=np.int32),
+        'home': np.array([team_ids[row['HomeTeam']] for row in rows], dtype=np.int16),
+        'away': np.array([team_ids[row['AwayTeam']] for row in rows], dtype=np.int16),
+    }
+    for col in INT_COLUMNS:
+        columns[col] = np.array([int(row.get(col) or 0) for row in rows], dtype=np.int16)
+    for col in ODDS_COLUMNS:
+        columns[col] = np.array([float(row[col]) if row.get(col) else np.nan for row in rows], dtype=np.float32)
+
+    order = np.argsort(columns['day'], kind='stable')
+    for key in columns:
+        if key != 'teams':
+            columns[key] = columns[key][order]
+
+    if cache:
+        tmp_path = cache_path + '.tmp.npz'
+        np.savez(tmp_path, **columns)
+        os.replace(tmp_path, cache_path)
+    return columns
+
+
+def _implied(odds_h: float, odds_d: float, odds_a: float):
+    """
+    Probabilitățile implicite (fără marja casei) pentru 1/X/2; NaN dacă lipsesc cote.
+    """
+    inv = np.array([1 / odds_h, 1 / odds_d, 1 / odds_a]) if odds_h and odds_d and odds_a else np.full(3, np.nan)
+    return inv / inv.sum()
+
+
+class TeamForm:
+    """
+    Agregatele unei echipe: totalurile sezonului și o fereastră circulară cu ultimele
+    `window` meciuri, cu sume menținute incremental (adăugarea unui meci este O(1)).
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = np.zeros((window, len(_RESULT_FIELDS)))
+        self.sums = np.zeros(len(_RESULT_FIELDS))
+        self.count = 0
+        self.played = 0
+        self.points = 0
+
+    def add(self, result: np.ndarray):
+        slot = self.played % self.window
+        if self.count == self.window:
+            self.sums -= self.buffer[slot]
+        else:
+            self.count += 1
+        self.buffer[slot] = result
+        self.sums += result
+        self.played += 1
+        self.points += int(result[0])
+
+    def vector(self) -> np.ndarray:
+        if self.count == 0:
+            return np.full(len(TEAM_FEATURES), np.nan, dtype=np.float32)
+        avg = dict(zip(_RESULT_FIELDS, self.sums / self.count))
+        shots = avg['shots_for'] + avg['shots_against']
+        sot = avg['sot_for'] + avg['sot_against']
+        return np.array([
+            self.played,
+            self.points / self.played,
+            avg['points'],
+            avg['goals_for'],
+            avg['goals_against'],
+            avg['shots_for'] / shots if shots else np.nan,
+            avg['sot_for'] / sot if sot else np.nan,
+            avg['implied_win'],
+            avg['implied_draw'],
+        ], dtype=np.float32)
+
+
+class FeatureStore:
+    """
+    Caracteristici de formă pentru orice (gazde, oaspeți, dată): după fiecare rezultat
+    adăugat se păstrează vectorul echipei, iar o interogare la `as_of` caută binar
+    ultimul vector de dinaintea acelei zile (fără scurgeri de informație din viitor).
+    """
+
+    def __init__(self, window: int = 5):
+        self.window = window
+        self.forms = {}        # echipă -> TeamForm
+        self._days = {}        # echipă -> [zi ordinală după fiecare meci]
+        self._snapshots = {}   # echipă -> [vectorul echipei după acel meci]
+        self.team_index = get_index()
+
+    @classmethod
+    def from_csv(cls, csv_path: str = DEFAULT_DATA_PATH, window: int = 5, cache: bool = True):
+        columns = load_matches(csv_path, cache)
+        store = cls(window)
+        teams = columns['teams'].tolist()
+        odds_cols = ('AvgH', 'AvgD', 'AvgA') if not np.isnan(columns['AvgH']).all() else ('B365H', 'B365D', 'B365A')
+        for i in range(len(columns['day'])):
+            store.add_result(
+                date.fromordinal(int(columns['day'][i])),
+                teams[columns['home'][i]], teams[columns['away'][i]],
+                int(columns['FTHG'][i]), int(columns['FTAG'][i]),
+                shots=(int(columns['HS'][i]), int(columns['AS'][i])),
+                shots_on_target=(int(columns['HST'][i]), int(columns['AST'][i])),
+                odds=tuple(float(columns[c][i]) for c in odds_cols),
+            )
+        return store
+
+    @property
+    def teams(self):
+        return set(self.forms)
+
+    def canonical_team(self, name: str) -> str:
+        if name in self.forms:
+            return name
+        match = self.team_index.resolve(name)
+        if match is None or match.name not in self.forms:
+            raise ValueError(f"Echipă necunoscută în feature store: '{name}'")
+        return match.name
+
+    def add_result(self, day, home: str, away: str, home_goals: int, away_goals: int,
+                   shots=(0, 0), shots_on_target=(0, 0), odds=(None, None, None)):
+        """
+        Adaugă un rezultat nou (în ordine cronologică) și actualizează în O(1) forma ambelor echipe.
+        """
+        ordinal = _as_ordinal(day)
+        p_home, p_draw, p_away = _implied(*odds)
+        home_points = 3 if home_goals > away_goals else 1 if home_goals == away_goals else 0
+        away_points = 3 if away_goals > home_goals else 1 if home_goals == away_goals else 0
+        sides = (
+            (home, [home_points, home_goals, away_goals, shots[0], shots[1],
+                    shots_on_target[0], shots_on_target[1], p_home, p_draw]),
+            (away, [away_points, away_goals, home_goals, shots[1], shots[0],
+                    shots_on_target[1], shots_on_target[0], p_away, p_draw]),
+        )
+        for team, result in sides:
+            days = self._days.setdefault(team, [])
+            if days and ordinal < days[-1]:
+                raise ValueError(f"Rezultatele trebuie adăugate cronologic ({team}: {date.fromordinal(ordinal)})")
+            form = self.forms.setdefault(team, TeamForm(self.window))
+            if np.isnan(p_draw):
+                # Fără cote: păstrăm media implicită curentă, ca să nu tragem media spre zero
+                result[7:9] = form.sums[7:9] / form.count if form.count else [1 / 3, 1 / 3]
+            form.add(np.array(result, dtype=float))
+            days.append(ordinal)
+            self._snapshots.setdefault(team, []).append(form.vector())
+
+    def team_features(self, team: str, as_of=None) -> np.ndarray:
+        """
+        Vectorul TEAM_FEATURES al echipei cu toate meciurile jucate strict înainte de `as_of`
+        (implicit: toate meciurile cunoscute). NaN dacă echipa nu jucase încă.
+        """
+        team = self.canonical_team(team)
+        pos = bisect_left(self._days[team], _as_ordinal(as_of))
+        if pos == 0:
+            return np.full(len(TEAM_FEATURES), np.nan, dtype=np.float32)
+        return self._snapshots[team][pos - 1]
+
+    def features(self, home: str, away: str, as_of=None) -> np.ndarray:
+        """
+        Vectorul meciului: caracteristicile gazdelor urmate de cele ale oaspeților (vezi feature_names()).
+        """
+        return np.concatenate([self.team_features(home, as_of), self.team_features(away, as_of)])
+
+    @staticmethod
+    def feature_names():
+        return [f"home_{name}" for name in TEAM_FEATURES] + [f"away_{name}" for name in TEAM_FEATURES]
+
+
+if __name__ == '__main__':
+    # python feature_store.py <HomeTeam> <AwayTeam> [DD/MM/YYYY]
+    if len(sys.argv) < 3:
+        print("Usage: python feature_store.py <HomeTeam> <AwayTeam> [DD/MM/YYYY]")
+        sys.exit(1)
+    store = FeatureStore.from_csv()
+    as_of = sys.argv[3] if len(sys.argv) > 3 else None
+    for name, value in zip(FeatureStore.feature_names(), store.features(sys.argv[1], sys.argv[2], as_of)):
+        print(f"{name:<26} {value:.3f}")
@@ -1,16 +1,89 @@
+import csv
+import json
 import sys
-from predictor_avansat import PredictorAvansat
+from compiled_model import load_predictor
+import telemetry  # din scripts/, adăugat în sys.path de predictor_avansat
+
+def load_fixtures(path):
+    """
+    Citește meciurile de prezis dintr-un CSV sau JSON. Întoarce o listă de dict-uri
+    {date, home, away}. CSV: coloanele HomeTeam/AwayTeam sau team1/team2 (ex.
+    all_football_matches.csv), altfel primele trei coloane sunt data, gazde, oaspeți.
+    JSON: listă de obiecte {home, away[, date]} sau de perechi [home, away].
+    """
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            items = json.load(f)
+        fixtures = []
+        for item in items:
+            if isinstance(item, dict):
+                fixtures.append({'date': item.get('date'),
+                                 'home': item.get('home') or item.get('team1'),
+                                 'away': item.get('away') or item.get('team2')})
+            else:
+                fixtures.append({'date': None, 'home': item[0], 'away': item[1]})
+        return fixtures
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        rows = list(csv.reader(f))
+    if not rows:
+        return []
+    header = [c.strip() for c in rows[0]]
+    for home_col, away_col in (('HomeTeam', 'AwayTeam'), ('team1', 'team2')):
+        if home_col in header and away_col in header:
+            h, a = header.index(home_col), header.index(away_col)
+            d = next((header.index(c) for c in ('Date', 'date', 'Data') if c in header), None)
+            return [{'date': row[d] if d is not None else None, 'home': row[h], 'away': row[a]}
+                    for row in rows[1:] if len(row) > max(h, a)]
+    return [{'date': row[0], 'home': row[1], 'away': row[2]} for row in rows if len(row) >= 3]
+
+def predict_batch(input_path, output=None):
+    """
+    Prezice toate meciurile din `input_path` cu un singur model încărcat și scrie
+    rezultatele ca JSON lines (un meci per linie) pe măsură ce sunt calculate.
+    """
+    with telemetry.span('load_fixtures') as span:
+        fixtures = load_fixtures(input_path)
+        span.set(rows=len(fixtures))
+    with telemetry.span('model_load'):
+        predictor = load_predictor()
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    counts = {'ok': 0, 'error': 0}
+    try:
+        with telemetry.span('predict', fixtures=len(fixtures)):
+            results = predictor.predict_many((f['home'], f['away']) for f in fixtures)
+            for fixture, result in zip(fixtures, results):
+                record = {'date': fixture['date'], 'team1': fixture['home'], 'team2': fixture['away']}
+                record.update(result)
+                counts['error' if 'error' in result else 'ok'] += 1
+                out.write(json.dumps(record, ensure_ascii=False) + '\n')
+    finally:
+        if output:
+            out.close()
+    telemetry.count('predictions_total', counts['ok'], status='ok')
+    telemetry.count('predictions_total', counts['error'], status='error')
+    print(f"{counts['ok']} meciuri prezise, {counts['error']} cu erori", file=sys.stderr)
+    return counts
 
 def main():
+    if len(sys.argv) in (3, 4) and sys.argv[1] == '--batch':
+        # python predict_match.py --batch meciuri.csv [predictii.jsonl]
+        predict_batch(sys.argv[2], sys.argv[3] if len(sys.argv) == 4 else None)
+        return
+
     if len(sys.argv) != 3:
         print("Usage: python predict_match.py <HomeTeam> <AwayTeam>")
+        print("       python predict_match.py --batch <meciuri.csv|meciuri.json> [output.jsonl]")
         sys.exit(1)
 
     home, away = sys.argv[1], sys.argv[2]
-    predictor = PredictorAvansat()
+    with telemetry.span('model_load'):
+        predictor = load_predictor()
 
     try:
-        winner, conf, breakdown = predictor.predict(home, away)
+        with telemetry.span('predict', fixtures=1):
+            winner, conf, breakdown = predictor.predict(home, away)
+        telemetry.count('predictions_total', status='ok')
         output = (
         f"{home} - {away}\n"
         f"{winner} cu probabilitate de {conf:.1f}%\n"
@@ -23,9 +96,10 @@ def main():
             f.write(output)
 
     except ValueError as e:
+        telemetry.count('predictions_total', status='error')
         print("Eroare:", e)
 
-    
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,181 @@
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+
+from predictor_avansat import DEFAULT_MODEL_PATH, PredictorAvansat, file_sha256
+from train_predictor import load_metadata
+
+DEFAULT_PORT = 8770
+
+
+class ModelHolder:
+    """
+    Ține predictorul încărcat în memorie și îl reîncarcă atunci când fișierul .pkl
+    se schimbă pe disc. Noul model este încărcat și încălzit înainte de a-l înlocui
+    pe cel vechi, deci cererile în curs nu văd niciodată un model pe jumătate încărcat.
+    Metadatele modelului (train_predictor.publish) sunt verificate înainte de înlocuire:
+    suma de control și feature_mode (PredictorAvansat refuză un model antrenat pe alte
+    caracteristici); versiunea apare în /health.
+    """
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, check_interval: float = 1.0):
+        self.model_path = model_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self.predictor = None
+        self.mtime = None
+        self.loaded_at = None
+        self.version = None
+        self.reload()
+
+    def reload(self):
+        mtime = os.path.getmtime(self.model_path)
+        metadata = load_metadata(self.model_path)
+        if metadata is not None and file_sha256(self.model_path) != metadata.get('sha256'):
+            raise ValueError(f"Suma de control nu corespunde pentru '{self.model_path}'")
+        predictor = PredictorAvansat(self.model_path)
+        # Prima predicție inițializează tot ce scikit-learn construiește leneș
+        home, away = sorted(predictor.teams)[:2]
+        predictor.predict(home, away)
+        self.predictor, self.mtime, self.loaded_at = predictor, mtime, datetime.now()
+        self.version = metadata.get('version') if metadata else None
+
+    def get(self) -> PredictorAvansat:
+        now = time.monotonic()
+        if now - self._last_check >= self.check_interval:
+            # Un singur thread verifică (și eventual reîncarcă); ceilalți folosesc modelul curent
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._last_check = now
+                    if os.path.getmtime(self.model_path) != self.mtime:
+                        print(f"Modelul '{self.model_path}' s-a schimbat, îl reîncarc")
+                        self.reload()
+                except Exception as e:
+                    print(f"Reîncărcarea modelului a eșuat, păstrez modelul curent: {e}")
+                finally:
+                    self._lock.release()
+        return self.predictor
+
+    def info(self) -> dict:
+        return {
+            'model_path': self.model_path,
+            'model_mtime': datetime.fromtimestamp(self.mtime).isoformat(timespec='seconds'),
+            'loaded_at': self.loaded_at.isoformat(timespec='seconds'),
+            'model_version': self.version,
+        }
+
+
+def predict_json(holder: ModelHolder, home: str, away: str) -> dict:
+    predictor = holder.get()
+    started = time.perf_counter()
+    home_name, away_name = predictor.canonical_team(home), predictor.canonical_team(away)
+    proba = predictor.probabilities(home_name, away_name)
+    best = max(proba, key=proba.get)
+    return {
+        'home': home_name,
+        'away': away_name,
+        'home_id': predictor.team_index.team_id(home_name),
+        'away_id': predictor.team_index.team_id(away_name),
+        'prediction': best,
+        'confidence': round(proba[best], 4),
+        'probabilities': {label: round(p, 4) for label, p in proba.items()},
+        'model_mtime': holder.info()['model_mtime'],
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _make_handler(holder: ModelHolder):
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status: int, payload: dict):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _predict(self, params: dict):
+            home, away = params.get('home'), params.get('away')
+            if not home or not away:
+                self._send(400, {'error': "Parametrii 'home' și 'away' sunt obligatorii"})
+                return
+            try:
+                self._send(200, predict_json(holder, home, away))
+            except ValueError as e:
+                self._send(404, {'error': str(e)})
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == '/health':
+                self._send(200, dict(holder.info(), status='ok'))
+            elif parts.path == '/predict':
+                self._predict({k: v[0] for k, v in parse_qs(parts.query).items()})
+            else:
+                self._send(404, {'error': f"Rută necunoscută: {parts.path}"})
+
+        def do_POST(self):
+            if urlsplit(self.path).path != '/predict':
+                self._send(404, {'error': f"Rută necunoscută: {self.path}"})
+                return
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                params = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self._send(400, {'error': 'Corpul cererii nu este JSON valid'})
+                return
+            self._predict(params if isinstance(params, dict) else {})
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictionHandler
+
+
+def start_prediction_server(port: int = DEFAULT_PORT, model_path: str = DEFAULT_MODEL_PATH):
+    """
+    Pornește serverul de predicții pe localhost într-un thread separat.
+    Întoarce (server, base_url); serverul se oprește cu server.shutdown().
+    """
+    holder = ModelHolder(model_path)
+    server = ThreadingHTTPServer(('127.0.0.1', port), _make_handler(holder))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def predict_remote(home: str, away: str, base_url: str = f"http://127.0.0.1:{DEFAULT_PORT}", timeout: float = 5):
+    """
+    Cere o predicție de la un server pornit; aruncă ValueError pentru echipele necunoscute.
+    """
+    request = Request(f"{base_url}/predict", data=json.dumps({'home': home, 'away': away}).encode('utf-8'),
+                      headers={'Content-Type': 'application/json'})
+    try:
+        with urlopen(request, timeout=timeout) as resp:
+            return json.loads(resp.read())
+    except Exception as e:
+        # HTTPError are corpul JSON cu mesajul de eroare
+        if hasattr(e, 'read'):
+            raise ValueError(json.loads(e.read()).get('error', str(e)))
+        raise
+
+
+if __name__ == '__main__':
+    # python prediction_server.py [port]
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+    holder = ModelHolder()
+    server = ThreadingHTTPServer(('127.0.0.1', port), _make_handler(holder))
+    print(f"Server de predicții pe http://127.0.0.1:{port} (GET /predict?home=...&away=..., POST /predict, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import sys
+
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MODEL_PATH = os.path.join(MODEL_DIR, 'predictor_avansat.pkl')
+DEFAULT_DATA_PATH = os.path.join(MODEL_DIR, 'E0.csv')
+
+# Indexul de nume de echipe din scripts/, ca predictorul să accepte aceleași nume ca scraper-ele
+SCRIPTS_DIR = os.path.join(os.path.dirname(MODEL_DIR), 'scripts')
+if SCRIPTS_DIR not in sys.path:
+    sys.path.append(SCRIPTS_DIR)
+from team_index import get_index
+
+# joblib, NumPy și pandas sunt importate doar în metodele care le folosesc: constantele și
+# numele de echipe de aici sunt folosite și de compiled_model, care pornește fără ele
+
+# Statisticile pe care a fost antrenat modelul: coloana gazdelor și a oaspeților
+HOME_STATS = ['FTHG', 'HS', 'HST', 'HF', 'HC', 'HY', 'HR', 'B365H']
+AWAY_STATS = ['FTAG', 'AS', 'AST', 'AF', 'AC', 'AY', 'AR', 'B365A']
+FEATURES = ['HomeTeam', 'AwayTeam', 'FTHG', 'FTAG', 'HS', 'AS', 'HST', 'AST', 'HF', 'AF',
+            'HC', 'AC', 'HY', 'AY', 'HR', 'AR', 'B365H', 'B365D', 'B365A']
+
+# Cum construiește predictorul caracteristicile unui meci viitor: mediile de dinaintea meciului,
+# ca backtest.pre_match_features la antrenare. Modelul servit trebuie să aibă același
+# feature_mode în metadate (train_predictor.publish)
+FEATURE_MODE = 'pre_match'
+
+# Etichetele modelului (FTR) -> textul afișat
+OUTCOME_LABELS = {'H': 'Victorie gazde', 'D': 'Egal', 'A': 'Victorie oaspeți'}
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def check_feature_mode(model_path: str):
+    """
+    Aruncă ValueError dacă metadatele modelului (<model>.json) lipsesc sau spun că a fost
+    antrenat pe alte caracteristici decât cele construite la servire (FEATURE_MODE).
+    """
+    import json
+
+    meta_path = os.path.splitext(model_path)[0] + '.json'
+    mode = None
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            mode = json.load(f).get('feature_mode')
+    if mode != FEATURE_MODE:
+        raise ValueError(f"Modelul '{model_path}' are feature_mode {mode!r}, dar predictorul construiește "
+                         f"'{FEATURE_MODE}'; reantrenați-l cu train_predictor.py train --publish")
+
+
+class PredictorAvansat:
+    """
+    Prezice rezultatul unui meci (H/D/A) cu modelul din predictor_avansat.pkl.
+    Caracteristicile unui meci viitor sunt construite ca la antrenare (backtest.upcoming_means):
+    gazdele cu mediile lor de acasă din sezon, oaspeții cu cele din deplasare. Echipele cu mai
+    puțin de `min_history` astfel de meciuri nu sunt cunoscute, ca la antrenare.
+    """
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, data_path: str = DEFAULT_DATA_PATH,
+                 min_history: int = 3):
+        import joblib
+
+        from backtest import load_seasons, upcoming_means
+
+        check_feature_mode(model_path)
+        self.model_path = model_path
+        self.model = joblib.load(model_path)
+        self.classes = list(self.model.classes_)
+
+        data = load_seasons([data_path])
+        self.home_stats, home_played = upcoming_means(data, 'HomeTeam', HOME_STATS + ['B365D'])
+        self.away_stats, away_played = upcoming_means(data, 'AwayTeam', AWAY_STATS + ['B365D'])
+        self.teams = (set(home_played.index[home_played >= min_history])
+                      & set(away_played.index[away_played >= min_history]))
+        self.team_index = get_index()
+
+    def canonical_team(self, name: str) -> str:
+        """
+        Numele echipei așa cum apare în E0.csv ("Manchester Utd" -> "Man United").
+        Aruncă ValueError pentru echipele pe care modelul nu le cunoaște.
+        """
+        if name in self.teams:
+            return name
+        match = self.team_index.resolve(name)
+        if match is None or match.name not in self.teams:
+            raise ValueError(f"Echipă necunoscută pentru model: '{name}'")
+        return match.name
+
+    def canonical_pair(self, home: str, away: str):
+        home, away = self.canonical_team(home), self.canonical_team(away)
+        if home == away:
+            raise ValueError(f"Aceeași echipă pe ambele poziții: '{home}'")
+        return home, away
+
+    def _feature_frame(self, homes, aways) -> 'pd.DataFrame':
+        import pandas as pd
+
+        # Toate rândurile sunt construite dintr-o dată, prin indexare pe tabelele de medii
+        h = self.home_stats.loc[list(homes)]
+        a = self.away_stats.loc[list(aways)]
+        columns = {'HomeTeam': list(homes), 'AwayTeam': list(aways)}
+        columns.update({c: h[c].to_numpy() for c in HOME_STATS})
+        columns.update({c: a[c].to_numpy() for c in AWAY_STATS})
+        columns['B365D'] = (h['B365D'].to_numpy() + a['B365D'].to_numpy()) / 2
+        return pd.DataFrame(columns, columns=FEATURES)
+
+    def features(self, home: str, away: str) -> 'pd.DataFrame':
+        return self._feature_frame(*zip(self.canonical_pair(home, away)))
+
+    def probabilities(self, home: str, away: str) -> dict:
+        """
+        Probabilitățile modelului pentru fiecare rezultat: {'H': p, 'D': p, 'A': p}.
+        """
+        proba = self.model.predict_proba(self.features(home, away))[0]
+        return {label: float(p) for label, p in zip(self.classes, proba)}
+
+    def _result(self, proba: dict):
+        best = max(proba, key=proba.get)
+        breakdown = {OUTCOME_LABELS[label]: round(p * 100, 1) for label, p in proba.items()}
+        return OUTCOME_LABELS[best], proba[best] * 100, breakdown
+
+    def predict(self, home: str, away: str):
+        """
+        Întoarce (rezultatul cel mai probabil, probabilitatea lui în %, toate probabilitățile în %).
+        """
+        return self._result(self.probabilities(home, away))
+
+    def predict_many(self, fixtures, chunk_size: int = 1024):
+        """
+        Prezice o listă de meciuri (home, away) cu câte un singur predict_proba per bucată
+        de `chunk_size` meciuri. Produce, în ordinea intrării, câte un dict per meci:
+        {home, away, winner, confidence, breakdown} sau {home, away, error} pentru
+        echipele necunoscute, fără să oprească restul lotului.
+        """
+        chunk = []
+        for fixture in fixtures:
+            chunk.append(fixture)
+            if len(chunk) >= chunk_size:
+                yield from self._predict_chunk(chunk)
+                chunk = []
+        if chunk:
+            yield from self._predict_chunk(chunk)
+
+    def proba_matrix(self, fixtures, order=('H', 'D', 'A')):
+        """
+        Probabilitățile pentru o listă de meciuri (home, away), ca matrice (N, 3) în ordinea
+        `order`, calculate cu un singur predict_proba. Rândurile meciurilor cu echipe
+        necunoscute sunt NaN; al doilea rezultat este {poziție: mesajul de eroare}.
+        """
+        import numpy as np
+
+        proba = np.full((len(fixtures), len(order)), np.nan)
+        errors, valid = {}, []
+        for pos, (home, away) in enumerate(fixtures):
+            try:
+                valid.append((pos, *self.canonical_pair(home, away)))
+            except ValueError as e:
+                errors[pos] = str(e)
+        if valid:
+            positions, homes, aways = zip(*valid)
+            columns = [self.classes.index(label) for label in order]
+            proba[list(positions)] = self.model.predict_proba(self._feature_frame(homes, aways))[:, columns]
+        return proba, errors
+
+    def _predict_chunk(self, fixtures):
+        proba, errors = self.proba_matrix(fixtures, order=self.classes)
+        results = []
+        for pos, (home, away) in enumerate(fixtures):
+            if pos in errors:
+                results.append({'home': home, 'away': away, 'error': errors[pos]})
+                continue
+            home, away = self.canonical_pair(home, away)
+            winner, conf, breakdown = self._result(dict(zip(self.classes, proba[pos].tolist())))
+            results.append({'home': home, 'away': away, 'winner': winner,
+                            'confidence': round(conf, 1), 'breakdown': breakdown})
+        return results
@@ -0,0 +1,167 @@
+import sys
+
+import numpy as np
+
+OUTCOMES = ('1', 'X', '2')
+
+
+def kelly_fractions(probs: np.ndarray, odds: np.ndarray, fraction: float = 0.25) -> np.ndarray:
+    """
+    Fracțiunea Kelly din bancă pentru fiecare pariu: f* = (p * cotă - 1) / (cotă - 1),
+    înmulțită cu `fraction` (Kelly fracționar) și tăiată la 0 pentru pariurile fără valoare.
+    Funcționează pe orice formă de matrice (ex. (N, 3) pentru 1X2).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        full = (probs * odds - 1.0) / (odds - 1.0)
+    return np.clip(np.nan_to_num(full, nan=0.0, posinf=0.0, neginf=0.0), 0.0, None) * fraction
+
+
+def pick_bets(probs: np.ndarray, odds: np.ndarray, min_edge: float = 0.02):
+    """
+    Pentru fiecare meci (rânduri din matricele (N, 3) model / cote) alege rezultatul cu cea mai
+    mare valoare așteptată p * cotă - 1, dacă depășește `min_edge`. Rezultatele unui meci se
+    exclud reciproc, deci pariem pe cel mult unul. Întoarce (indicele rezultatului, -1 dacă nu
+    pariem; probabilitatea; cota; valoarea așteptată), toate de formă (N,).
+    """
+    edge = np.where(np.isnan(probs) | np.isnan(odds), -np.inf, probs * odds - 1.0)
+    choice = edge.argmax(axis=1)
+    rows = np.arange(len(choice))
+    best_edge = edge[rows, choice]
+    choice = np.where(best_edge > min_edge, choice, -1)
+    return choice, probs[rows, choice], odds[rows, choice], best_edge
+
+
+def cap_exposure(stakes: np.ndarray, max_bet: float = 0.05, max_total: float = 0.25,
+                 groups: np.ndarray = None) -> np.ndarray:
+    """
+    Limitează fiecare miză la `max_bet` din bancă, apoi scalează proporțional toate mizele
+    dacă expunerea totală (pariuri simultane) depășește `max_total`. Cu `groups` (indici
+    întregi, de exemplu ziua de joc a fiecărui pariu) limita totală se aplică fiecărui grup.
+    """
+    stakes = np.minimum(stakes, max_bet)
+    if groups is None:
+        total = stakes.sum()
+        if total > max_total:
+            stakes = stakes * (max_total / total)
+        return stakes
+    totals = np.bincount(groups, weights=stakes)
+    scale = np.where(totals > max_total, max_total / np.maximum(totals, max_total), 1.0)
+    return stakes * scale[groups]
+
+
+def stake_slate(probs: np.ndarray, odds: np.ndarray, fraction: float = 0.25, min_edge: float = 0.02,
+                max_bet: float = 0.05, max_total: float = 0.25):
+    """
+    Mizele (ca fracțiune din bancă) pentru un set de meciuri jucate simultan: un pariu per meci,
+    Kelly fracționar, limite de expunere. Întoarce (rezultatul ales (N,), mize (N,), p (N,), cote (N,)).
+    """
+    choice, p, o, _ = pick_bets(probs, odds, min_edge)
+    stakes = np.where(choice >= 0, kelly_fractions(p, o, fraction), 0.0)
+    return choice, cap_exposure(stakes, max_bet, max_total), p, o
+
+
+def simulate_bankroll(p: np.ndarray, odds: np.ndarray, stakes: np.ndarray, rounds: int = 100,
+                      paths: int = 10_000, seed: int = None):
+    """
+    Monte Carlo: `paths` evoluții ale băncii pe `rounds` runde, fiecare rundă jucând același
+    set de pariuri cu rezultatele trase din probabilitățile modelului (meciuri independente).
+    Mizele sunt fracțiuni din banca curentă, deci câștigurile se compun. Întoarce bancile
+    (paths, rounds + 1), pornind de la 1.0.
+    """
+    rng = np.random.default_rng(seed)
+    active = stakes > 0
+    p, odds, stakes = p[active], odds[active], stakes[active]
+    bankroll = np.ones((paths, rounds + 1))
+    if not len(stakes):
+        return bankroll
+    # Randamentul rundei pentru fiecare drum: sum(miză * (cotă - 1)) pe câștigate, -miză pe pierdute
+    win_gain = stakes * (odds - 1.0)
+    for r in range(rounds):
+        won = rng.random((paths, len(p))) < p
+        growth = 1.0 + np.where(won, win_gain, -stakes).sum(axis=1)
+        bankroll[:, r + 1] = bankroll[:, r] * growth
+    return bankroll
+
+
+def bankroll_report(bankroll: np.ndarray, ruin_level: float = 0.5) -> dict:
+    """
+    Sumarul simulării: banca finală (mediană, percentilele 5/95), creșterea logaritmică medie
+    pe rundă, drawdown-ul maxim (median, p95) și probabilitatea de a coborî sub `ruin_level`.
+    """
+    final = bankroll[:, -1]
+    peaks = np.maximum.accumulate(bankroll, axis=1)
+    drawdown = (1.0 - bankroll / peaks).max(axis=1)
+    rounds = bankroll.shape[1] - 1
+    return {
+        'paths': bankroll.shape[0],
+        'rounds': rounds,
+        'final_median': round(float(np.median(final)), 4),
+        'final_p5': round(float(np.percentile(final, 5)), 4),
+        'final_p95': round(float(np.percentile(final, 95)), 4),
+        'log_growth_per_round': round(float(np.log(final).mean() / max(rounds, 1)), 6),
+        'max_drawdown_median': round(float(np.median(drawdown)), 4),
+        'max_drawdown_p95': round(float(np.percentile(drawdown, 95)), 4),
+        'p_below_ruin_level': round(float((bankroll.min(axis=1) < ruin_level).mean()), 4),
+    }
+
+
+def stakes_for_offer(rows, bankroll: float = 1000.0, predictor=None, **kwargs):
+    """
+    Combină probabilitățile predictorului cu cele mai bune cote din oferta caselor de pariuri
+    (rânduri de scraper, vezi arbitrage.build_matrix) și întoarce pariurile recomandate,
+    plus matricele necesare simulării.
+    """
+    from predictor_avansat import PredictorAvansat
+    from arbitrage import build_matrix, scan
+
+    predictor = predictor or PredictorAvansat()
+    fixtures, bookmakers, odds = build_matrix(rows)
+    best_odds, best_book, _ = scan(odds)
+    best_odds = np.where(best_odds > 0, best_odds, np.nan)
+    probs, _ = predictor.proba_matrix([(team1, team2) for _, team1, team2, _ in fixtures])
+
+    choice, stakes, p, o = stake_slate(probs, best_odds, **kwargs)
+    bets = []
+    for i in np.flatnonzero(stakes > 0):
+        _, team1, team2, date = fixtures[i]
+        k = choice[i]
+        bets.append({
+            'date': date,
+            'team1': team1,
+            'team2': team2,
+            'outcome': OUTCOMES[k],
+            'bookmaker': bookmakers[best_book[i, k]],
+            'odds': round(float(o[i]), 2),
+            'model_prob': round(float(p[i]), 4),
+            'edge': round(float(p[i] * o[i] - 1.0), 4),
+            'stake_fraction': round(float(stakes[i]), 4),
+            'stake': round(float(stakes[i] * bankroll), 2),
+        })
+    return bets, (p, o, stakes)
+
+
+if __name__ == '__main__':
+    # python staking.py superbet=feed_superbet.csv maxbet=feed_maxbet.csv ... [--bankroll 1000]
+    from predictor_avansat import SCRIPTS_DIR  # noqa: F401 (adaugă scripts/ în sys.path)
+    from arbitrage import load_rows
+
+    args = sys.argv[1:]
+    bankroll = 1000.0
+    if '--bankroll' in args:
+        i = args.index('--bankroll')
+        bankroll = float(args[i + 1])
+        del args[i:i + 2]
+    if not args:
+        print("Usage: python staking.py <bookmaker>=<odds.csv>... [--bankroll 1000]")
+        sys.exit(1)
+
+    rows = []
+    for arg in args:
+        bookmaker, _, path = arg.partition('=')
+        rows.extend(load_rows(bookmaker, path))
+
+    bets, (p, o, stakes) = stakes_for_offer(rows, bankroll)
+    for bet in bets:
+        print(f"{bet['date']} {bet['team1']} - {bet['team2']}: {bet['outcome']} @ {bet['odds']} ({bet['bookmaker']}) "
+              f"p={bet['model_prob']:.2f} edge={bet['edge']:+.2%} miză={bet['stake']}")
+    print(bankroll_report(simulate_bankroll(p, o, stakes)))
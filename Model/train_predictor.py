@@ -0,0 +1,254 @@
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+from backtest import RESULTS, load_seasons, pre_match_features
+from predictor_avansat import DEFAULT_DATA_PATH, DEFAULT_MODEL_PATH, FEATURE_MODE, FEATURES, MODEL_DIR, file_sha256
+
+ARTIFACTS_DIR = os.path.join(MODEL_DIR, 'models')
+TEAM_COLUMNS = FEATURES[:2]
+STAT_COLUMNS = FEATURES[2:]
+
+
+def build_pipeline(teams=None, C: float = 1.0, warm_start: bool = False):
+    """
+    Pipeline-ul din predictor_avansat.pkl: echipele codificate one-hot, statisticile
+    standardizate, regresie logistică multinomială. Cu `teams` dat, categoriile encoder-ului
+    sunt fixe, deci numărul de coloane nu se schimbă între reantrenări și `warm_start`
+    poate porni optimizarea de la coeficienții modelului anterior.
+    """
+    categories = [sorted(teams)] * len(TEAM_COLUMNS) if teams is not None else 'auto'
+    return make_pipeline(
+        ColumnTransformer([
+            ('teams', OneHotEncoder(categories=categories, handle_unknown='ignore'), TEAM_COLUMNS),
+            ('stats', StandardScaler(), STAT_COLUMNS),
+        ]),
+        LogisticRegression(C=C, max_iter=1000, warm_start=warm_start),
+    )
+
+
+def training_set(data: pd.DataFrame, pre_match: bool = True, min_history: int = 3):
+    """
+    (X, y, rândurile folosite) dintr-un tabel load_seasons. Implicit X conține mediile dinaintea
+    meciului (backtest.pre_match_features), adică ce se știe la momentul predicției. Cu
+    `pre_match=False` conține statisticile meciului însuși (goluri, șuturi), ca modelul original:
+    ele decid rezultatul, deci un astfel de model nu are valoare predictivă și nu se publică.
+    """
+    if pre_match:
+        frame, ready = pre_match_features(data, min_history)
+    else:
+        frame = data[FEATURES]
+        ready = frame[STAT_COLUMNS].notna().all(axis=1).to_numpy()
+    rows = np.flatnonzero(ready)
+    return frame.iloc[rows].reset_index(drop=True), data['FTR'].to_numpy()[rows], rows
+
+
+def tune(X, y, Cs=(0.03, 0.1, 0.3, 1.0, 3.0), n_splits: int = 5, n_jobs: int = -1, teams=None):
+    """
+    Alege C prin validare încrucișată în ordine temporală (TimeSeriesSplit, fără date din viitor
+    în antrenare), cu toate combinațiile (C, fold) rulate în paralel pe `n_jobs` nuclee.
+    Întoarce (cel mai bun C, {C: log loss mediu}).
+    """
+    search = GridSearchCV(build_pipeline(teams), {'logisticregression__C': list(Cs)},
+                          cv=TimeSeriesSplit(n_splits=n_splits), scoring='neg_log_loss', n_jobs=n_jobs)
+    search.fit(X, y)
+    scores = {float(C): round(float(-s), 4)
+              for C, s in zip(search.cv_results_['param_logisticregression__C'], search.cv_results_['mean_test_score'])}
+    return float(search.best_params_['logisticregression__C']), scores
+
+
+def walk_forward(data: pd.DataFrame, step_days: int = 7, min_train: int = 100, C: float = 1.0,
+                 pre_match: bool = True, warm_start: bool = True):
+    """
+    Reantrenare pe măsură ce apar rezultate noi: la fiecare `step_days` zile modelul este
+    reantrenat pe toate meciurile terminate și prezice meciurile din următoarea fereastră,
+    din mediile de dinaintea fiecărui meci (indiferent de `pre_match`, care alege doar datele
+    de antrenare).
+    Cu `warm_start` fiecare reantrenare pornește de la coeficienții precedenți (categoriile
+    echipelor sunt fixate de la început), deci converge în câteva iterații.
+    Întoarce (probabilitățile în afara eșantionului (N, 3) în ordinea H/D/A, NaN pentru meciurile
+    fără predicție, statistici ale rulării), aliniate cu rândurile din `data`.
+    """
+    X, y, rows = training_set(data, pre_match)
+    train_kickoff = data['kickoff'].to_numpy()[rows]
+    # Meciurile de prezis primesc mereu doar ce se știa înainte de start
+    X_test, ready = pre_match_features(data)
+    kickoff = data['kickoff'].to_numpy()
+    teams = pd.unique(data[TEAM_COLUMNS].to_numpy().ravel())
+    model = build_pipeline(teams, C=C, warm_start=warm_start)
+
+    probs = np.full((len(data), len(RESULTS)), np.nan)
+    step = np.timedelta64(step_days, 'D')
+    cutoff = np.sort(train_kickoff)[min(min_train, len(train_kickoff) - 1)]
+    fits, iterations, started = 0, 0, time.perf_counter()
+    while cutoff <= kickoff.max():
+        train = train_kickoff < cutoff
+        test = np.flatnonzero(ready & (kickoff >= cutoff) & (kickoff < cutoff + step))
+        if len(test) and len(set(y[train])) == len(RESULTS):
+            model.fit(X[train], y[train])
+            classifier = model[-1]
+            columns = [list(classifier.classes_).index(r) for r in RESULTS]
+            probs[test] = model.predict_proba(X_test.iloc[test])[:, columns]
+            fits += 1
+            iterations += int(classifier.n_iter_.max())
+        cutoff = cutoff + step
+
+    predicted = ~np.isnan(probs[:, 0])
+    outcome = data['FTR'].to_numpy()[predicted]
+    labels = np.array(RESULTS)[probs[predicted].argmax(axis=1)] if predicted.any() else []
+    stats = {
+        'fits': fits,
+        'mean_iterations': round(iterations / fits, 1) if fits else None,
+        'seconds': round(time.perf_counter() - started, 2),
+        'predicted': int(predicted.sum()),
+        'accuracy': round(float(accuracy_score(outcome, labels)), 4) if predicted.any() else None,
+        'log_loss': round(float(log_loss(outcome, probs[predicted], labels=list(RESULTS))), 4) if predicted.any() else None,
+    }
+    return probs, stats
+
+
+def _atomic_write_json(path: str, payload: dict):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def save_artifact(model, metadata: dict, artifacts_dir: str = ARTIFACTS_DIR) -> str:
+    """
+    Scrie modelul ca models/predictor-<versiune>.pkl, cu metadatele alături (<...>.json):
+    versiunea, sha256 al fișierului .pkl, versiunile bibliotecilor și ce a primit `metadata`.
+    Fișierele sunt scrise temporar și redenumite, deci un artefact vizibil este mereu complet
+    (modelul înaintea metadatelor, ca la publish).
+    Întoarce calea fișierului .pkl.
+    """
+    os.makedirs(artifacts_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    tmp_path = os.path.join(artifacts_dir, f".predictor-{stamp}.pkl.tmp")
+    joblib.dump(model, tmp_path)
+    checksum = file_sha256(tmp_path)
+    version = f"{stamp}-{checksum[:8]}"
+    path = os.path.join(artifacts_dir, f"predictor-{version}.pkl")
+
+    metadata = dict(metadata, version=version, sha256=checksum, created_at=stamp,
+                    sklearn=sklearn.__version__, numpy=np.__version__, pandas=pd.__version__,
+                    classes=[str(c) for c in model.classes_], features=FEATURES)
+    os.replace(tmp_path, path)
+    _atomic_write_json(os.path.splitext(path)[0] + '.json', metadata)
+    return path
+
+
+def load_metadata(model_path: str):
+    meta_path = os.path.splitext(model_path)[0] + '.json'
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def publish(artifact_path: str, target: str = DEFAULT_MODEL_PATH) -> dict:
+    """
+    Face din artefact modelul servit: verifică sha256 din metadate, apoi copiază modelul și
+    metadatele lângă `target` și le redenumește peste cele curente, modelul primul.
+    Serverul de predicții (prediction_server.ModelHolder) vede noul mtime al modelului; dacă
+    îl citește înaintea noilor metadate, suma de control nu corespunde, păstrează modelul
+    curent și reîncearcă la următoarea verificare. Sunt refuzate modelele al căror feature_mode
+    diferă de cel construit la servire (FEATURE_MODE), de exemplu cele antrenate pe statisticile
+    meciului însuși. La final artefactul compilat (.npz) este reexportat din noul model, altfel
+    compiled_model.load_predictor nu l-ar mai folosi.
+    """
+    metadata = load_metadata(artifact_path)
+    if metadata is None:
+        raise ValueError(f"Artefactul nu are metadate: '{artifact_path}'")
+    if metadata.get('feature_mode') != FEATURE_MODE:
+        raise ValueError(f"Artefactul '{artifact_path}' are feature_mode {metadata.get('feature_mode')!r}, "
+                         f"iar predictorul construiește '{FEATURE_MODE}'; nu poate fi publicat")
+    if file_sha256(artifact_path) != metadata['sha256']:
+        raise ValueError(f"Suma de control nu corespunde pentru '{artifact_path}'")
+
+    tmp_path = target + '.tmp'
+    shutil.copyfile(artifact_path, tmp_path)
+    os.replace(tmp_path, target)
+    _atomic_write_json(os.path.splitext(target)[0] + '.json', metadata)
+
+    from compiled_model import export_model
+    export_model(target, output=os.path.splitext(target)[0] + '.npz')
+    return metadata
+
+
+def train(paths=(DEFAULT_DATA_PATH,), pre_match: bool = True, Cs=(0.03, 0.1, 0.3, 1.0, 3.0), n_jobs: int = -1,
+          artifacts_dir: str = ARTIFACTS_DIR):
+    """
+    Antrenarea completă: alege C prin validare încrucișată paralelă, antrenează pe toate
+    meciurile și salvează un artefact versionat. Întoarce (calea artefactului, metadatele).
+    """
+    data = load_seasons(paths)
+    X, y, _ = training_set(data, pre_match)
+    teams = pd.unique(data[TEAM_COLUMNS].to_numpy().ravel())
+    C, cv_scores = tune(X, y, Cs, n_jobs=n_jobs, teams=teams)
+    model = build_pipeline(teams, C=C).fit(X, y)
+
+    path = save_artifact(model, {
+        'training_files': [{'path': os.path.basename(p), 'sha256': file_sha256(p)} for p in paths],
+        'rows': len(X),
+        'first_match': str(data['kickoff'].min().date()),
+        'last_match': str(data['kickoff'].max().date()),
+        'pre_match_features': pre_match,
+        'feature_mode': 'pre_match' if pre_match else 'same_match',
+        'C': C,
+        'cv_log_loss': cv_scores,
+    }, artifacts_dir)
+    return path, load_metadata(path)
+
+
+if __name__ == '__main__':
+    # python train_predictor.py train [E0.csv ...] [--same-match] [--publish]
+    # python train_predictor.py walk-forward [E0.csv ...] [--same-match] [--step 7]
+    # --same-match antrenează pe statisticile meciului însuși (modelul original), doar pentru comparație
+    args = sys.argv[1:]
+    if not args or args[0] not in ('train', 'walk-forward'):
+        print("Usage: python train_predictor.py train [E0.csv ...] [--same-match] [--publish]")
+        print("       python train_predictor.py walk-forward [E0.csv ...] [--same-match] [--step 7]")
+        sys.exit(1)
+    command, args = args[0], args[1:]
+    pre_match = '--same-match' not in args
+    if not pre_match and '--publish' in args:
+        print("Un model antrenat cu --same-match nu poate fi publicat")
+        sys.exit(1)
+    step_days = 7
+    if '--step' in args:
+        i = args.index('--step')
+        step_days = int(args[i + 1])
+        del args[i:i + 2]
+    paths = [a for a in args if not a.startswith('--')] or [DEFAULT_DATA_PATH]
+
+    if command == 'train':
+        path, metadata = train(paths, pre_match)
+        print(f"Artefact: {path}")
+        print(f"C={metadata['C']}  log loss CV: {metadata['cv_log_loss']}")
+        if '--publish' in args:
+            publish(path)
+            print(f"Publicat ca {DEFAULT_MODEL_PATH} (versiunea {metadata['version']})")
+    else:
+        from backtest import Backtest
+        data = load_seasons(paths)
+        for warm_start in (False, True):
+            probs, stats = walk_forward(data, step_days, pre_match=pre_match, warm_start=warm_start)
+            print(f"warm_start={warm_start}: {stats}")
+        bt = Backtest(data, probs)
+        print(bt.run('Avg', staking='flat'))
+        print({k: v for k, v in bt.calibration().items() if k != 'reliability'})
@@ -0,0 +1,181 @@
+import csv
+import re
+import sys
+
+import numpy as np
+
+from team_index import team_id
+
+OUTCOMES = ('1', 'X', '2')
+
+_DAY = re.compile(r'(\d{1,2})[./](\d{1,2})')
+
+
+def _day(date: str) -> str:
+    m = _DAY.search(date or '')
+    return f"{int(m.group(1)):02d}/{int(m.group(2)):02d}" if m else ''
+
+
+def fixture_key(date: str, team1: str, team2: str):
+    """
+    Cheia unui meci comună tuturor caselor de pariuri: ziua ("DD/MM", fiecare site afișează
+    data altfel) și ID-urile canonice ale echipelor. Fără zi recunoscută (ex. odds_superbet.csv,
+    care nu are coloană de dată) ziua este '' și meciul se potrivește doar după echipe.
+    """
+    return _day(date), team_id(team1), team_id(team2)
+
+
+def _odd(value) -> float:
+    try:
+        odd = float(str(value).replace(',', '.'))
+    except (TypeError, ValueError):
+        return np.nan
+    return odd if odd > 1.0 else np.nan
+
+
+def build_matrix(rows):
+    """
+    Adună rândurile scraper-elor ({bookmaker, Data/date, team1, team2, odd_1, odd_X, odd_2})
+    într-o matrice de cote (meciuri x case de pariuri x 3), cu NaN unde lipsește o cotă.
+    Pentru aceeași casă și același meci rămâne ultimul rând. Rândurile fără dată se alătură
+    primului meci cu dată al acelorași echipe. Întoarce (meciuri, case, cote), unde `meciuri`
+    este lista de (cheie, team1, team2, data) în ordinea rândurilor matricei.
+    """
+    rows = rows if isinstance(rows, list) else list(rows)
+    dates = [row.get('Data') or row.get('date') or '' for row in rows]
+    team1 = [row['team1'] for row in rows]
+    team2 = [row['team2'] for row in rows]
+    # Numele, datele și cotele se repetă de la un rând la altul: fiecare valoare distinctă
+    # este normalizată o singură dată, apoi rândurile doar le caută în dicționare
+    names = {name: team_id(name) for name in {*team1, *team2}}
+    days = {date: _day(date) for date in set(dates)}
+    keys = [(days[d], names[t1], names[t2]) for d, t1, t2 in zip(dates, team1, team2)]
+
+    first = {}  # cheie -> primul rând cu ea
+    for i, key in enumerate(keys):
+        first.setdefault(key, i)
+    dated = {}  # (ID echipa1, ID echipa2) -> prima cheie cu dată
+    for key in first:
+        if key[0]:
+            dated.setdefault(key[1:], key)
+    fixture_ids, fixtures, merged = {}, [], {}
+    for key, i in first.items():
+        target = merged[key] = key if key[0] else dated.get(key[1:], key)
+        k = fixture_ids.get(target)
+        if k is None:
+            fixture_ids[target] = len(fixtures)
+            fixtures.append((target, team1[i], team2[i], dates[i]))
+        elif dates[i] and not fixtures[k][3]:
+            fixtures[k] = (target, team1[i], team2[i], dates[i])
+    f_idx = [fixture_ids[merged[key]] for key in keys]
+
+    bookmaker_ids = {}
+    b_idx = [bookmaker_ids.setdefault(row['bookmaker'], len(bookmaker_ids)) for row in rows]
+    columns = [[row.get(column) for row in rows] for column in ('odd_1', 'odd_X', 'odd_2')]
+    prices = {value: _odd(value) for column in columns for value in set(column)}
+    values = [[prices[value] for value in column] for column in columns]
+
+    odds = np.full((len(fixtures), len(bookmaker_ids), 3), np.nan, dtype=np.float64)
+    if rows:
+        odds[np.array(f_idx), np.array(b_idx)] = np.array(values, dtype=np.float64).T
+    return fixtures, list(bookmaker_ids), odds
+
+
+def scan(odds: np.ndarray):
+    """
+    Pentru toate meciurile deodată: cea mai bună cotă per rezultat, casa care o oferă și
+    suma probabilităților implicite 1/cotă. Sub 1 înseamnă arbitraj (surebet).
+    Meciurile fără nicio cotă pentru un rezultat au suma infinită.
+    """
+    filled = np.where(np.isnan(odds), 0.0, odds)
+    best_book = filled.argmax(axis=1)                           # (F, 3)
+    best_odds = np.take_along_axis(filled, best_book[:, None, :], axis=1)[:, 0, :]
+    with np.errstate(divide='ignore'):
+        implied = np.where(best_odds > 0, 1.0 / best_odds, np.inf)
+    return best_odds, best_book, implied.sum(axis=1)
+
+
+def stake_split(best_odds: np.ndarray, implied_sum: np.ndarray, total_stake: float = 100.0):
+    """
+    Mizele care dau același câștig indiferent de rezultat: miza_i = total * (1/cota_i) / suma.
+    Întoarce (mize (F, 3), câștig garantat (F,), profit (F,)).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stakes = total_stake * (1.0 / best_odds) / implied_sum[:, None]
+        payout = total_stake / implied_sum
+    return stakes, payout, payout - total_stake
+
+
+def find_arbitrage(rows, near_threshold: float = 1.02, total_stake: float = 100.0, top: int = None):
+    """
+    Caută pe toată oferta meciurile cu arbitraj (suma < 1) și pe cele aproape de arbitraj
+    (suma < `near_threshold`), ordonate după sumă. Fiecare oportunitate conține cele trei
+    pariuri (rezultat, casă, cotă, miză pentru `total_stake`) și profitul garantat.
+    """
+    fixtures, bookmakers, odds = build_matrix(rows)
+    if not fixtures:
+        return []
+    best_odds, best_book, implied_sum = scan(odds)
+    stakes, payout, profit = stake_split(best_odds, implied_sum, total_stake)
+
+    candidates = np.flatnonzero(implied_sum < near_threshold)
+    ranked = candidates[np.argsort(implied_sum[candidates], kind='stable')]
+    if top is not None:
+        ranked = ranked[:top]
+
+    opportunities = []
+    for i in ranked:
+        (_, id1, id2), team1, team2, date = fixtures[i]
+        opportunities.append({
+            'date': date,
+            'team1': team1,
+            'team2': team2,
+            'team1_id': id1,
+            'team2_id': id2,
+            'implied_sum': round(float(implied_sum[i]), 4),
+            'arbitrage': bool(implied_sum[i] < 1.0),
+            'profit': round(float(profit[i]), 2),
+            'roi_pct': round(float(profit[i] / total_stake * 100), 2),
+            'bets': [{
+                'outcome': outcome,
+                'bookmaker': bookmakers[best_book[i, k]],
+                'odds': round(float(best_odds[i, k]), 2),
+                'stake': round(float(stakes[i, k]), 2),
+            } for k, outcome in enumerate(OUTCOMES)],
+        })
+    return opportunities
+
+
+def rows_from_merged(result: dict):
+    """
+    Rândurile unui rezultat `odds_orchestrator.fetch_all_odds` (un meci, mai multe case).
+    """
+    return [{'bookmaker': odd['bookmaker'], 'Data': result['kickoff'], 'team1': result['team1'],
+             'team2': result['team2'], 'odd_1': odd['odd_1'], 'odd_X': odd['odd_X'], 'odd_2': odd['odd_2']}
+            for odd in result['odds']]
+
+
+def load_rows(bookmaker: str, path: str):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return [dict(row, bookmaker=bookmaker) for row in csv.DictReader(f) if row.get('team1') and row.get('team2')]
+
+
+if __name__ == '__main__':
+    # python arbitrage.py [superbet=feed_superbet.csv maxbet=feed_maxbet.csv spin=feed_spin.csv]
+    # Fără argumente, oferta completă este descărcată prin feed_scrapers.
+    rows = []
+    if len(sys.argv) > 1:
+        for arg in sys.argv[1:]:
+            bookmaker, _, path = arg.partition('=')
+            rows.extend(load_rows(bookmaker, path))
+    else:
+        from feed_scrapers import FEEDS, scrape_rows
+        for bookmaker in FEEDS:
+            rows.extend(dict(row, bookmaker=bookmaker) for row in scrape_rows(bookmaker))
+
+    opportunities = find_arbitrage(rows)
+    print(f"{len(rows)} cote, {sum(o['arbitrage'] for o in opportunities)} arbitraje, "
+          f"{sum(not o['arbitrage'] for o in opportunities)} aproape de arbitraj")
+    for o in opportunities:
+        bets = '  '.join(f"{b['outcome']}@{b['odds']} ({b['bookmaker']}, {b['stake']})" for b in o['bets'])
+        print(f"{o['implied_sum']:.4f} {o['roi_pct']:+6.2f}%  {o['date']} {o['team1']} - {o['team2']}  {bets}")
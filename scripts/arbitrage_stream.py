@@ -0,0 +1,218 @@
+import csv
+import heapq
+import json
+import sys
+import time
+
+import numpy as np
+
+from arbitrage import OUTCOMES, _odd, find_arbitrage, fixture_key
+
+
+class FixtureBook:
+    """
+    Cotele curente ale unui meci la toate casele de pariuri. Pentru fiecare rezultat ține
+    un max-heap (cotă, casă) cu ștergere leneșă: o cotă nouă se adaugă în O(log B), iar
+    intrările depășite sunt scoase doar când ajung în vârf.
+    """
+
+    def __init__(self, team1: str, team2: str, date: str):
+        self.team1, self.team2, self.date = team1, team2, date
+        self.current = {}                       # casă -> (cota 1, cota X, cota 2)
+        self.heaps = [[] for _ in OUTCOMES]     # per rezultat: [(-cotă, casă)]
+        self.implied_sum = float('inf')
+        self.in_arbitrage = False
+
+    def _best(self, k: int):
+        heap = self.heaps[k]
+        while heap:
+            neg_odd, bookmaker = heap[0]
+            odds = self.current.get(bookmaker)
+            if odds is not None and odds[k] == -neg_odd:
+                return -neg_odd, bookmaker
+            heapq.heappop(heap)
+        return None, None
+
+    def update(self, bookmaker: str, odds):
+        previous = self.current.get(bookmaker)
+        self.current[bookmaker] = odds
+        for k, odd in enumerate(odds):
+            if previous is not None and previous[k] == odd:
+                continue
+            if odd == odd:  # nu e NaN
+                heap = self.heaps[k]
+                heapq.heappush(heap, (-odd, bookmaker))
+                # Prea multe intrări depășite: reconstruim heap-ul din cotele curente
+                if len(heap) > 4 * len(self.current) + 8:
+                    self.heaps[k] = [(-o[k], b) for b, o in self.current.items() if o[k] == o[k]]
+                    heapq.heapify(self.heaps[k])
+
+        total = 0.0
+        for k in range(len(OUTCOMES)):
+            best, _ = self._best(k)
+            if best is None:
+                total = float('inf')
+                break
+            total += 1.0 / best
+        self.implied_sum = total
+
+    def bets(self, total_stake: float):
+        best = [self._best(k) for k in range(len(OUTCOMES))]
+        return [{
+            'outcome': outcome,
+            'bookmaker': bookmaker,
+            'odds': odd,
+            'stake': round(total_stake * (1.0 / odd) / self.implied_sum, 2),
+        } for outcome, (odd, bookmaker) in zip(OUTCOMES, best)]
+
+
+class ArbitrageStream:
+    """
+    Detector de arbitraj incremental: fiecare tick (un rând de scraper cu odd_1/odd_X/odd_2
+    pentru o casă și un meci) actualizează doar meciul lui și emite un eveniment 'enter'
+    când meciul trece sub `threshold` sau 'exit' când iese din arbitraj.
+    """
+
+    def __init__(self, threshold: float = 1.0, total_stake: float = 100.0, on_event=None):
+        self.threshold = threshold
+        self.total_stake = total_stake
+        self.on_event = on_event
+        self.books = {}
+        self._keys = {}   # (data, team1, team2) brut -> cheia canonică a meciului
+        self._dated = {}  # (ID echipa1, ID echipa2) -> prima cheie cu dată (ca în build_matrix)
+        self.ticks = 0
+
+    def update(self, row: dict):
+        date = row.get('Data') or row.get('date') or ''
+        raw = (date, row['team1'], row['team2'])
+        key = self._keys.get(raw)
+        if key is None:
+            key = self._keys[raw] = fixture_key(*raw)
+        if not key[0]:
+            # Rând fără dată (ex. Superbet): se alătură meciului cu dată al acelorași echipe
+            key = self._dated.get(key[1:], key)
+        elif key[1:] not in self._dated:
+            self._dated[key[1:]] = key
+            undated = self.books.pop(('',) + key[1:], None)
+            if undated is not None and key not in self.books:
+                undated.date = date
+                self.books[key] = undated
+        book = self.books.get(key)
+        if book is None:
+            book = self.books[key] = FixtureBook(row['team1'], row['team2'], date)
+
+        book.update(row['bookmaker'], (_odd(row.get('odd_1')), _odd(row.get('odd_X')), _odd(row.get('odd_2'))))
+        self.ticks += 1
+
+        crossed = book.implied_sum < self.threshold
+        if crossed == book.in_arbitrage:
+            return None
+        book.in_arbitrage = crossed
+        event = {
+            'type': 'enter' if crossed else 'exit',
+            'ts': row.get('ts'),
+            'date': book.date,
+            'team1': book.team1,
+            'team2': book.team2,
+            'implied_sum': round(book.implied_sum, 4),
+        }
+        if crossed:
+            event['profit'] = round(self.total_stake / book.implied_sum - self.total_stake, 2)
+            event['bets'] = book.bets(self.total_stake)
+        if self.on_event is not None:
+            self.on_event(event)
+        return event
+
+    def open_arbitrages(self):
+        return [book for book in self.books.values() if book.in_arbitrage]
+
+
+# --- Harness de replay ---
+
+def read_ticks(path: str):
+    """
+    Tick-urile înregistrate: JSON lines sau CSV cu coloanele bookmaker, Data, team1, team2,
+    odd_1, odd_X, odd_2 și opțional ts.
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+
+def replay(ticks, threshold: float = 1.0):
+    """
+    Rulează tick-urile prin detector și măsoară debitul (tick-uri/s) și latența de detecție
+    (timpul de la primirea tick-ului până la emiterea evenimentului). La final verifică
+    faptul că starea incrementală coincide cu o scanare completă (arbitrage.find_arbitrage).
+    """
+    stream = ArbitrageStream(threshold)
+    latencies = []
+    events = []
+    started = time.perf_counter()
+    for tick in ticks:
+        received = time.perf_counter()
+        event = stream.update(tick)
+        if event is not None:
+            latencies.append(time.perf_counter() - received)
+            events.append(event)
+    elapsed = time.perf_counter() - started
+
+    latest = {}
+    for tick in ticks:
+        latest[(tick.get('Data') or tick.get('date'), tick['team1'], tick['team2'], tick['bookmaker'])] = tick
+    batch = {(o['team1_id'], o['team2_id']) for o in find_arbitrage(latest.values(), near_threshold=threshold)}
+    streamed = {fixture_key(b.date, b.team1, b.team2)[1:] for b in stream.open_arbitrages()}
+
+    lat_us = np.array(latencies) * 1e6 if latencies else np.zeros(1)
+    return {
+        'ticks': len(ticks),
+        'ticks_per_s': round(len(ticks) / elapsed) if elapsed else None,
+        'events': len(events),
+        'enter': sum(e['type'] == 'enter' for e in events),
+        'exit': sum(e['type'] == 'exit' for e in events),
+        'latency_us_p50': round(float(np.percentile(lat_us, 50)), 1),
+        'latency_us_p99': round(float(np.percentile(lat_us, 99)), 1),
+        'open_arbitrages': len(streamed),
+        'matches_full_scan': streamed == batch,
+    }
+
+
+def generate_ticks(path: str, n: int, fixtures: int = 2000, seed: int = 0):
+    """
+    Scrie un fișier de tick-uri sintetice: o ofertă inițială completă, apoi actualizări
+    ale câte unei cote la o casă, ca în refresh-urile reale.
+    """
+    rnd = np.random.default_rng(seed)
+    fair = rnd.dirichlet((4, 3, 3), size=fixtures)
+    bookmakers = ('superbet', 'maxbet', 'spin')
+    odds = {(i, b): 1 / (fair[i] * 1.05) for i in range(fixtures) for b in bookmakers}
+    ts = 1_700_000_000.0
+    with open(path, 'w', encoding='utf-8') as f:
+        def emit(i, b):
+            o = odds[(i, b)]
+            f.write(json.dumps({'ts': round(ts, 3), 'bookmaker': b, 'Data': f"{i % 28 + 1:02d}/06/2025 21:45",
+                                'team1': f"Gazde {i}", 'team2': f"Oaspeti {i}",
+                                'odd_1': f"{o[0]:.2f}", 'odd_X': f"{o[1]:.2f}", 'odd_2': f"{o[2]:.2f}"}) + '\n')
+        for (i, b) in odds:
+            emit(i, b)
+        for _ in range(n):
+            i, b, k = int(rnd.integers(fixtures)), bookmakers[rnd.integers(3)], int(rnd.integers(3))
+            odds[(i, b)][k] = max(1.01, odds[(i, b)][k] * rnd.normal(1.0, 0.04))
+            ts += rnd.exponential(0.01)
+            emit(i, b)
+
+
+if __name__ == '__main__':
+    # python arbitrage_stream.py generate ticks.jsonl [număr_actualizări]
+    # python arbitrage_stream.py replay ticks.jsonl [prag]
+    if len(sys.argv) >= 3 and sys.argv[1] == 'generate':
+        generate_ticks(sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 200_000)
+    elif len(sys.argv) >= 3 and sys.argv[1] == 'replay':
+        stats = replay(read_ticks(sys.argv[2]), float(sys.argv[3]) if len(sys.argv) > 3 else 1.0)
+        for name, value in stats.items():
+            print(f"{name:<18} {value}")
+    else:
+        print("Usage: python arbitrage_stream.py generate <ticks.jsonl> [n]")
+        print("       python arbitrage_stream.py replay <ticks.jsonl|ticks.csv> [prag]")
+        sys.exit(1)
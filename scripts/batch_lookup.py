@@ -0,0 +1,48 @@
+import csv
+from collections import defaultdict
+
+
+def group_by_search_term(fixtures, normalize=str.lower):
+    """
+    Grupează meciurile (data, gazde, oaspeți) după termenul de căutare tastat pe site.
+
+    O căutare după numele unei echipe întoarce toate meciurile în care apare echipa,
+    deci alegem greedy echipa care acoperă cele mai multe meciuri rămase, până când
+    fiecare meci este acoperit de un termen. Întoarce {termen: [meciuri]} în ordinea
+    în care termenii trebuie tastați.
+    """
+    pending = list(dict.fromkeys(fixtures))
+    groups = {}
+    while pending:
+        coverage = defaultdict(list)
+        spelling = {}
+        for fixture in pending:
+            _, home, away = fixture
+            for team in (home, away):
+                key = normalize(team)
+                spelling.setdefault(key, team)
+                if fixture not in coverage[key]:
+                    coverage[key].append(fixture)
+        # La egalitate preferăm echipa gazdă a primului meci rămas (comportamentul vechi)
+        first_home = normalize(pending[0][1])
+        best = max(coverage, key=lambda k: (len(coverage[k]), k == first_home))
+        groups[spelling[best]] = coverage[best]
+        covered = set(coverage[best])
+        pending = [f for f in pending if f not in covered]
+    return groups
+
+
+def load_fixtures(path):
+    """
+    Citește o listă de meciuri dintr-un CSV cu coloanele data, echipa1, echipa2
+    (antetul, dacă există, este ignorat).
+    """
+    fixtures = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) < 3:
+                continue
+            if row[0].strip().lower() in ('data', 'date'):
+                continue
+            fixtures.append((row[0].strip(), row[1].strip(), row[2].strip()))
+    return fixtures
@@ -0,0 +1,50 @@
+import sys
+import time
+
+import numpy as np
+
+from arbitrage import build_matrix, find_arbitrage, scan
+
+BOOKMAKERS = ('superbet', 'maxbet', 'spin')
+TEAM_POOL = 3000
+
+
+def synthetic_rows(fixtures, seed=0):
+    # Cote cu marja obișnuită (~5%), plus zgomot per casă, ca o mică parte să devină arbitraje
+    rnd = np.random.default_rng(seed)
+    fair = rnd.dirichlet((4, 3, 3), size=fixtures)
+    # O ofertă reală are câteva mii de echipe care apar în mai multe meciuri
+    teams = [f"Echipa {k}" for k in range(TEAM_POOL)]
+    pairs = [(teams[(2 * i) % TEAM_POOL], teams[(2 * i + 1) % TEAM_POOL]) for i in range(fixtures)]
+    rows = []
+    for b, bookmaker in enumerate(BOOKMAKERS):
+        odds = 1 / (fair * 1.05 * rnd.normal(1.0, 0.03, size=fair.shape))
+        for i in range(fixtures):
+            rows.append({'bookmaker': bookmaker, 'Data': f"{(i // (TEAM_POOL // 2)) % 28 + 1:02d}/06/2025 21:45",
+                         'team1': pairs[i][0], 'team2': pairs[i][1],
+                         'odd_1': f"{odds[i, 0]:.2f}", 'odd_X': f"{odds[i, 1]:.2f}", 'odd_2': f"{odds[i, 2]:.2f}"})
+    return rows
+
+
+if __name__ == '__main__':
+    # python bench_arbitrage.py [număr_rânduri meci x casă]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = synthetic_rows(n // len(BOOKMAKERS))
+
+    started = time.perf_counter()
+    fixtures, bookmakers, odds = build_matrix(rows)
+    build_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scan(odds)
+    scan_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    opportunities = find_arbitrage(rows)
+    total_time = time.perf_counter() - started
+
+    print(f"{len(rows):,} rânduri, {len(fixtures):,} meciuri")
+    print(f"construire matrice:   {build_time * 1000:8.1f} ms")
+    print(f"scanare vectorizată:  {scan_time * 1000:8.1f} ms")
+    print(f"find_arbitrage total: {total_time * 1000:8.1f} ms "
+          f"({sum(o['arbitrage'] for o in opportunities)} arbitraje, {len(opportunities)} cu suma < 1.02)")
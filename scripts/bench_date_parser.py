@@ -0,0 +1,123 @@
+import random
+import re
+import sys
+import time
+from datetime import datetime, date, timedelta
+
+from date_parser import _parse_cached, parse_many, parse_match_datetime
+
+REF_DATE = date(2025, 4, 28)
+
+# Zilele săptămânii așa cum apar pe Superbet (abreviate) și pe Spin (întregi), de luni până duminică
+WEEKDAYS_SHORT = ("lun.", "mar.", "mie.", "joi", "vin.", "sâm.", "dum.")
+WEEKDAYS_LONG = ("Luni", "Marți", "Miercuri", "Joi", "Vineri", "Sâmbătă", "Duminică")
+MONTHS_LONG = ("Ianuarie", "Februarie", "Martie", "Aprilie", "Mai", "Iunie", "Iulie",
+               "August", "Septembrie", "Octombrie", "Noiembrie", "Decembrie")
+
+
+def random_samples(rnd: random.Random, n: int) -> list:
+    """
+    `n` date afișate de case pentru meciuri reale din următoarele ~6 luni față de REF_DATE
+    (zi, lună și oră de start variate), în proporții apropiate de cele din paginile scrapuite.
+    Rezultă zeci de mii de șiruri distincte, deci cache-ul rece chiar parsează.
+    """
+    out = []
+    for _ in range(n):
+        kind = rnd.random()
+        # Orele de start: 12:00-23:55, din 5 în 5 minute
+        hh, mm = rnd.randint(12, 23), rnd.randrange(0, 60, 5)
+        if kind < 0.15:
+            out.append(f"{rnd.choice(('astăzi', 'azi', 'astazi'))}, {hh}:{mm:02d}")
+            continue
+        if kind < 0.25:
+            out.append(f"{rnd.choice(('mâine', 'maine'))}, {hh}:{mm:02d}")
+            continue
+        # "mie. 30" are sens doar în următoarea lună; restul formatelor până la ~6 luni
+        day = REF_DATE + timedelta(days=rnd.randint(2, 29 if kind < 0.6 else 180))
+        if kind < 0.6:
+            out.append(f"{WEEKDAYS_SHORT[day.weekday()]} {day.day}, {hh}:{mm:02d}")
+        elif kind < 0.75:
+            out.append(f"{day.day:02d}.{day.month:02d}, {hh}:{mm:02d}")
+        elif kind < 0.85:
+            out.append(f"{day.day:02d}/{day.month:02d}" + (f" {hh}:{mm:02d}" if rnd.random() < 0.5 else ""))
+        else:
+            out.append(f"{WEEKDAYS_LONG[day.weekday()]} {day.day} {MONTHS_LONG[day.month - 1]} {day.year}, {hh}:{mm:02d}")
+    return out
+
+
+MONTHS_RO = {
+    'ianuarie': 1, 'februarie': 2, 'martie': 3, 'aprilie': 4,
+    'mai': 5, 'iunie': 6, 'iulie': 7, 'august': 8,
+    'septembrie': 9, 'octombrie': 10, 'noiembrie': 11, 'decembrie': 12
+}
+
+
+def legacy_parse(s: str, ref_date: date = REF_DATE) -> datetime:
+    # Copia vechiului parser din scrapere (regex-uri compilate la fiecare apel, fără cache),
+    # extinsă cu formatele Spin/MaxBet ca să acopere aceleași șiruri
+    s = s.strip()
+    low = s.lower()
+
+    m = re.match(r'^(?:astăzi|astazi|azi)\s*,\s*(\d{1,2}):(\d{2})$', low)
+    if m:
+        hh, mm = map(int, m.groups())
+        return datetime(ref_date.year, ref_date.month, ref_date.day, hh, mm)
+
+    m = re.match(r'^(?:mâine|maine)\s*,\s*(\d{1,2}):(\d{2})$', low)
+    if m:
+        hh, mm = map(int, m.groups())
+        tomorrow = ref_date + timedelta(days=1)
+        return datetime(tomorrow.year, tomorrow.month, tomorrow.day, hh, mm)
+
+    m = re.match(r'^(\d{1,2})[./](\d{1,2})(?:\s*,?\s*(\d{1,2}):(\d{2}))?$', low)
+    if m:
+        d, mo, hh, mm = m.groups()
+        return datetime(ref_date.year, int(mo), int(d), int(hh or 0), int(mm or 0))
+
+    m = re.match(r'^[a-zăâîșț]+\s+(\d{1,2})\s+([a-zăâîșț]+)\s+(\d{4})\s*,\s*(\d{1,2}):(\d{2})$', low)
+    if m:
+        d, month, yr, hh, mm = m.groups()
+        return datetime(int(yr), MONTHS_RO[month], int(d), int(hh), int(mm))
+
+    m = re.match(r'^([^\d,\.]+)\.?\s*(\d{1,2})\s*,\s*(\d{1,2}):(\d{2})$', low)
+    if m:
+        _, day_str, hh_str, mm_str = m.groups()
+        day, hh, mm = int(day_str), int(hh_str), int(mm_str)
+        mo, yr = ref_date.month, ref_date.year
+        if day < ref_date.day:
+            mo, yr = (1, yr + 1) if mo == 12 else (mo + 1, yr)
+        return datetime(yr, mo, day, hh, mm)
+
+    raise ValueError(f"Unrecognized date format: '{s}'")
+
+
+def timed(label, fn, n):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms  {n / elapsed:12,.0f} șiruri/s")
+    return result
+
+
+if __name__ == '__main__':
+    # python bench_date_parser.py [număr_șiruri]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rnd = random.Random(0)
+    strings = random_samples(rnd, n)
+    print(f"{n} șiruri, {len(set(strings))} distincte")
+
+    expected = timed("legacy (re.match secvențial)", lambda: [legacy_parse(s) for s in strings], n)
+
+    _parse_cached.cache_clear()
+    got = timed("parse_many (cache rece)", lambda: parse_many(strings, REF_DATE), n)
+    timed("parse_many (cache cald)", lambda: parse_many(strings, REF_DATE), n)
+    timed("parse_match_datetime (cache)", lambda: [parse_match_datetime(s, REF_DATE) for s in strings], n)
+    # Șirurile distincte încap în LRU, deci trecerile calde nu mai parsează nimic (0 miss-uri noi)
+    info = _parse_cached.cache_info()
+    print(f"LRU: {info.hits} hit-uri, {info.misses} miss-uri (maxsize {info.maxsize})")
+
+    # Singura diferență intenționată: datele fără an care au trecut de ~6 luni trec în anul următor
+    mismatches = [s for s, a, b in zip(strings, expected, got) if a != b]
+    print(f"Rezultate diferite: {len(mismatches)}")
+    if mismatches:
+        sys.exit(1)
@@ -0,0 +1,50 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from odds_store import OddsStore
+
+TEAMS = ['Arsenal', 'Chelsea', 'Liverpool', 'Everton', 'Man City', 'Man United', 'Tottenham', 'West Ham',
+         'Barcelona', 'Real Madrid', 'Atletico Madrid', 'Rayo Vallecano', 'Malta', 'Lituania']
+
+
+def synthetic_rows(n, start_ts, seed=0):
+    # Instantanee la un minut distanță, rotite prin meciuri și case de pariuri
+    rnd = np.random.default_rng(seed)
+    odds = rnd.uniform(1.2, 8.0, size=(n, 3)).round(2)
+    for i in range(n):
+        fixture = i % 50
+        yield {
+            'ts': start_ts + i * 60,
+            'kickoff': start_ts + (fixture + 1) * 86400,
+            'bookmaker': ('superbet', 'maxbet', 'spin')[i % 3],
+            'team1': TEAMS[fixture % len(TEAMS)],
+            'team2': TEAMS[(fixture + 1) % len(TEAMS)],
+            'odd_1': odds[i, 0], 'odd_X': odds[i, 1], 'odd_2': odds[i, 2],
+        }
+
+
+if __name__ == '__main__':
+    # python bench_odds_store.py [număr_instantanee]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    start_ts = 1_700_000_000
+    with tempfile.TemporaryDirectory() as root:
+        store = OddsStore(root, segment_rows=1 << 18)
+        started = time.perf_counter()
+        store.append(synthetic_rows(n, start_ts))
+        print(f"append {n:,} rânduri:        {time.perf_counter() - started:8.2f} s")
+
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, files in os.walk(root) for f in files)
+        print(f"dimensiune pe disc:          {size / 2**20:8.1f} MiB ({size / n:.0f} B/rând)")
+
+        store = OddsStore(root)
+        started = time.perf_counter()
+        day = store.query(start=start_ts + 30 * 86400, end=start_ts + 31 * 86400)
+        print(f"interval de o zi:            {(time.perf_counter() - started) * 1000:8.2f} ms ({len(day['ts'])} rânduri)")
+
+        started = time.perf_counter()
+        history = store.fixture_history('Arsenal', 'Chelsea')
+        print(f"istoric meci (scan complet): {(time.perf_counter() - started) * 1000:8.2f} ms ({len(history['ts'])} rânduri)")
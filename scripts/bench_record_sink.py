@@ -0,0 +1,50 @@
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from record_sink import CsvSink, JsonLinesSink, SqliteSink
+
+FIELDS = ["Data", "team1", "team2", "odd_1", "odd_X", "odd_2"]
+
+
+def rows(n):
+    for i in range(n):
+        yield [f"{i % 28 + 1:02d}/06/2025 21:45", f"Echipa {i % 400}", f"Echipa {(i + 7) % 400}", "1.85", "3.40", "4.20"]
+
+
+def per_row_append(path, n):
+    # Comportamentul vechi al write_match_to_csv: o deschidere de fișier per rând
+    for row in rows(n):
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(row)
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    fn()
+    print(f"{label:<34} {(time.perf_counter() - started) * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    # python bench_record_sink.py [număr_rânduri]
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as d:
+        timed("open/append per rând", lambda: per_row_append(os.path.join(d, 'vechi.csv'), n))
+
+        def sink_run(sink):
+            with sink:
+                sink.write_many(rows(n))
+
+        def sink_run_rows(sink, count):
+            with sink:
+                sink.write_many(rows(count))
+
+        timed("CsvSink (append, loturi de 500)", lambda: sink_run(CsvSink(os.path.join(d, 'a.csv'), FIELDS, max_rows=500)))
+        # Scraper-ele per eveniment deschid un sink pentru un singur rând, pe un fișier tot mai mare
+        timed("CsvSink (append, un rând per sink)",
+              lambda: [sink_run_rows(CsvSink(os.path.join(d, 'a.csv'), FIELDS), 1) for _ in range(1000)])
+        timed("CsvSink (înlocuire la final)", lambda: sink_run(CsvSink(os.path.join(d, 'b.csv'), FIELDS, append=False)))
+        timed("JsonLinesSink (înlocuire la final)", lambda: sink_run(JsonLinesSink(os.path.join(d, 'c.jsonl'), FIELDS, append=False)))
+        timed("SqliteSink (upsert în loturi)", lambda: sink_run(SqliteSink(os.path.join(d, 'odds.db'), 'maxbet')))
@@ -0,0 +1,106 @@
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+from refresh_scheduler import Fixture, RefreshScheduler
+
+# Costul simulat al unui lot pe un singur Chrome: încărcarea paginii + o căutare per meci
+PAGE_LOAD_S = 4.0
+PER_FIXTURE_S = 2.0
+BATCH_SIZE = 8
+STEP_S = 60                 # rezoluția mersului aleator al cotelor
+SAMPLE_EVERY_S = 300        # cât de des se măsoară prospețimea
+
+
+def make_market(n: int, hours: float, seed: int = 0):
+    """
+    `n` meciuri cu start în următoarele zece zile și cotele lor adevărate, minut cu minut,
+    ca mers aleator în log-cotă: volatilitatea crește spre start, iar unele meciuri
+    (accidentări, știri) sunt mult mai volatile decât altele.
+    """
+    rnd = np.random.default_rng(seed)
+    start = time.time()
+    kickoff = start + rnd.uniform(0.5, 240, n) * 3600
+    steps = int(hours * 3600 / STEP_S) + 1
+    t = start + np.arange(steps) * STEP_S
+    to_kickoff_h = np.maximum((kickoff[:, None] - t[None, :]) / 3600, 0.0)
+    sigma = 0.004 * rnd.lognormal(0, 0.8, n)[:, None] * (1 + 6 * np.exp(-to_kickoff_h / 6))
+    moves = rnd.normal(0, 1, (n, steps, 3)) * sigma[:, :, None] * np.sqrt(STEP_S / 3600)
+    log_odds = np.log([2.4, 3.3, 3.0]) + np.cumsum(moves, axis=1)
+    fixtures = [Fixture(f"Gazde {i}", f"Oaspeți {i}", datetime.fromtimestamp(k)) for i, k in enumerate(kickoff)]
+    return start, kickoff, log_odds, fixtures
+
+
+def simulate(policy: str, start, kickoff, log_odds, fixtures, hours: float):
+    """
+    Un singur browser, `hours` ore. 'round_robin' citește meciurile pe rând, în loturi, fără
+    pauză; 'scheduler' citește ce este scadent după RefreshScheduler și stă liber altfel.
+    Eroarea = |log-cotă adevărată − ultima citită|, medie ponderată cu 1 / ore până la start
+    pe meciurile din următoarele 24 de ore (cele pentru care contează cotele).
+    """
+    n = len(fixtures)
+    end = start + hours * 3600
+    seen = np.full((n, 3), np.nan)
+    index = {f.key: i for i, f in enumerate(fixtures)}
+    scheduler = RefreshScheduler(bookmakers=['superbet'])
+    scheduler.sync(fixtures, start)
+    now, browser, lookups, cursor = start, 0.0, 0, 0
+    next_sample, errors = start + SAMPLE_EVERY_S, []
+
+    def true_odds(i, at):
+        return log_odds[i, min(int((at - start) / STEP_S), log_odds.shape[1] - 1)]
+
+    while now < end:
+        if policy == 'round_robin':
+            live = [i for i in range(n) if kickoff[i] > now]
+            batch = [live[(cursor + j) % len(live)] for j in range(min(BATCH_SIZE, len(live)))]
+            cursor = (cursor + len(batch)) % max(len(live), 1)
+        else:
+            batch = [index[f.key] for f in scheduler.next_batch('superbet', BATCH_SIZE, now)]
+
+        if batch:
+            cost = PAGE_LOAD_S + PER_FIXTURE_S * len(batch)
+            done = now + cost
+            results = {}
+            for i in batch:
+                seen[i] = true_odds(i, done)
+                results[fixtures[i]] = dict(zip(('1', 'X', '2'), np.exp(seen[i]).round(2)))
+            if policy == 'scheduler':
+                scheduler.record('superbet', results, done, cost)
+            browser += cost
+            lookups += 1
+        else:
+            due = scheduler.next_due('superbet')
+            done = min(end, next_sample if due is None else max(due, now + 1))
+
+        while next_sample <= done and next_sample < end:
+            step = min(int((next_sample - start) / STEP_S), log_odds.shape[1] - 1)
+            to_kickoff_h = (kickoff - next_sample) / 3600
+            matters = (to_kickoff_h > 0) & (to_kickoff_h <= 24)
+            weight = 1 / np.maximum(to_kickoff_h[matters], 0.5)
+            error = np.abs(log_odds[matters, step] - seen[matters]).sum(axis=1)
+            error = np.where(np.isnan(error), 1.0, error)     # niciodată citit: eroare maximă
+            errors.append(float((weight * error).sum() / weight.sum()))
+            next_sample += SAMPLE_EVERY_S
+        now = done
+
+    return {
+        'policy': policy,
+        'browser_hours': round(browser / 3600, 2),
+        'lookups': lookups,
+        'weighted_error': round(float(np.mean(errors)), 4),
+        'error_x_browser_hours': round(float(np.mean(errors)) * browser / 3600, 4),
+    }
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    hours = float(sys.argv[2]) if len(sys.argv) > 2 else 24
+    market = make_market(n, hours)
+    print(f"{n} meciuri, {hours:g} ore simulate, un browser, loturi de {BATCH_SIZE}")
+    for policy in ('round_robin', 'scheduler'):
+        started = time.perf_counter()
+        result = simulate(policy, *market, hours)
+        print(result, f"({time.perf_counter() - started:.1f} s)")
@@ -0,0 +1,671 @@
+import contextlib
+import csv
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from date_parser import MONTHS_RO
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Adresele reale ale site-urilor sunt rescrise în http://127.0.0.1:<port>/<host><cale>;
+# fiecare pagină înregistrată răspunde pentru calea ei, iar datele vin din /bench/<site>/*.json
+PAGE_ROUTES = [
+    (r'^/superbet\.ro/pariuri-sportive/fotbal/toate$', 'superbet_listing.html'),
+    (r'^/superbet\.ro/cautare$', 'superbet_search.html'),
+    (r'^/www\.maxbet\.ro/ro/pariuri-sportive$', 'maxbet.html'),
+    (r'^/spin\.ro/sport$', 'spin.html'),
+    (r'^/bench/(superbet|maxbet|spin)/([\w-]+)\.json$', '{0}/{1}.json'),
+    # Resursele grele ale paginilor reale: bannere, fonturi, video, trackere și consent manager
+    (r'^/bench/assets/([\w.-]+)$', 'assets/{0}'),
+    (r'^/(cdn\.cookielaw\.org|www\.googletagmanager\.com|www\.google-analytics\.com)/([\w.-]+)$',
+     'thirdparty/{0}/{1}'),
+]
+
+PROFILES = ('full', 'lean')
+
+SCENARIOS = ('superbet_listing', 'maxbet_listing', 'superbet_search', 'maxbet_search', 'spin_search', 'tabs_search')
+
+# Scenariile de căutare cu câte un driver per apel, comparate cu 'tabs_search' (aceleași căutări, un Chrome)
+DRIVER_SEARCHES = ('superbet_search', 'maxbet_search', 'spin_search')
+
+_ROOTS = ['Dinamo', 'Rapid', 'Sporting', 'Atletic', 'Unirea', 'Viitorul', 'Olimpia', 'Progresul',
+          'Victoria', 'Gloria', 'Metalul', 'Minerul']
+_CITIES = ['Arad', 'Bacău', 'Brașov', 'Buzău', 'Cluj', 'Craiova', 'Constanța', 'Deva', 'Focșani', 'Galați',
+           'Iași', 'Oradea', 'Pitești', 'Ploiești', 'Reșița', 'Sibiu', 'Suceava', 'Timișoara', 'Tulcea', 'Vaslui']
+_WEEKDAYS = ['Luni', 'Marți', 'Miercuri', 'Joi', 'Vineri', 'Sâmbătă', 'Duminică']
+_MONTHS = {number: name.capitalize() for name, number in MONTHS_RO.items()}
+
+
+# --- Paginile înregistrate ---
+# Păstrează exact structura (clase, tag-uri, texte) citită de extractors.py și de scraper-e;
+# datele sunt încărcate prin fetch, pe pagini, ca pe site-urile reale.
+
+_SUPERBET_CARD_JS = """
+const card = (e, cls) => `<div class="${cls}"><div class="event-card__main-content">
+<div class="event-card-label"><span class="capitalize">${e.date}</span></div>
+<div class="event-competitor__name e2e-event-team1-name">${e.home}</div>
+<div class="event-competitor__name e2e-event-team2-name">${e.away}</div></div>
+${['1', 'X', '2'].map((name, i) => `<div class="odd-offer__odd-button e2e-odd-pick">
+<span class="odd-button__odd-name e2e-odd-name">${name}</span>
+<span class="odd-button__odd-value-new e2e-odd-current-value">${e.odds[i]}</span></div>`).join('')}</div>`;
+"""
+
+_SUPERBET_LISTING_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Superbet - Fotbal</title>
+<style>.event-row-container { min-height: 64px; border-bottom: 1px solid #ddd; }</style></head>
+<body><div id="events"></div>
+<script>
+__CARD_JS__
+const PAGES = __PAGES__, WINDOW = __WINDOW__;
+const list = document.getElementById('events');
+let next = 0, loading = false;
+function load() {
+    if (loading || next >= PAGES) return;
+    loading = true;
+    fetch(`/bench/superbet/page-${next}.json`).then(r => r.json()).then(events => {
+        list.insertAdjacentHTML('beforeend', events.map(e => card(e, 'event-row-container')).join(''));
+        // Lista este virtualizată, ca pe site: în DOM rămân doar ultimele WINDOW rânduri
+        while (list.children.length > WINDOW) list.firstElementChild.remove();
+        next++;
+        loading = false;
+    });
+}
+window.addEventListener('scroll', () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 400) load();
+});
+load();
+</script></body></html>
+"""
+
+_SUPERBET_SEARCH_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Superbet - Căutare</title></head>
+<body><div id="results"></div>
+<script>
+__CARD_JS__
+const term = (new URLSearchParams(location.search).get('query') || '').toLowerCase();
+fetch('/bench/superbet/search.json').then(r => r.json()).then(events => {
+    const hits = events.filter(e => e.home.toLowerCase().includes(term) || e.away.toLowerCase().includes(term));
+    document.getElementById('results').innerHTML =
+        hits.slice(0, 50).map(e => card(e, 'event-card e2e-event-row event-row-container__event')).join('');
+});
+</script></body></html>
+"""
+
+_MAXBET_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>MaxBet - Pariuri sportive</title>
+<style>event { display: block; min-height: 56px; border-bottom: 1px solid #ddd; }</style></head>
+<body>
+<div class="filter-container"><div class="filter-item">Populare</div><div class="filter-item">Toate</div></div>
+<input type="text" placeholder="Căutare">
+<div class="tbody" id="events"></div>
+<script>
+const PAGES = __PAGES__;
+const list = document.getElementById('events');
+const row = e => `<event><div class="time"><span>${e.date}</span><span>${e.time}</span><span>+${e.markets}</span></div>
+<div class="general__competitors"><span title="${e.home}">${e.home}</span><span title="${e.away}">${e.away}</span></div>
+<div class="market__wrapper">${e.odds.map(o => `<div class="market__outcome"><span class="outcome centered">${o}</span></div>`).join('')}</div></event>`;
+let mode = 'popular', next = 0, loading = false, timer = null;
+function load() {
+    if (mode !== 'all' || loading || next >= PAGES) return;
+    loading = true;
+    fetch(`/bench/maxbet/page-${next}.json`).then(r => r.json()).then(events => {
+        if (mode === 'all') list.insertAdjacentHTML('beforeend', events.map(row).join(''));
+        next++;
+        loading = false;
+    });
+}
+fetch('/bench/maxbet/page-0.json').then(r => r.json()).then(events => {
+    if (mode === 'popular') list.innerHTML = events.slice(0, 10).map(row).join('');
+});
+document.querySelectorAll('.filter-item')[1].addEventListener('click', () => {
+    mode = 'all';
+    next = 0;
+    list.innerHTML = '';
+    load();
+});
+window.addEventListener('scroll', () => {
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 400) load();
+});
+const input = document.querySelector("input[placeholder='Căutare']");
+input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => {
+        const term = input.value.trim().toLowerCase();
+        if (!term) return;
+        mode = 'search';
+        fetch('/bench/maxbet/search.json').then(r => r.json()).then(events => {
+            const hits = events.filter(e => e.home.toLowerCase().includes(term) || e.away.toLowerCase().includes(term));
+            list.innerHTML = hits.slice(0, 50).map(row).join('');
+        });
+    }, 150);
+});
+</script></body></html>
+"""
+
+_SPIN_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Spin - Sport</title></head>
+<body>
+<div class="widget-ricerca-side"><input id="match-search-input" type="text"></div>
+<div id="results"></div>
+<script>
+const input = document.getElementById('match-search-input');
+const quota = (label, value) => `<div class="contenitoreSingolaQuota"><p class="titoloQuotazione">${label}</p><p class="tipoQuotazione_1">${value}</p></div>`;
+const row = e => `<div class="contenitoreRiga"><div class="tabellaQuoteTempo">
+<span class="tabellaQuoteTempo__data">${e.day}</span><span class="tabellaQuoteTempo__ora">${e.hour}</span></div>
+<p class="font-weight-bold m-0 text-right">${e.home}</p><p class="font-weight-bold m-0 text-left">${e.away}</p>
+<div class="gridInterernaQuotazioni">${['1', 'X', '2'].map((label, i) => quota(label, e.odds[i])).join('')}</div></div>`;
+input.addEventListener('keydown', event => {
+    if (event.key !== 'Enter') return;
+    const term = input.value.trim().toLowerCase();
+    document.getElementById('results').innerHTML = '';
+    fetch('/bench/spin/search.json').then(r => r.json()).then(events => {
+        const hits = events.filter(e => e.home.toLowerCase().includes(term) || e.away.toLowerCase().includes(term));
+        document.getElementById('results').innerHTML = hits.slice(0, 50).map(row).join('');
+    });
+});
+</script></body></html>
+"""
+
+
+# Inserate în toate paginile: ce descarcă un browser complet pe lângă rândurile cu cote
+_HEAVY_HEAD = """<link rel="stylesheet" href="/bench/assets/site.css">
+<script async src="/www.googletagmanager.com/gtm.js"></script>
+<script async src="/cdn.cookielaw.org/otSDKStub.js"></script>
+"""
+
+_HEAVY_BODY = """<div class="promo">__BANNERS__<video src="/bench/assets/promo.mp4" autoplay muted loop playsinline></video></div>
+"""
+
+_SITE_CSS = """@font-face { font-family: 'Brand'; src: url('/bench/assets/brand.woff2') format('woff2'); }
+body { font-family: 'Brand', sans-serif; }
+.promo { height: 120px; overflow: hidden; background: url('/bench/assets/hero.png'); }
+.promo img { height: 120px; }
+"""
+
+# Trackerul trimite un beacon pe secundă, deci ține rețeaua ocupată ca pe site-urile reale
+_GTM_JS = """setInterval(() => fetch('/www.google-analytics.com/collect.json').catch(() => {}), 1000);
+"""
+
+# Banner de consimțământ mic, jos, ca să nu acopere câmpurile de căutare
+_ONETRUST_JS = """document.body.insertAdjacentHTML('beforeend', '<div id="onetrust-banner-sdk" style="position:fixed;bottom:0;height:60px;width:100%;background:#eee"><button id="onetrust-accept-btn-handler">Accept</button></div>');
+document.getElementById('onetrust-accept-btn-handler').onclick = () => document.getElementById('onetrust-banner-sdk').remove();
+"""
+
+
+def _write_assets(directory: str, banners: int = 6, seed: int = 0):
+    rnd = random.Random(seed)
+    blob = lambda header, size: header + rnd.randbytes(size - len(header))
+    files = {
+        os.path.join('assets', 'site.css'): _SITE_CSS.encode(),
+        os.path.join('assets', 'hero.png'): blob(b'\x89PNG\r\n\x1a\n', 300_000),
+        os.path.join('assets', 'brand.woff2'): blob(b'wOF2', 90_000),
+        os.path.join('assets', 'promo.mp4'): blob(b'\x00\x00\x00\x18ftypmp42', 1_500_000),
+        os.path.join('thirdparty', 'www.googletagmanager.com', 'gtm.js'): _GTM_JS.encode() + b'//' + b'x' * 250_000,
+        os.path.join('thirdparty', 'cdn.cookielaw.org', 'otSDKStub.js'): _ONETRUST_JS.encode() + b'//' + b'x' * 120_000,
+        os.path.join('thirdparty', 'www.google-analytics.com', 'collect.json'): b'{}',
+    }
+    files.update({os.path.join('assets', f'banner-{i}.png'): blob(b'\x89PNG\r\n\x1a\n', 120_000)
+                  for i in range(banners)})
+    for name, data in files.items():
+        os.makedirs(os.path.dirname(os.path.join(directory, name)), exist_ok=True)
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(data)
+    return ''.join(f'<img src="/bench/assets/banner-{i}.png" alt="">' for i in range(banners))
+
+
+def make_events(n: int, seed: int = 0, start: datetime = None):
+    """
+    `n` meciuri sintetice (gazde, oaspeți, start, cote) în următoarele două săptămâni,
+    ordonate după start, cu echipe care se repetă ca într-o ofertă reală.
+    """
+    rnd = random.Random(seed)
+    start = start or datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(hours=2)
+    teams = [f"{root} {city}" for root in _ROOTS for city in _CITIES]
+    events, used = [], set()
+    while len(events) < n:
+        home, away = rnd.sample(teams, 2)
+        kickoff = start + timedelta(minutes=15 * rnd.randrange(14 * 24 * 4))
+        if (home, away, kickoff.date()) in used:
+            continue
+        used.add((home, away, kickoff.date()))
+        margin = rnd.uniform(1.04, 1.08)
+        fair = [rnd.uniform(0.2, 0.6), rnd.uniform(0.2, 0.3)]
+        fair.append(max(0.05, 1.0 - sum(fair)))
+        total = sum(fair)
+        odds = [f"{max(1.01, total / (p * margin)):.2f}" for p in fair]
+        events.append({'home': home, 'away': away, 'kickoff': kickoff, 'odds': odds, 'markets': rnd.randint(20, 300)})
+    events.sort(key=lambda e: e['kickoff'])
+    return events
+
+
+def _site_events(events):
+    # Fiecare site afișează data altfel (vezi formatele din date_parser)
+    return {
+        'superbet': [{'date': e['kickoff'].strftime('%d.%m, %H:%M'), 'home': e['home'], 'away': e['away'],
+                      'odds': e['odds']} for e in events],
+        'maxbet': [{'date': e['kickoff'].strftime('%d/%m'), 'time': e['kickoff'].strftime('%H:%M'),
+                    'home': e['home'], 'away': e['away'], 'odds': e['odds'], 'markets': e['markets']} for e in events],
+        'spin': [{'day': f"{_WEEKDAYS[e['kickoff'].weekday()]} {e['kickoff'].day} {_MONTHS[e['kickoff'].month]} "
+                         f"{e['kickoff'].year}",
+                  'hour': e['kickoff'].strftime('%H:%M'), 'home': e['home'], 'away': e['away'],
+                  'odds': e['odds']} for e in events],
+    }
+
+
+def write_snapshots(directory: str, n_events: int = 1000, searches: int = 20, page_size: int = 40,
+                    window: int = 150, seed: int = 0):
+    """
+    Scrie paginile înregistrate și datele lor în `directory`, plus fixtures.json cu meciurile
+    căutate de scenariile de căutare (în formatul de dată al fiecărui scraper). Paginile
+    încarcă și resursele grele ale site-urilor reale (bannere, font, video, trackere, banner
+    de cookies), ca diferența dintre profilurile de browser să fie vizibilă.
+    """
+    events = make_events(n_events, seed)
+    per_site = _site_events(events)
+    pages = (len(events) + page_size - 1) // page_size
+    for site, rows in per_site.items():
+        os.makedirs(os.path.join(directory, site), exist_ok=True)
+        with open(os.path.join(directory, site, 'search.json'), 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False)
+        for page in range(pages):
+            with open(os.path.join(directory, site, f'page-{page}.json'), 'w', encoding='utf-8') as f:
+                json.dump(rows[page * page_size:(page + 1) * page_size], f, ensure_ascii=False)
+
+    banners = _write_assets(directory, seed=seed)
+    templates = {
+        'superbet_listing.html': _SUPERBET_LISTING_HTML,
+        'superbet_search.html': _SUPERBET_SEARCH_HTML,
+        'maxbet.html': _MAXBET_HTML,
+        'spin.html': _SPIN_HTML,
+    }
+    for filename, html in templates.items():
+        html = (html.replace('__CARD_JS__', _SUPERBET_CARD_JS).replace('__PAGES__', str(pages))
+                .replace('__WINDOW__', str(window)).replace('</head>', _HEAVY_HEAD + '</head>', 1)
+                .replace('<body>', '<body>' + _HEAVY_BODY.replace('__BANNERS__', banners), 1))
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+    wanted = random.Random(seed + 1).sample(events, min(searches, len(events)))
+    fixtures = {
+        'superbet': [[e['home'], e['away']] for e in wanted],
+        'maxbet': [[e['kickoff'].strftime('%d/%m'), e['home'], e['away']] for e in wanted],
+        'spin': [[e['kickoff'].strftime('%d/%m/%Y %H:%M'), e['home'], e['away']] for e in wanted],
+        'events': len(events),
+    }
+    with open(os.path.join(directory, 'fixtures.json'), 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f, ensure_ascii=False)
+    return fixtures
+
+
+# --- Măsurători ---
+
+class DriverProbe:
+    """
+    Se interpune în driver.execute, prin care trec toate comenzile WebDriver (inclusiv cele
+    ale elementelor): numără roundtrip-urile, însumează timpul pe tip de comandă și rescrie
+    adresele site-urilor reale către serverul local.
+    """
+
+    PHASES = {
+        'get': 'navigate',
+        'w3cExecuteScript': 'script',
+        'w3cExecuteScriptAsync': 'async_wait',
+        'findElement': 'element',
+        'findElements': 'element',
+        'findChildElement': 'element',
+        'findChildElements': 'element',
+        'clickElement': 'element',
+        'sendKeysToElement': 'element',
+        'clearElement': 'element',
+        'getElementText': 'element',
+        'getElementAttribute': 'element',
+    }
+
+    def __init__(self, driver, base_url: str = None):
+        self.driver = driver
+        self.base_url = base_url
+        self.roundtrips = 0
+        self.by_command = {}
+        self.seconds = {}
+        self._original = driver.execute
+        driver.execute = self._execute
+
+    def rewrite(self, url: str) -> str:
+        if not self.base_url or not url.startswith(('http://', 'https://')) or url.startswith(self.base_url):
+            return url
+        return f"{self.base_url}/{url.split('://', 1)[1]}"
+
+    def _execute(self, command, params=None):
+        if command == 'get' and params:
+            params = dict(params, url=self.rewrite(params['url']))
+        started = time.perf_counter()
+        try:
+            return self._original(command, params)
+        finally:
+            phase = self.PHASES.get(command, 'other')
+            self.seconds[phase] = self.seconds.get(phase, 0.0) + time.perf_counter() - started
+            self.by_command[command] = self.by_command.get(command, 0) + 1
+            self.roundtrips += 1
+
+    def detach(self):
+        self.driver.execute = self._original
+
+
+def _vm_hwm_kb(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_peak_rss_kb(root_pid: int):
+    """
+    Suma vârfurilor de memorie rezidentă (VmHWM) pentru procesul dat și toți descendenții lui
+    (chromedriver + procesele Chrome). Doar pe Linux; altfel None.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += _vm_hwm_kb(pid)
+        stack.extend(children.get(pid, []))
+    return total
+
+
+def _self_peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _count_csv_rows(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path, newline='', encoding='utf-8') as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+
+def _load_script(filename: str):
+    # Scriptul paginii principale are '+' în nume, deci nu poate fi importat direct
+    spec = importlib.util.spec_from_file_location(os.path.splitext(filename)[0].replace('+', '_'),
+                                                  os.path.join(SCRIPTS_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _scenario(name: str, driver, fixtures: dict, workdir: str, rewrite=None) -> int:
+    """
+    Rulează un scraper din scripts/ exact cum e apelat în producție, cu driverul injectat.
+    Întoarce numărul de evenimente extrase (rânduri scrise sau meciuri găsite).
+    """
+    if name == 'superbet_listing':
+        _load_script('scraper_pagina_principala+date_scaper.py').main(driver)
+        return _count_csv_rows(os.path.join(workdir, 'all_football_matches.csv'))
+    if name == 'maxbet_listing':
+        from scraper_toate_meciurile_maxbet import scrape_odds
+        output = os.path.join(workdir, 'maxbet_meciuri.csv')
+        scrape_odds(output, driver=driver)
+        return _count_csv_rows(output)
+    if name == 'superbet_search':
+        from scraper_cota_eveniment_superbet import scrape_odds
+        return sum(scrape_odds(home, away, 'odds_superbet.csv', driver=driver) is not None
+                   for home, away in fixtures['superbet'])
+    if name == 'maxbet_search':
+        from scraper_cota_eveniment_maxbet import scrape_odds_batch
+        results = scrape_odds_batch([tuple(f) for f in fixtures['maxbet']], driver=driver)
+        return sum(odds is not None for odds in results.values())
+    if name == 'spin_search':
+        from script_cautare_meci_spin import scrape_odds_batch
+        results = scrape_odds_batch([tuple(f) for f in fixtures['spin']], driver=driver)
+        return sum(odds is not None for odds in results.values())
+    if name == 'tabs_search':
+        # Toate căutările celor trei scenarii de mai sus, în tab-uri ale aceluiași Chrome
+        from tab_engine import scrape_many
+        requests = {'superbet': [(None, home, away) for home, away in fixtures['superbet']],
+                    'maxbet': [tuple(f) for f in fixtures['maxbet']],
+                    'spin': [tuple(f) for f in fixtures['spin']]}
+        results = scrape_many(requests, driver=driver, rewrite=rewrite, consent_timeout=1)
+        return sum(odds is not None for found in results.values() for odds in found.values())
+    raise ValueError(f"Scenariu necunoscut: '{name}'")
+
+
+def run_scenario(name: str, base_url: str, pages_dir: str, headless: bool = True, profile: str = 'full') -> dict:
+    """
+    Un scenariu, într-un director de lucru temporar (scraper-ele scriu CSV-uri în cwd), cu
+    profilul de browser `profile` din driver_pool: timpul de pornire a driverului, timpul
+    scraper-ului defalcat pe tipuri de comenzi WebDriver (restul fiind timp Python/sleep),
+    roundtrip-uri, evenimente/s și memoria de vârf.
+    """
+    from driver_pool import create_driver
+
+    with open(os.path.join(pages_dir, 'fixtures.json'), encoding='utf-8') as f:
+        fixtures = json.load(f)
+    workdir = tempfile.mkdtemp(prefix=f'bench_{name}_')
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    started = time.perf_counter()
+    driver = create_driver(headless, profile, bookmaker=name.split('_')[0])
+    driver_start = time.perf_counter() - started
+    probe = DriverProbe(driver, base_url)
+    try:
+        started = time.perf_counter()
+        with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+            events = _scenario(name, driver, fixtures, workdir, probe.rewrite)
+        scrape = time.perf_counter() - started
+        browser_peak = process_tree_peak_rss_kb(driver.service.process.pid)
+    finally:
+        probe.detach()
+        started = time.perf_counter()
+        driver.quit()
+        teardown = time.perf_counter() - started
+        os.chdir(previous_cwd)
+
+    phases = {'driver_start': round(driver_start, 3)}
+    phases.update({f"scrape_{phase}": round(s, 3) for phase, s in sorted(probe.seconds.items())})
+    phases['scrape_client'] = round(scrape - sum(probe.seconds.values()), 3)
+    phases['teardown'] = round(teardown, 3)
+    return {
+        'scenario': name,
+        'profile': profile,
+        'events': events,
+        'scrape_s': round(scrape, 3),
+        'events_per_s': round(events / scrape, 2) if scrape else None,
+        'roundtrips': probe.roundtrips,
+        'roundtrips_per_event': round(probe.roundtrips / events, 2) if events else None,
+        'roundtrips_by_command': dict(sorted(probe.by_command.items(), key=lambda kv: -kv[1])),
+        'phases_s': phases,
+        'peak_rss_kb': {'harness': _self_peak_rss_kb(), 'browser': browser_peak},
+        'events_per_s_per_gb': round(events / scrape / (browser_peak / 2 ** 20), 2) if scrape and browser_peak else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(scenarios=SCENARIOS, n_events: int = 1000, searches: int = 20, pages_dir: str = None,
+              headless: bool = True, profiles=('full',)) -> dict:
+    """
+    Servește paginile (înregistrate în `pages_dir` sau generate) de pe un server local și rulează
+    fiecare scenariu, cu fiecare profil de browser, într-un proces separat, ca memoria de vârf
+    să fie a scenariului respectiv. Octeții și cererile servite sunt numărate pe server.
+    """
+    from feed_stub_server import start_stub_server
+
+    with tempfile.TemporaryDirectory() as generated:
+        if pages_dir is None:
+            pages_dir = generated
+            write_snapshots(pages_dir, n_events, searches)
+        with open(os.path.join(pages_dir, 'fixtures.json'), encoding='utf-8') as f:
+            fixtures = json.load(f)
+        server, base_url = start_stub_server(fixtures_dir=pages_dir, routes=PAGE_ROUTES)
+        results = []
+        try:
+            for name in scenarios:
+                for profile in profiles:
+                    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as out:
+                        result_path = out.name
+                    command = [sys.executable, os.path.abspath(__file__), '--run-one', name, '--base-url', base_url,
+                               '--pages', pages_dir, '--result', result_path, '--profile', profile]
+                    if not headless:
+                        command.append('--headful')
+                    served = (server.requests_served, server.bytes_sent)
+                    proc = subprocess.run(command, capture_output=True, text=True)
+                    if proc.returncode == 0:
+                        with open(result_path, encoding='utf-8') as f:
+                            result = json.load(f)
+                    else:
+                        result = {'scenario': name, 'profile': profile,
+                                  'error': (proc.stderr or proc.stdout).strip()[-2000:]}
+                    result['served'] = {'requests': server.requests_served - served[0],
+                                        'bytes': server.bytes_sent - served[1]}
+                    results.append(result)
+                    os.remove(result_path)
+        finally:
+            server.shutdown()
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'events': fixtures.get('events'),
+        'searches': len(fixtures['superbet']),
+        'headless': headless,
+        'results': results,
+        'profile_comparison': compare_profiles(results),
+        'engine_comparison': compare_engines(results),
+    }
+
+
+def compare_engines(results):
+    """
+    Pentru fiecare profil: evenimente/s per GB de memorie a browserului cu câte un Chrome per
+    căutare (scenariile DRIVER_SEARCHES, rulate pe rând) față de toate căutările în tab-urile
+    unui singur Chrome ('tabs_search'). Cu N Chrome-uri în paralel, debitul per GB al primului
+    model rămâne cel al unui singur driver.
+    """
+    comparison = {}
+    for profile in {r.get('profile') for r in results}:
+        runs = {r['scenario']: r for r in results if r.get('profile') == profile and 'error' not in r}
+        drivers = [runs[name] for name in DRIVER_SEARCHES if name in runs]
+        tabs = runs.get('tabs_search')
+        if not drivers or tabs is None or not all(r['peak_rss_kb']['browser'] for r in drivers):
+            continue
+        events = sum(r['events'] for r in drivers)
+        seconds = sum(r['scrape_s'] for r in drivers)
+        gb = sum(r['peak_rss_kb']['browser'] for r in drivers) / len(drivers) / 2 ** 20
+        per_driver = events / seconds / gb if seconds else None
+        comparison[profile] = {
+            'driver_per_call': {'events': events, 'scrape_s': round(seconds, 3),
+                                'events_per_s_per_gb': round(per_driver, 2) if per_driver else None},
+            'tabs': {'events': tabs['events'], 'scrape_s': tabs['scrape_s'],
+                     'events_per_s_per_gb': tabs['events_per_s_per_gb']},
+            'ratio': round(tabs['events_per_s_per_gb'] / per_driver, 2)
+            if per_driver and tabs['events_per_s_per_gb'] else None,
+        }
+    return comparison
+
+
+def compare_profiles(results, baseline: str = 'full'):
+    """
+    Pentru fiecare scenariu rulat cu mai multe profiluri: raportul față de `baseline` al
+    timpului de navigare, al octeților descărcați, al memoriei browserului și al duratei totale.
+    """
+    by_scenario = {}
+    for result in results:
+        if 'error' not in result:
+            by_scenario.setdefault(result['scenario'], {})[result['profile']] = result
+    ratio = lambda new, old: round(new / old, 3) if new is not None and old else None
+    comparison = {}
+    for scenario, runs in by_scenario.items():
+        base = runs.get(baseline)
+        if base is None:
+            continue
+        for profile, run in runs.items():
+            if profile == baseline:
+                continue
+            comparison[f"{scenario}:{profile}/{baseline}"] = {
+                'navigate_s': ratio(run['phases_s'].get('scrape_navigate'), base['phases_s'].get('scrape_navigate')),
+                'bytes': ratio(run['served']['bytes'], base['served']['bytes']),
+                'requests': ratio(run['served']['requests'], base['served']['requests']),
+                'browser_peak_rss': ratio(run['peak_rss_kb']['browser'], base['peak_rss_kb']['browser']),
+                'scrape_s': ratio(run['scrape_s'], base['scrape_s']),
+                'events': (run['events'], base['events']),
+            }
+    return comparison
+
+
+if __name__ == '__main__':
+    # python bench_scrapers.py [--events 1000] [--searches 20] [--scenario superbet_listing,spin_search]
+    #                          [--pages director_inregistrat] [--output rezultate.json] [--headful]
+    #                          [--profile full,lean]
+    # python bench_scrapers.py --write-pages <director> [--events 1000] [--searches 20]
+    args = sys.argv[1:]
+
+    def option(name, default=None):
+        if name in args:
+            i = args.index(name)
+            return args[i + 1]
+        return default
+
+    headless = '--headful' not in args
+    if '--run-one' in args:
+        result = run_scenario(option('--run-one'), option('--base-url'), option('--pages'), headless,
+                              option('--profile', 'full'))
+        with open(option('--result'), 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        sys.exit(0)
+
+    n_events, searches = int(option('--events', 1000)), int(option('--searches', 20))
+    if '--write-pages' in args:
+        os.makedirs(option('--write-pages'), exist_ok=True)
+        write_snapshots(option('--write-pages'), n_events, searches)
+        sys.exit(0)
+
+    scenarios = option('--scenario', ','.join(SCENARIOS)).split(',')
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        print(f"Scenarii necunoscute: {unknown}. Disponibile: {', '.join(SCENARIOS)}")
+        sys.exit(1)
+    profiles = option('--profile', ','.join(PROFILES)).split(',')
+    if any(p not in PROFILES for p in profiles):
+        print(f"Profiluri necunoscute: {profiles}. Disponibile: {', '.join(PROFILES)}")
+        sys.exit(1)
+    report = run_suite(scenarios, n_events, searches, option('--pages'), headless, profiles)
+    output = option('--output')
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
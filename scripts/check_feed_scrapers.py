@@ -0,0 +1,69 @@
+import sys
+from datetime import date, datetime
+
+from arbitrage import fixture_key
+from feed_scrapers import CSV_HEADER, DATE_FORMAT, FEEDS, page_row, scrape_rows
+from feed_stub_server import start_stub_server
+
+# Ca DEFAULT_ROUTES, dar liga 202 nu are fișier înregistrat: serverul răspunde 404,
+# iar feed-ul MaxBet trebuie să întoarcă totuși meciurile ligii 101
+ROUTES = [
+    (r'^/v2/ro-RO/events/by-date$', 'superbet_by_date.json'),
+    (r'^/ro/api/sport/2/leagues$', 'maxbet_leagues.json'),
+    (r'^/ro/api/league/101/events$', 'maxbet_league_events.json'),
+    (r'^/api/sport/calcio/events$', 'spin_events.json'),
+]
+
+# Rânduri cum le întorc extractoarele din pagini (fallback-ul Selenium)
+PAGE_ROWS = [
+    ({'date': 'sâm. 7, 21:45', 'team1': 'Malta', 'team2': 'Lituania', 'odds': {'1': '3.90', 'X': '3.25', '2': '2.00'}},
+     '07/06/2025 21:45'),
+    ({'date': '07/06\n21:45', 'team1': 'Malta', 'team2': 'Lituania', 'odds': None}, '07/06/2025 21:45'),
+    ({'date': 'Sâmbătă 7 Iunie 2025, 21:45', 'team1': 'Malta', 'team2': 'Lituania', 'odds': {}}, '07/06/2025 21:45'),
+    ({'date': 'mâine, 19:00', 'team1': 'Atletico Madrid', 'team2': 'Rayo Vallecano', 'odds': {}}, '02/06/2025 19:00'),
+    ({'date': None, 'team1': 'Malta', 'team2': 'Lituania', 'odds': {}}, None),
+]
+
+
+def check(condition, message):
+    if not condition:
+        print(f"EȘEC: {message}")
+        sys.exit(1)
+
+
+def check_feeds(base_url):
+    keys = {}
+    for bookmaker in FEEDS:
+        rows = scrape_rows(bookmaker, base_url, days=1, fallback=False)
+        check(rows, f"{bookmaker}: niciun rând din feed")
+        for row in rows:
+            check(list(row) == CSV_HEADER, f"{bookmaker}: coloane {list(row)}")
+            datetime.strptime(row['Data'], DATE_FORMAT)
+        check(len({(r['Data'], r['team1'], r['team2']) for r in rows}) == len(rows), f"{bookmaker}: rânduri duplicate")
+        # echipe (ID canonic) -> ziua pe care arbitrage o folosește la potrivirea între case
+        keys[bookmaker] = {}
+        for r in rows:
+            day, id1, id2 = fixture_key(r['Data'], r['team1'], r['team2'])
+            keys[bookmaker][id1, id2] = day
+        print(f"{bookmaker}: {len(rows)} meciuri")
+    common = set.intersection(*(set(k) for k in keys.values()))
+    check(common, "niciun meci comun tuturor caselor")
+    for teams in common:
+        check(all(k[teams] for k in keys.values()), f"{teams}: zi nerecunoscută de arbitrage")
+
+
+def check_page_rows():
+    for row, expected in PAGE_ROWS:
+        got = page_row(row, date(2025, 6, 1))
+        check((got and got['Data']) == expected, f"{row['date']!r} -> {got and got['Data']}, așteptat {expected}")
+
+
+if __name__ == '__main__':
+    # python check_feed_scrapers.py — parserele feed-urilor și fallback-ul, offline, pe serverul stub
+    server, base_url = start_stub_server(routes=ROUTES)
+    try:
+        check_feeds(base_url)
+    finally:
+        server.shutdown()
+    check_page_rows()
+    print("OK")
@@ -0,0 +1,115 @@
+import re
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+
+# Formatele de dată afișate de Superbet, Spin și MaxBet:
+#   "mie. 30, 22:00"                   (Superbet, zi din săptămână + zi)
+#   "astăzi, 15:30" / "azi, 15:30"     (Superbet, Spin)
+#   "mâine, 15:15"                     (Superbet, Spin)
+#   "03.05, 16:00"                     (Superbet)
+#   "Miercuri 30 Aprilie 2025, 22:00"  (Spin)
+#   "07/06" / "07/06 21:45"            (MaxBet)
+
+MONTHS_RO = {
+    'ianuarie': 1, 'februarie': 2, 'martie': 3, 'aprilie': 4,
+    'mai': 5, 'iunie': 6, 'iulie': 7, 'august': 8,
+    'septembrie': 9, 'octombrie': 10, 'noiembrie': 11, 'decembrie': 12
+}
+
+# Variantele cu sedilă (ş, ţ) apar în unele pagini în locul celor cu virgulă (ș, ț)
+_FOLD = str.maketrans({'ş': 'ș', 'ţ': 'ț'})
+
+
+def _next_month_if_past(day: int, hh: int, mm: int, ref: date) -> datetime:
+    # "mie. 30" se referă la luna curentă dacă ziua n-a trecut, altfel la luna următoare
+    mo, yr = ref.month, ref.year
+    if day < ref.day:
+        mo, yr = (1, yr + 1) if mo == 12 else (mo + 1, yr)
+    return datetime(yr, mo, day, hh, mm)
+
+
+def _nearest_year(day: int, mo: int, hh: int, mm: int, ref: date) -> datetime:
+    # Fără an afișat: o dată cu mai mult de ~6 luni în urmă aparține anului următor (ex. în decembrie, "03.01")
+    dt = datetime(ref.year, mo, day, hh, mm)
+    if (ref - dt.date()).days > 183:
+        dt = dt.replace(year=ref.year + 1)
+    return dt
+
+
+def _weekday_day(m, ref):
+    return _next_month_if_past(int(m['day']), int(m['hh']), int(m['mm']), ref)
+
+
+def _today(m, ref):
+    return datetime(ref.year, ref.month, ref.day, int(m['hh']), int(m['mm']))
+
+
+def _tomorrow(m, ref):
+    t = ref + timedelta(days=1)
+    return datetime(t.year, t.month, t.day, int(m['hh']), int(m['mm']))
+
+
+def _day_month(m, ref):
+    return _nearest_year(int(m['day']), int(m['mo']), int(m['hh'] or 0), int(m['mm'] or 0), ref)
+
+
+def _long_month(m, ref):
+    mo = MONTHS_RO.get(m['month'])
+    if not mo:
+        raise ValueError(f"Lună necunoscută: '{m['month']}'")
+    return datetime(int(m['year']), mo, int(m['day']), int(m['hh']), int(m['mm']))
+
+
+# Ordonate după frecvența observată în paginile scrapuite (cele mai dese primele)
+_PATTERNS = [
+    (re.compile(r'^[^\d,./]+?\.?\s*(?P<day>\d{1,2})\s*,\s*(?P<hh>\d{1,2}):(?P<mm>\d{2})$'), _weekday_day),
+    (re.compile(r'^(?:astăzi|astazi|azi)\s*,\s*(?P<hh>\d{1,2}):(?P<mm>\d{2})$'), _today),
+    (re.compile(r'^(?:mâine|maine)\s*,\s*(?P<hh>\d{1,2}):(?P<mm>\d{2})$'), _tomorrow),
+    (re.compile(r'^(?P<day>\d{1,2})[./](?P<mo>\d{1,2})(?:\s*,?\s*(?P<hh>\d{1,2}):(?P<mm>\d{2}))?$'), _day_month),
+    (re.compile(r'^[a-zăâîșț]+\s+(?P<day>\d{1,2})\s+(?P<month>[a-zăâîșț]+)\s+(?P<year>\d{4})\s*,\s*(?P<hh>\d{1,2}):(?P<mm>\d{2})$'), _long_month),
+]
+
+
+# Destul de mare pentru toate datele distincte ale unei rulări (~32k în bench_date_parser)
+@lru_cache(maxsize=65536)
+def _parse_cached(s: str, ref_date: date) -> datetime:
+    low = s.strip().lower().translate(_FOLD)
+    for pattern, build in _PATTERNS:
+        m = pattern.match(low)
+        if m:
+            return build(m, ref_date)
+    raise ValueError(f"Unrecognized date format: '{s.strip()}'")
+
+
+def parse_match_datetime(s: str, ref_date: date = None) -> datetime:
+    """
+    Transformă o dată afișată de o casă de pariuri într-un datetime.
+    `ref_date` este ziua față de care se interpretează "astăzi"/"mâine"/ziua din
+    săptămână; implicit ziua curentă la momentul apelului (nu la importul modulului).
+    """
+    return _parse_cached(s, ref_date or date.today())
+
+
+def parse_many(strings, ref_date: date = None, errors: str = 'raise'):
+    """
+    Parsează o listă întreagă de date față de aceeași zi de referință.
+    Fiecare șir distinct este parsat o singură dată. Cu errors='coerce',
+    formatele necunoscute devin None în loc să arunce ValueError.
+    """
+    ref = ref_date or date.today()
+    parsed = {}
+    out = []
+    for s in strings:
+        if s not in parsed:
+            try:
+                parsed[s] = _parse_cached(s, ref)
+            except ValueError:
+                if errors != 'coerce':
+                    raise
+                parsed[s] = None
+        out.append(parsed[s])
+    return out
+
+
+def format_match_datetime(s: str, ref_date: date = None) -> str:
+    return parse_match_datetime(s, ref_date).strftime("%d/%m/%Y %H:%M")
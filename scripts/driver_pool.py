@@ -0,0 +1,359 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import telemetry
+
+# Pagina pe care se face încălzirea (cookies + modal) pentru fiecare casă de pariuri
+BOOKMAKER_HOME = {
+    'superbet': 'https://superbet.ro/pariuri-sportive/fotbal',
+    'maxbet': 'https://www.maxbet.ro/ro/pariuri-sportive',
+    'spin': 'https://spin.ro/sport',
+}
+
+
+# Profilul implicit al sesiunilor create direct de scraper-e: 'full' (pagina completă, ca în
+# browser) sau 'lean' (headless, fără resursele de mai jos); DriverPool folosește 'lean'
+BROWSER_PROFILE_ENV = 'SCRAPER_BROWSER_PROFILE'
+
+# Resursele de care extragerea cotelor nu are nevoie, blocate prin CDP (Network.setBlockedURLs)
+# în profilul 'lean'. Tiparele folosesc '*' ca wildcard și se potrivesc cu tot URL-ul.
+BLOCKED_RESOURCES = {
+    'images': ['*.png', '*.png?*', '*.jpg', '*.jpg?*', '*.jpeg', '*.jpeg?*', '*.gif', '*.gif?*',
+               '*.webp', '*.webp?*', '*.avif', '*.avif?*', '*.ico', '*.ico?*'],
+    'svg': ['*.svg', '*.svg?*'],
+    'fonts': ['*.woff', '*.woff?*', '*.woff2', '*.woff2?*', '*.ttf', '*.ttf?*', '*.otf', '*.otf?*', '*.eot', '*.eot?*'],
+    'media': ['*.mp4', '*.mp4?*', '*.webm', '*.webm?*', '*.m3u8', '*.m3u8?*', '*.mp3', '*.mp3?*'],
+    'trackers': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+                 '*connect.facebook.net*', '*hotjar.com*', '*clarity.ms*', '*analytics.tiktok.com*', '*sentry.io*',
+                 '*newrelic.com*', '*nr-data.net*', '*optimizely.com*', '*yandex.ru/metrika*'],
+    'consent': ['*cookielaw.org*', '*onetrust.com*', '*osano.com*', '*cookiebot.com*'],
+    'chat': ['*intercom.io*', '*zendesk.com*', '*zdassets.com*', '*livechatinc.com*', '*tawk.to*'],
+}
+
+# Ce trebuie totuși încărcat pe fiecare site în profilul 'lean' (categorii din BLOCKED_RESOURCES
+# păstrate și tipare care nu se blochează niciodată). Extractoarele citesc doar textul rândurilor,
+# deci restul categoriilor sunt blocate; iconițele SVG inline nu sunt cereri și rămân.
+# Superbet (OneTrust) și Spin (Osano) au nevoie de scripturile de consimțământ, altfel bannerul
+# nu apare și handler-ele lor n-ar avea ce accepta; MaxBet are propriul buton.
+BOOKMAKER_ALLOWLIST = {
+    'superbet': {'categories': {'consent'}, 'patterns': []},
+    'maxbet': {'categories': set(), 'patterns': []},
+    'spin': {'categories': {'consent'}, 'patterns': []},
+}
+
+
+def blocked_url_patterns(bookmaker: str = None):
+    """
+    Tiparele blocate în profilul 'lean' pentru `bookmaker` (sau pentru orice site, dacă lipsește).
+    """
+    allow = BOOKMAKER_ALLOWLIST.get(bookmaker, {'categories': set(), 'patterns': []})
+    return [pattern for category, patterns in BLOCKED_RESOURCES.items() if category not in allow['categories']
+            for pattern in patterns if pattern not in allow['patterns']]
+
+
+def build_chrome_options(headless: bool = False, profile: str = 'full'):
+    """
+    Construiește opțiunile Chrome comune tuturor scraper-elor. Profilul 'lean' rulează
+    headless, nu așteaptă încărcarea completă a paginii (scraper-ele așteaptă explicit
+    rândurile) și oprește funcțiile Chrome care consumă rețea și memorie fără folos aici.
+    """
+    options = webdriver.ChromeOptions()
+    if headless or profile == 'lean':
+        options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    prefs = {"profile.default_content_setting_values.notifications": 2}
+    if profile == 'lean':
+        # Lățimea nu contează pentru extragere; înălțimea rămâne, ca listele virtualizate
+        # să aibă tot atâtea rânduri randate per scroll
+        options.add_argument('window-size=1280,1080')
+        options.page_load_strategy = 'eager'
+        for argument in ('--disable-extensions', '--disable-background-networking', '--disable-component-update',
+                         '--disable-default-apps', '--disable-sync', '--disable-domain-reliability',
+                         '--disable-client-side-phishing-detection', '--no-first-run', '--mute-audio',
+                         # Tab-urile din fundal (tab_engine) nu sunt încetinite
+                         '--disable-background-timer-throttling', '--disable-renderer-backgrounding',
+                         '--disable-backgrounding-occluded-windows',
+                         '--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,'
+                         'InterestFeedContentSuggestions,CalculateNativeWinOcclusion'):
+            options.add_argument(argument)
+        # Imaginile nu sunt dezactivate aici: le blochează doar CDP (BLOCKED_RESOURCES['images']),
+        # ca lista permisă a casei de pariuri să poată face excepții
+        prefs.update({
+            "profile.default_content_setting_values.geolocation": 2,
+            "profile.default_content_setting_values.media_stream": 2,
+            "profile.default_content_setting_values.popups": 2,
+        })
+    else:
+        options.add_argument('window-size=1920,1080')
+    options.add_experimental_option("prefs", prefs)
+    return options
+
+
+def apply_lean_profile(driver, bookmaker: str = None):
+    """
+    Blochează prin Chrome DevTools Protocol resursele din BLOCKED_RESOURCES (mai puțin
+    lista permisă a casei de pariuri), pentru toate încărcările ulterioare ale sesiunii.
+    """
+    patterns = blocked_url_patterns(bookmaker)
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    driver.browser_profile = 'lean'
+    driver.blocked_categories = set(BLOCKED_RESOURCES) - BOOKMAKER_ALLOWLIST.get(bookmaker, {}).get('categories', set())
+    return driver
+
+
+def create_driver(headless: bool = False, profile: str = None, bookmaker: str = None):
+    """
+    Pornește o sesiune Chrome nouă. Folosit de scraper-e când nu primesc un driver din pool.
+    `profile` implicit vine din SCRAPER_BROWSER_PROFILE ('full' dacă lipsește); `bookmaker`
+    alege lista permisă a profilului 'lean'.
+    """
+    profile = profile or os.environ.get(BROWSER_PROFILE_ENV) or 'full'
+    if profile not in ('full', 'lean'):
+        raise ValueError(f"Profil de browser necunoscut: '{profile}'")
+    with telemetry.span('driver_start', headless=headless or profile == 'lean', profile=profile):
+        driver = webdriver.Chrome(options=build_chrome_options(headless, profile))
+        if profile == 'lean':
+            apply_lean_profile(driver, bookmaker)
+    return telemetry.instrument_driver(driver, bookmaker)
+
+
+def _consent_blocked(driver) -> bool:
+    # Dacă lista permisă a casei nu păstrează 'consent', scripturile OneTrust/Osano nu se
+    # încarcă în profilul 'lean', deci nu apare niciun banner
+    return 'consent' in getattr(driver, 'blocked_categories', ())
+
+
+def _accept_onetrust(driver, wait):
+    if _consent_blocked(driver):
+        return
+    try:
+        cookie_btn = wait.until(EC.element_to_be_clickable((By.ID, 'onetrust-accept-btn-handler')))
+        cookie_btn.click()
+        print("Cookies accepted")
+        time.sleep(0.1)
+    except Exception:
+        print("No cookie prompt (or already accepted)")
+
+
+@telemetry.traced('consent', bookmaker='superbet')
+def accept_superbet_consent(driver, timeout: float = 20):
+    """
+    Acceptă cookie-banner-ul OneTrust și închide modalul Superbet, dacă apar.
+    """
+    wait = WebDriverWait(driver, timeout)
+    _accept_onetrust(driver, wait)
+
+    # Mic scroll pentru a declanșa modalul
+    driver.execute_script("window.scrollBy(0, 100);")
+    time.sleep(0.1)
+
+    try:
+        close_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.e2e-close-modal')))
+        close_btn.click()
+        print("Modal closed")
+        time.sleep(0.1)
+    except Exception:
+        print("No modal to close")
+
+
+@telemetry.traced('consent', bookmaker='maxbet')
+def accept_maxbet_consent(driver, timeout: float = 5):
+    """
+    Închide pop-up-ul intern de notificări și acceptă cookies pe MaxBet.
+    """
+    try:
+        later_btn = WebDriverWait(driver, timeout).until(
+            EC.element_to_be_clickable((By.XPATH,
+                "//*[translate(normalize-space(),'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz')='poate mai târziu']"
+            ))
+        )
+        later_btn.click()
+        print("Pop-up notificări interne închis")
+        time.sleep(0.5)
+    except Exception:
+        print("Niciun pop-up intern de notificări")
+
+    try:
+        cook_btn = driver.find_element(
+            By.XPATH,
+            "//button[contains(translate(., 'ĂÂÎȘȚ','ÂÎȘȚĂ'), 'Acceptă cookies')]"
+        )
+        cook_btn.click()
+        print("Cookies acceptate")
+        time.sleep(0.5)
+    except Exception:
+        pass
+
+
+@telemetry.traced('consent', bookmaker='spin')
+def accept_spin_consent(driver, timeout: float = 10):
+    """
+    Acceptă dialogul Osano de pe Spin, dacă apare.
+    """
+    if _consent_blocked(driver):
+        return
+    wait = WebDriverWait(driver, timeout)
+    try:
+        dlg = wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, "div.osano-cm-dialog--type_bar")))
+        dlg.find_element(By.CSS_SELECTOR, "button.osano-cm-accept-all").click()
+        wait.until(EC.invisibility_of_element(dlg))
+    except TimeoutException:
+        pass
+
+
+CONSENT_HANDLERS = {
+    'superbet': accept_superbet_consent,
+    'maxbet': accept_maxbet_consent,
+    'spin': accept_spin_consent,
+}
+
+
+class DriverPool:
+    """
+    Ține până la `size` sesiuni Chrome încălzite (headless, implicit cu profilul 'lean',
+    cu cookies deja acceptate) pentru o singură casă de pariuri și le împrumută apelanților
+    prin `lease()`. O sesiune care nu mai răspunde sau care a fost folosită de `max_uses`
+    ori este închisă și înlocuită la următorul împrumut.
+    """
+
+    def __init__(self, bookmaker: str, size: int = 2, max_uses: int = 50,
+                 headless: bool = True, warm: bool = False, profile: str = 'lean'):
+        if bookmaker not in BOOKMAKER_HOME:
+            raise ValueError(f"Casă de pariuri necunoscută: '{bookmaker}'")
+        self.bookmaker = bookmaker
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.profile = profile
+        self._idle = queue.LifoQueue()
+        self._uses = {}
+        self._live = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        if warm:
+            for _ in range(size):
+                self._idle.put(self._spawn())
+
+    def _spawn(self):
+        with self._lock:
+            self._live += 1
+        try:
+            driver = create_driver(self.headless, self.profile, self.bookmaker)
+            with telemetry.span('page_load', bookmaker=self.bookmaker):
+                driver.get(BOOKMAKER_HOME[self.bookmaker])
+            CONSENT_HANDLERS[self.bookmaker](driver)
+        except Exception:
+            with self._lock:
+                self._live -= 1
+            raise
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _retire(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+            self._live -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(driver) -> bool:
+        try:
+            return driver.execute_script("return document.readyState") is not None
+        except WebDriverException:
+            return False
+
+    def _acquire(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_spawn = self._live < self.size
+                if can_spawn:
+                    return self._spawn()
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    driver = self._idle.get(timeout=remaining)
+                except queue.Empty:
+                    raise TimeoutError(f"Niciun driver {self.bookmaker} liber în {timeout}s")
+
+            if self._is_healthy(driver):
+                return driver
+            self._retire(driver)
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        """
+        Împrumută un driver din pool. La ieșirea din bloc driverul revine în pool,
+        sau este reciclat dacă a atins `max_uses` ori a apărut o eroare WebDriver.
+        """
+        if self._closed:
+            raise RuntimeError("Pool-ul a fost închis")
+        driver = self._acquire(timeout)
+        broken = False
+        try:
+            yield driver
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            with self._lock:
+                uses = self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            if broken or self._closed or uses >= self.max_uses:
+                self._retire(driver)
+            else:
+                self._idle.put(driver)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(bookmaker: str, **kwargs) -> DriverPool:
+    """
+    Întoarce pool-ul partajat al procesului pentru o casă de pariuri, creându-l la nevoie.
+    """
+    with _pools_lock:
+        pool = _pools.get(bookmaker)
+        if pool is None:
+            pool = _pools[bookmaker] = DriverPool(bookmaker, **kwargs)
+        return pool
+
+
+@atexit.register
+def close_all_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
@@ -0,0 +1,115 @@
+"""
+Extractoare JavaScript care citesc toate rândurile unei pagini într-un singur apel
+WebDriver (execute_script) și întorc o listă JSON de {date, team1, team2, odds}.
+Partea Python doar interpretează acest payload, în loc să facă zeci de
+find_element/.text (fiecare fiind un roundtrip HTTP) pentru fiecare eveniment.
+"""
+import telemetry
+
+_COMMON_JS = """
+const text = (root, css) => {
+    const el = root.querySelector(css);
+    return el ? el.innerText.trim() : null;
+};
+"""
+
+# Superbet: pagina de căutare și pagina cu toată oferta folosesc aceleași carduri
+_SUPERBET_JS = _COMMON_JS + """
+return Array.from(document.querySelectorAll(arguments[0]), row => {
+    const main = row.querySelector('.event-card__main-content') || row;
+    const odds = {'1': null, 'X': null, '2': null};
+    row.querySelectorAll('div.odd-offer__odd-button.e2e-odd-pick').forEach(btn => {
+        const name = text(btn, 'span.odd-button__odd-name.e2e-odd-name');
+        if (name in odds) odds[name] = text(btn, 'span.odd-button__odd-value-new.e2e-odd-current-value');
+    });
+    return {
+        date: text(main, '.event-card-label .capitalize') || text(main, '.event-card-label'),
+        team1: text(main, '.event-competitor__name.e2e-event-team1-name'),
+        team2: text(main, '.event-competitor__name.e2e-event-team2-name'),
+        odds: odds,
+    };
+});
+"""
+
+# MaxBet: fiecare meci este un tag <event>
+_MAXBET_JS = _COMMON_JS + """
+return Array.from(document.querySelectorAll(arguments[0]), ev => {
+    let date = null;
+    const timeDiv = ev.querySelector('div.time');
+    if (timeDiv) {
+        const spans = timeDiv.querySelectorAll('span');
+        date = spans.length >= 3 ? spans[0].innerText.trim() : timeDiv.innerText.trim();
+    }
+
+    let teams = Array.from(ev.querySelectorAll('div.general__competitors span[title]'), s => s.innerText.trim());
+    if (teams.length < 2) {
+        const comps = text(ev, 'div.general__competitors');
+        teams = comps ? comps.split('\\n').map(t => t.trim()).filter(Boolean) : [];
+    }
+
+    let odds = null;
+    const market = ev.querySelector('div.market__wrapper');
+    if (market) {
+        const values = Array.from(market.querySelectorAll('div.market__outcome span.outcome.centered'),
+                                  s => s.innerText.trim());
+        odds = values.length >= 3 ? {'1': values[0], 'X': values[1], '2': values[2]}
+                                  : {'1': '', 'X': '', '2': ''};
+    }
+
+    return {date: date, team1: teams[0] || null, team2: teams[1] || null, odds: odds};
+});
+"""
+
+# Spin: fiecare meci este un div.contenitoreRiga
+_SPIN_JS = _COMMON_JS + """
+return Array.from(document.querySelectorAll(arguments[0]), row => {
+    let date = null;
+    const tempo = row.querySelector('div.tabellaQuoteTempo');
+    if (tempo) {
+        const day = text(tempo, 'span.tabellaQuoteTempo__data');
+        const hour = text(tempo, 'span.tabellaQuoteTempo__ora');
+        if (day !== null && hour !== null) date = `${day}, ${hour}`;
+    }
+    const odds = {'1': '–', 'X': '–', '2': '–'};
+    row.querySelectorAll('div.gridInterernaQuotazioni div.contenitoreSingolaQuota').forEach(qb => {
+        const label = text(qb, 'p.titoloQuotazione');
+        const value = text(qb, 'p.tipoQuotazione_1');
+        if (label !== null && value !== null) odds[label] = value;
+    });
+    return {
+        date: date,
+        team1: text(row, 'p.font-weight-bold.m-0.text-right'),
+        team2: text(row, 'p.font-weight-bold.m-0.text-left'),
+        odds: odds,
+    };
+});
+"""
+
+
+def _extract(driver, script: str, row_css: str, bookmaker: str):
+    with telemetry.span('extract', bookmaker=bookmaker) as span:
+        rows = driver.execute_script(script, row_css)
+        span.set(rows=len(rows))
+    telemetry.count('rows_extracted_total', len(rows), bookmaker=bookmaker)
+    return rows
+
+
+def extract_superbet_rows(driver, row_css: str = '.event-row-container'):
+    """
+    Întoarce [{date (text brut), team1, team2, odds: {'1', 'X', '2'}}] pentru toate cardurile `row_css`.
+    """
+    return _extract(driver, _SUPERBET_JS, row_css, 'superbet')
+
+
+def extract_maxbet_events(driver, row_css: str = 'event'):
+    """
+    Întoarce [{date (text brut), team1, team2, odds: {'1', 'X', '2'} sau None}] pentru toate evenimentele `row_css`.
+    """
+    return _extract(driver, _MAXBET_JS, row_css, 'maxbet')
+
+
+def extract_spin_rows(driver, row_css: str = 'div.contenitoreRiga'):
+    """
+    Întoarce [{date ("zi, oră" sau None), team1, team2, odds: {'1', 'X', '2'}}] pentru toate rândurile `row_css`.
+    """
+    return _extract(driver, _SPIN_JS, row_css, 'spin')
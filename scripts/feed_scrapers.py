@@ -0,0 +1,369 @@
+import asyncio
+import http.client
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode, urlsplit
+
+import telemetry
+from record_sink import CsvSink
+
+# Adresele de bază ale feed-urilor JSON; pot fi suprascrise din mediu
+# (ex. FEED_BASE_URL_SUPERBET=http://127.0.0.1:8765 pentru serverul stub)
+DEFAULT_BASE_URLS = {
+    'superbet': 'https://production-superbet-offer-ro.freetls.fastly.net',
+    'maxbet': 'https://www.maxbet.ro',
+    'spin': 'https://spin.ro',
+}
+
+CSV_HEADER = ["Data", "team1", "team2", "odd_1", "odd_X", "odd_2"]
+DATE_FORMAT = "%d/%m/%Y %H:%M"
+
+
+class FeedError(Exception):
+    """Feed-ul nu a putut fi descărcat sau are o formă neașteptată."""
+
+
+class KeepAliveClient:
+    """
+    Client HTTP minimal cu conexiuni keep-alive refolosite per host.
+    Este thread-safe: fiecare cerere împrumută o conexiune din coada host-ului.
+    """
+
+    def __init__(self, max_per_host: int = 4, timeout: float = 10):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, scheme, netloc):
+        with self._lock:
+            key = (scheme, netloc)
+            if key not in self._pools:
+                self._pools[key] = queue.LifoQueue(self.max_per_host)
+            return self._pools[key]
+
+    def _connect(self, scheme, netloc):
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout)
+
+    def get_json(self, url: str, params: dict = None):
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        query = parts.query
+        if params:
+            query = f"{query}&{urlencode(params)}" if query else urlencode(params)
+        if query:
+            path = f"{path}?{query}"
+
+        pool = self._pool(parts.scheme, parts.netloc)
+        started = time.perf_counter()
+        # O conexiune refolosită poate fi închisă între timp de server: reîncercăm o dată pe una nouă
+        for attempt in range(2):
+            try:
+                conn = pool.get_nowait()
+            except queue.Empty:
+                conn = self._connect(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', path, headers={
+                    'Accept': 'application/json',
+                    'Accept-Encoding': 'identity',
+                    'Connection': 'keep-alive',
+                    'User-Agent': 'Mozilla/5.0',
+                })
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, ConnectionError, OSError) as e:
+                conn.close()
+                if attempt:
+                    raise FeedError(f"GET {url} a eșuat: {e}")
+                continue
+
+            if resp.will_close:
+                conn.close()
+            else:
+                try:
+                    pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+
+            telemetry.count('http_requests_total', host=parts.netloc, status=resp.status)
+            telemetry.observe('http_request_seconds', time.perf_counter() - started, host=parts.netloc)
+            if resp.status != 200:
+                raise FeedError(f"GET {url} a întors {resp.status}")
+            try:
+                return json.loads(body)
+            except ValueError as e:
+                raise FeedError(f"GET {url} nu a întors JSON: {e}")
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _price(value):
+    return '' if value is None else f"{float(value):.2f}"
+
+
+def _row(kickoff: datetime, team1: str, team2: str, odds: dict):
+    return {
+        'Data': kickoff.strftime(DATE_FORMAT),
+        'team1': team1.strip(),
+        'team2': team2.strip(),
+        'odd_1': _price(odds.get('1')),
+        'odd_X': _price(odds.get('X')),
+        'odd_2': _price(odds.get('2')),
+    }
+
+
+# --- Superbet: /v2/ro-RO/events/by-date, o cerere pe zi ---
+
+def _superbet_requests(base_url, start: datetime, days: int):
+    url = f"{base_url}/v2/ro-RO/events/by-date"
+    for offset in range(days):
+        day = (start + timedelta(days=offset)).date()
+        yield url, {
+            'currentStatus': 'active',
+            'offerState': 'prematch',
+            'sportId': 5,
+            'startDate': f"{day} 00:00:00",
+            'endDate': f"{day} 23:59:59",
+        }
+
+
+def parse_superbet(payload):
+    if not isinstance(payload, dict) or not isinstance(payload.get('data'), list):
+        raise FeedError("Feed Superbet fără câmpul 'data'")
+    for event in payload['data']:
+        teams = (event.get('matchName') or '').split('·')
+        if len(teams) != 2 or not event.get('matchDate'):
+            continue
+        odds = {}
+        for odd in event.get('odds') or []:
+            if odd.get('marketName') != 'Final':
+                continue
+            code = 'X' if odd.get('code') in ('0', 'X') else odd.get('code')
+            odds[code] = odd.get('price')
+        kickoff = datetime.strptime(event['matchDate'], "%Y-%m-%d %H:%M:%S")
+        yield _row(kickoff, teams[0], teams[1], odds)
+
+
+# --- MaxBet: lista de ligi, apoi evenimentele fiecărei ligi ---
+
+def _maxbet_requests(base_url, start: datetime, days: int):
+    yield f"{base_url}/ro/api/sport/2/leagues", None
+
+
+def _maxbet_league_requests(base_url, payload):
+    for league in payload.get('leagues') or []:
+        yield f"{base_url}/ro/api/league/{league['id']}/events", None
+
+
+def parse_maxbet(payload):
+    if not isinstance(payload, dict) or not isinstance(payload.get('events'), list):
+        raise FeedError("Feed MaxBet fără câmpul 'events'")
+    for event in payload['events']:
+        if not event.get('home') or not event.get('away') or event.get('kickOff') is None:
+            continue
+        odds = {}
+        for market in event.get('markets') or []:
+            if market.get('type') == '1X2':
+                odds = {o.get('name'): o.get('odd') for o in market.get('outcomes') or []}
+                break
+        kickoff = datetime.fromtimestamp(event['kickOff'] / 1000)
+        yield _row(kickoff, event['home'], event['away'], odds)
+
+
+# --- Spin: un singur feed cu toate evenimentele de fotbal ---
+
+def _spin_requests(base_url, start: datetime, days: int):
+    yield f"{base_url}/api/sport/calcio/events", None
+
+
+def parse_spin(payload):
+    if not isinstance(payload, dict) or not isinstance(payload.get('eventi'), list):
+        raise FeedError("Feed Spin fără câmpul 'eventi'")
+    for event in payload['eventi']:
+        if not event.get('squadra1') or not event.get('squadra2') or not event.get('dataOra'):
+            continue
+        kickoff = datetime.fromisoformat(event['dataOra'])
+        yield _row(kickoff, event['squadra1'], event['squadra2'], event.get('quote') or {})
+
+
+# requests: primele cereri; expand (opțional): cererile derivate din răspunsuri; parse: rândurile
+FEEDS = {
+    'superbet': {'requests': _superbet_requests, 'parse': parse_superbet},
+    'maxbet': {'requests': _maxbet_requests, 'expand': _maxbet_league_requests, 'parse': parse_maxbet},
+    'spin': {'requests': _spin_requests, 'parse': parse_spin},
+}
+
+
+def base_url_for(bookmaker: str) -> str:
+    return os.environ.get(f"FEED_BASE_URL_{bookmaker.upper()}", DEFAULT_BASE_URLS[bookmaker]).rstrip('/')
+
+
+async def _gather_json(client, requests, concurrency, return_exceptions: bool = False):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(url, params):
+        async with semaphore:
+            return await asyncio.to_thread(client.get_json, url, params)
+
+    return await asyncio.gather(*(fetch(url, params) for url, params in requests),
+                                return_exceptions=return_exceptions)
+
+
+async def fetch_feed_rows(bookmaker: str, client: KeepAliveClient, base_url: str = None,
+                          days: int = 7, concurrency: int = 8):
+    """
+    Descarcă și parsează feed-ul unei case de pariuri; cererile independente
+    (zile, ligi) rulează concurent peste conexiunile keep-alive ale clientului.
+    Întoarce rânduri cu schema CSV (Data, team1, team2, odd_1, odd_X, odd_2).
+    """
+    feed = FEEDS[bookmaker]
+    base_url = (base_url or base_url_for(bookmaker)).rstrip('/')
+    payloads = await _gather_json(client, list(feed['requests'](base_url, datetime.now(), days)), concurrency)
+
+    if 'expand' in feed:
+        derived = [req for payload in payloads for req in feed['expand'](base_url, payload)]
+        # O ligă care nu răspunde nu strică restul ofertei: o sărim
+        payloads = []
+        for (url, _), payload in zip(derived, await _gather_json(client, derived, concurrency, return_exceptions=True)):
+            if isinstance(payload, FeedError):
+                print(f"Sar peste {url}: {payload}")
+                telemetry.log('feed_request_failed', bookmaker=bookmaker, url=url, error=str(payload))
+                continue
+            if isinstance(payload, BaseException):
+                raise payload
+            payloads.append(payload)
+
+    rows = {}
+    for payload in payloads:
+        for row in feed['parse'](payload):
+            rows[(row['Data'], row['team1'], row['team2'])] = row
+    return list(rows.values())
+
+
+def page_row(row: dict, ref_date: date):
+    """
+    Un rând extras din pagină (extractors) adus la schema CSV a feed-urilor. Data afișată de
+    site ("mie. 30, 22:00", "Sâmbătă 07/06, 21:45", MaxBet "07/06" cu ora pe rândul următor)
+    devine DATE_FORMAT; întoarce None pentru rândurile fără echipe sau cu data necunoscută.
+    """
+    from date_parser import parse_match_datetime
+
+    if not row['team1'] or not row['team2'] or not row['date']:
+        return None
+    try:
+        kickoff = parse_match_datetime(' '.join(row['date'].split()), ref_date)
+    except ValueError:
+        return None
+    odds = row['odds'] or {}
+    return {
+        'Data': kickoff.strftime(DATE_FORMAT),
+        'team1': row['team1'],
+        'team2': row['team2'],
+        'odd_1': odds.get('1') or '',
+        'odd_X': odds.get('X') or '',
+        'odd_2': odds.get('2') or '',
+    }
+
+
+def _selenium_rows(bookmaker: str):
+    """
+    Fallback: citește oferta din pagină cu Selenium și o aduce la aceeași schemă.
+    """
+    from driver_pool import BOOKMAKER_HOME, CONSENT_HANDLERS, create_driver
+    from extractors import extract_maxbet_events, extract_spin_rows, extract_superbet_rows
+    from waits import scroll_until_no_new_rows
+
+    pages = {
+        'superbet': ('https://superbet.ro/pariuri-sportive/fotbal/toate', '.event-row-container', extract_superbet_rows),
+        'maxbet': ('https://www.maxbet.ro/ro/pariuri-sportive?sport=2', 'event', extract_maxbet_events),
+        'spin': (BOOKMAKER_HOME['spin'], 'div.contenitoreRiga', extract_spin_rows),
+    }
+    url, row_css, extract = pages[bookmaker]
+
+    seen = {}
+    ref_date = date.today()
+
+    def collect(driver):
+        new_rows = 0
+        for row in extract(driver, row_css):
+            row = page_row(row, ref_date)
+            if row is None:
+                continue
+            key = (row['Data'], row['team1'], row['team2'])
+            if key not in seen:
+                new_rows += 1
+            seen[key] = row
+        return new_rows
+
+    driver = create_driver(headless=True, profile='lean', bookmaker=bookmaker)
+    try:
+        with telemetry.span('page_load', bookmaker=bookmaker):
+            driver.get(url)
+        CONSENT_HANDLERS[bookmaker](driver)
+        scroll_until_no_new_rows(driver, row_css, on_step=collect)
+    finally:
+        driver.quit()
+    return list(seen.values())
+
+
+@telemetry.traced('scrape', kind='feed')
+def scrape_rows(bookmaker: str, base_url: str = None, days: int = 7, fallback: bool = True):
+    """
+    Întoarce oferta completă a unei case de pariuri, preferând feed-ul JSON și
+    revenind la Selenium dacă feed-ul nu răspunde sau nu poate fi parsat.
+    """
+    try:
+        with KeepAliveClient() as client, telemetry.span('feed_fetch', bookmaker=bookmaker) as span:
+            rows = asyncio.run(fetch_feed_rows(bookmaker, client, base_url, days))
+            span.set(rows=len(rows))
+        if rows:
+            return rows
+        print(f"Feed-ul {bookmaker} nu a întors niciun meci")
+    except (FeedError, KeyError, TypeError, ValueError) as e:
+        print(f"Feed-ul {bookmaker} a eșuat: {e}")
+        telemetry.log('feed_failed', bookmaker=bookmaker, error=str(e))
+
+    if not fallback:
+        return []
+    print(f"Revin la scraper-ul Selenium pentru {bookmaker}")
+    telemetry.count('feed_fallbacks_total', bookmaker=bookmaker)
+    return _selenium_rows(bookmaker)
+
+
+def write_rows_csv(filename: str, rows):
+    with CsvSink(filename, CSV_HEADER, append=False, max_rows=5000) as sink:
+        sink.write_many(rows)
+
+
+if __name__ == '__main__':
+    # python feed_scrapers.py <superbet|maxbet|spin> [output.csv]
+    if len(sys.argv) < 2 or sys.argv[1] not in FEEDS:
+        print("Usage: python feed_scrapers.py <superbet|maxbet|spin> [output.csv]")
+        sys.exit(1)
+
+    bookmaker = sys.argv[1]
+    output_csv = sys.argv[2] if len(sys.argv) > 2 else f"feed_{bookmaker}.csv"
+    rows = scrape_rows(bookmaker)
+    write_rows_csv(output_csv, rows)
+    print(f"{len(rows)} meciuri salvate în '{output_csv}'")
@@ -0,0 +1,97 @@
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'feeds')
+
+# Calea cererii (fără query string) -> fișierul înregistrat care îi răspunde; numele
+# fișierului poate folosi grupurile expresiei ({0}, {1}, ...)
+DEFAULT_ROUTES = [
+    (r'^/v2/ro-RO/events/by-date$', 'superbet_by_date.json'),
+    (r'^/ro/api/sport/2/leagues$', 'maxbet_leagues.json'),
+    (r'^/ro/api/league/\d+/events$', 'maxbet_league_events.json'),
+    (r'^/api/sport/calcio/events$', 'spin_events.json'),
+]
+
+
+CONTENT_TYPES = {
+    '.json': 'application/json; charset=utf-8',
+    '.html': 'text/html; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.png': 'image/png',
+    '.svg': 'image/svg+xml',
+    '.woff2': 'font/woff2',
+    '.mp4': 'video/mp4',
+}
+
+
+def _make_handler(fixtures_dir, routes):
+    compiled = [(re.compile(pattern), filename) for pattern, filename in routes]
+    root = os.path.realpath(fixtures_dir)
+
+    class StubHandler(BaseHTTPRequestHandler):
+        # HTTP/1.1 ca să putem verifica refolosirea conexiunilor keep-alive
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            for pattern, filename in compiled:
+                m = pattern.match(path)
+                if m:
+                    file_path = os.path.realpath(os.path.join(root, filename.format(*m.groups())))
+                    if not file_path.startswith(root + os.sep) or not os.path.isfile(file_path):
+                        break
+                    with open(file_path, 'rb') as f:
+                        body = f.read()
+                    self.send_response(200)
+                    self.send_header('Content-Type', CONTENT_TYPES.get(os.path.splitext(file_path)[1],
+                                                                       'application/octet-stream'))
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    with self.server.stats_lock:
+                        self.server.requests_served += 1
+                        self.server.bytes_sent += len(body)
+                    return
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def _make_server(port, fixtures_dir, routes):
+    server = ThreadingHTTPServer(('127.0.0.1', port), _make_handler(fixtures_dir, routes))
+    server.stats_lock = threading.Lock()
+    server.requests_served = server.bytes_sent = 0
+    return server
+
+
+def start_stub_server(port: int = 0, fixtures_dir: str = FIXTURES_DIR, routes=DEFAULT_ROUTES):
+    """
+    Pornește într-un thread un server local care servește feed-urile JSON înregistrate
+    (sau, cu alte `routes`, orice fișiere înregistrate, ex. paginile din bench_scrapers).
+    Întoarce (server, base_url); serverul se oprește cu server.shutdown().
+    server.requests_served și server.bytes_sent numără răspunsurile trimise.
+    """
+    server = _make_server(port, fixtures_dir, routes)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == '__main__':
+    # python feed_stub_server.py [port]
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server = _make_server(port, FIXTURES_DIR, DEFAULT_ROUTES)
+    print(f"Servesc feed-urile din '{FIXTURES_DIR}' pe http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
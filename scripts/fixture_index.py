@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+DATE_FORMAT = "%d/%m/%Y %H:%M"
+
+
+def odds_hash(odds) -> str:
+    """
+    Hash compact al cotelor unui meci; se schimbă doar când se schimbă o cotă.
+    """
+    raw = '|'.join('' if odds.get(k) is None else str(odds.get(k)) for k in ('1', 'X', '2'))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class FixtureIndex:
+    """
+    Index persistent al meciurilor deja văzute: (data, echipa1, echipa2) -> hash-ul cotelor.
+    Este încărcat la pornire, astfel încât fiecare rulare emite doar meciurile noi sau
+    cele cu cote schimbate, și curățat de meciurile începute, ca să nu crească la nesfârșit.
+    """
+
+    def __init__(self, path: str, changelog_path: str = None, changelog_max_bytes: int = 5 * 1024 * 1024):
+        self.path = path
+        self.changelog_path = changelog_path
+        self.changelog_max_bytes = changelog_max_bytes
+        # "data\techipa1\techipa2" -> [hash cote, ultima dată când a fost văzut (epoch)]
+        self.entries = {}
+        self._pending_changes = []
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(date: str, team1: str, team2: str) -> str:
+        return f"{date}\t{team1}\t{team2}"
+
+    def update(self, date: str, team1: str, team2: str, odds: dict, now: datetime = None):
+        """
+        Înregistrează un meci văzut acum. Întoarce 'new', 'changed' sau None dacă nimic nu s-a schimbat.
+        """
+        now = now or datetime.now()
+        key = self.key(date, team1, team2)
+        digest = odds_hash(odds)
+        entry = self.entries.get(key)
+        if entry is None:
+            status = 'new'
+        elif entry[0] != digest:
+            status = 'changed'
+        else:
+            status = None
+        self.entries[key] = [digest, int(now.timestamp())]
+        if status:
+            self._log(now, status, date, team1, team2, odds)
+        return status
+
+    def prune(self, now: datetime = None, kickoff_grace: timedelta = timedelta(0),
+              stale_after: timedelta = timedelta(days=7)):
+        """
+        Scoate din index meciurile care au început (ora de start + `kickoff_grace` a trecut).
+        Un meci nevăzut într-o rulare rămâne până la start, ca să nu fie emis din nou ca 'new'
+        când reapare; doar intrările cu data necunoscută se scot după `stale_after` de la
+        ultima apariție. Întoarce numărul de intrări șterse.
+        """
+        now = now or datetime.now()
+        stale_before = (now - stale_after).timestamp()
+        removed = []
+        for key, (_, last_seen) in self.entries.items():
+            date, team1, team2 = key.split('\t')
+            try:
+                expired = datetime.strptime(date, DATE_FORMAT) + kickoff_grace <= now
+            except ValueError:
+                expired = last_seen < stale_before
+            if expired:
+                removed.append(key)
+        for key in removed:
+            del self.entries[key]
+            self._log(now, 'removed', *key.split('\t'), None)
+        return len(removed)
+
+    def _log(self, now, op, date, team1, team2, odds):
+        if self.changelog_path is None:
+            return
+        entry = {'ts': now.strftime("%Y-%m-%d %H:%M:%S"), 'op': op, 'date': date, 'team1': team1, 'team2': team2}
+        if odds is not None:
+            entry['odds'] = [odds.get('1'), odds.get('X'), odds.get('2')]
+        self._pending_changes.append(json.dumps(entry, ensure_ascii=False, separators=(',', ':')))
+
+    def save(self):
+        """
+        Scrie indexul atomic (fișier temporar + rename) și adaugă schimbările în change log,
+        rotind log-ul când depășește `changelog_max_bytes`.
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+        if self.changelog_path and self._pending_changes:
+            if os.path.exists(self.changelog_path) and os.path.getsize(self.changelog_path) > self.changelog_max_bytes:
+                os.replace(self.changelog_path, self.changelog_path + '.1')
+            with open(self.changelog_path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self._pending_changes) + '\n')
+        self._pending_changes = []
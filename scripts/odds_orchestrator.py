@@ -0,0 +1,216 @@
+import atexit
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+
+import telemetry
+from team_index import team_id
+from arbitrage import find_arbitrage, rows_from_merged
+
+# Numele afișate în aplicație pentru fiecare casă de pariuri
+BOOKMAKER_NAMES = {
+    'superbet': 'Superbet',
+    'maxbet': 'MaxBet',
+    'spin': 'Spin.ro',
+}
+
+# Timp maxim (secunde) acordat fiecărui scraper, măsurat de la pornirea fan-out-ului
+DEFAULT_DEADLINES = {
+    'superbet': 45.0,
+    'maxbet': 60.0,
+    'spin': 60.0,
+}
+
+
+def _scrape_superbet(kickoff: datetime, team1: str, team2: str, driver):
+    from scraper_cota_eveniment_superbet import scrape_odds
+    return scrape_odds(team1, team2, driver=driver)
+
+
+def _scrape_maxbet(kickoff: datetime, team1: str, team2: str, driver):
+    from scraper_cota_eveniment_maxbet import scrape_odds
+    return scrape_odds(kickoff.strftime("%d/%m"), team1, team2, driver=driver)
+
+
+def _scrape_spin(kickoff: datetime, team1: str, team2: str, driver):
+    from script_cautare_meci_spin import scrape_matches_with_odds
+    return scrape_matches_with_odds(team1, team2, kickoff.strftime("%d/%m/%Y %H:%M"), driver=driver)
+
+
+SCRAPERS = {
+    'superbet': _scrape_superbet,
+    'maxbet': _scrape_maxbet,
+    'spin': _scrape_spin,
+}
+
+
+def _worker_init(headless: bool):
+    """
+    Rulează o dată în fiecare proces worker: fiecare worker își ține propriul
+    Chrome (prin DriverPool) și îl închide curat dacă este oprit la deadline.
+    """
+    import driver_pool
+    from multiprocessing.util import Finalize
+
+    os.environ['SCRAPER_HEADLESS'] = '1' if headless else '0'
+    # atexit nu rulează în worker-ii multiprocessing, deci închidem Chrome-ul explicit
+    Finalize(None, driver_pool.close_all_pools, exitpriority=10)
+    # ...și nici sumarul/profilul telemetriei worker-ului (run ID-ul vine cu fiecare sarcină)
+    Finalize(None, telemetry.shutdown, exitpriority=5)
+
+    def _stop(signum, frame):
+        driver_pool.close_all_pools()
+        os._exit(1)
+
+    signal.signal(signal.SIGTERM, _stop)
+
+
+def _run_scraper(bookmaker: str, kickoff: datetime, team1: str, team2: str, run_id: str = None):
+    from driver_pool import get_pool
+
+    # Worker-ul trăiește mai mult decât o rulare, deci preia ID-ul rulării care l-a apelat
+    telemetry.adopt_run(run_id)
+    started = time.monotonic()
+    pool = get_pool(bookmaker, size=1, headless=os.environ.get('SCRAPER_HEADLESS') == '1')
+    with pool.lease() as driver:
+        odds = SCRAPERS[bookmaker](kickoff, team1, team2, driver)
+    return odds, time.monotonic() - started
+
+
+# Câte un proces worker per casă de pariuri (și headless), păstrat între apeluri: Chrome-ul
+# din DriverPool-ul lui rămâne pornit și cu cookies acceptate, deci încărcarea paginii de
+# start și consimțământul se plătesc o singură dată, nu la fiecare fetch_all_odds
+_worker_pools = {}
+
+
+def _worker_pool(bookmaker: str, headless: bool):
+    key = (bookmaker, headless)
+    pool = _worker_pools.get(key)
+    if pool is None:
+        pool = _worker_pools[key] = multiprocessing.get_context('spawn').Pool(
+            1, initializer=_worker_init, initargs=(headless,))
+    return pool
+
+
+def _discard_worker_pool(bookmaker: str, headless: bool):
+    # Un worker blocat după deadline este oprit; următorul apel pornește unul nou
+    pool = _worker_pools.pop((bookmaker, headless), None)
+    if pool is not None:
+        pool.terminate()
+        pool.join()
+
+
+@atexit.register
+def close_worker_pools():
+    while _worker_pools:
+        _, pool = _worker_pools.popitem()
+        pool.close()
+        pool.join()
+
+
+@telemetry.run('fetch_all_odds')
+def fetch_all_odds(team1: str, team2: str, kickoff: datetime, bookmakers=None,
+                   deadlines=None, headless: bool = True):
+    """
+    Rulează scraper-ele per eveniment în paralel (câte un proces și un Chrome per casă de
+    pariuri, refolosite între apeluri) și întoarce tot ce s-a terminat înainte de
+    deadline-ul fiecărei case de pariuri. `kickoff` este obligatoriu: MaxBet și Spin
+    potrivesc meciul după data (și ora) de start afișată pe site.
+
+    Rezultatul are forma {'team1', 'team2', 'team1_id', 'team2_id', 'kickoff', 'odds': [...], 'status': {...},
+    'arbitrage': {...} sau None},
+    unde `odds` folosește aceleași câmpuri ca rutele Next.js (bookmaker, odd_1, odd_X,
+    odd_2, updated_at), iar `status` spune pentru fiecare casă dacă a reușit,
+    n-a găsit meciul, a dat eroare sau a depășit timpul.
+    """
+    if not isinstance(kickoff, datetime):
+        raise ValueError("fetch_all_odds are nevoie de ora de start a meciului (kickoff)")
+    bookmakers = list(bookmakers or SCRAPERS)
+    limits = dict(DEFAULT_DEADLINES, **(deadlines or {}))
+
+    result = {
+        'team1': team1,
+        'team2': team2,
+        # ID-urile canonice, după care rezultatul se leagă de predicții și de alte surse
+        'team1_id': team_id(team1),
+        'team2_id': team_id(team2),
+        'kickoff': kickoff.strftime("%d/%m/%Y %H:%M"),
+        'odds': [],
+        'status': {},
+    }
+
+    run_id = os.environ.get(telemetry.ENV_RUN_ID)
+    started = time.monotonic()
+    pending = {
+        name: _worker_pool(name, headless).apply_async(_run_scraper, (name, kickoff, team1, team2, run_id))
+        for name in bookmakers
+    }
+    # Așteptăm în ordinea deadline-urilor, ca un scraper lent să nu le blocheze pe celelalte
+    for name in sorted(pending, key=lambda n: limits[n]):
+        remaining = max(0.0, limits[name] - (time.monotonic() - started))
+        try:
+            odds, elapsed = pending[name].get(timeout=remaining)
+        except multiprocessing.TimeoutError:
+            _discard_worker_pool(name, headless)
+            result['status'][name] = {'status': 'timeout', 'elapsed': round(time.monotonic() - started, 2)}
+            continue
+        except Exception as e:
+            result['status'][name] = {'status': 'error', 'error': str(e).strip(), 'elapsed': round(time.monotonic() - started, 2)}
+            continue
+
+        if not odds:
+            result['status'][name] = {'status': 'not_found', 'elapsed': round(elapsed, 2)}
+            continue
+        result['status'][name] = {'status': 'ok', 'elapsed': round(elapsed, 2)}
+        result['odds'].append({
+            'bookmaker': BOOKMAKER_NAMES[name],
+            'odd_1': odds.get('1'),
+            'odd_X': odds.get('X'),
+            'odd_2': odds.get('2'),
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+        })
+
+    for name, status in result['status'].items():
+        telemetry.count('scraper_status_total', bookmaker=name, status=status['status'])
+        telemetry.log('scraper_status', bookmaker=name, **status)
+
+    # Arbitrajul (sau aproape-arbitrajul) dintre cotele care au sosit, calculat imediat
+    opportunities = find_arbitrage(rows_from_merged(result))
+    result['arbitrage'] = opportunities[0] if opportunities else None
+    return result
+
+
+def write_merged_odds(team1: str, team2: str, kickoff: datetime, output_json: str = 'odds_all.json', **kwargs):
+    """
+    Rulează `fetch_all_odds` și scrie rezultatul combinat într-un singur fișier JSON.
+    """
+    result = fetch_all_odds(team1, team2, kickoff, **kwargs)
+    tmp_path = output_json + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, output_json)
+    return result
+
+
+if __name__ == '__main__':
+    # python odds_orchestrator.py <team1> <team2> "DD/MM/YYYY HH:MM" [output.json]
+    if len(sys.argv) < 4:
+        print('Usage: python odds_orchestrator.py <team1> <team2> "DD/MM/YYYY HH:MM" [output.json]')
+        sys.exit(1)
+
+    team1, team2 = sys.argv[1], sys.argv[2]
+    try:
+        kickoff = datetime.strptime(sys.argv[3], "%d/%m/%Y %H:%M")
+    except ValueError:
+        print(f"Ora de start trebuie să fie în formatul DD/MM/YYYY HH:MM, nu '{sys.argv[3]}'")
+        sys.exit(1)
+    output_json = sys.argv[4] if len(sys.argv) > 4 else 'odds_all.json'
+
+    merged = write_merged_odds(team1, team2, kickoff, output_json)
+    for name, status in merged['status'].items():
+        print(f"{BOOKMAKER_NAMES[name]}: {status['status']} ({status['elapsed']}s)")
+    print(f"Rezultatul combinat a fost salvat în '{output_json}'")
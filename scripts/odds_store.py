@@ -0,0 +1,300 @@
+import csv
+import json
+import os
+import sys
+from datetime import date, datetime
+
+import numpy as np
+
+from date_parser import parse_match_datetime
+from team_index import team_id
+
+# Coloanele unui segment: fiecare este un fișier binar cu lățime fixă, completat prin append
+COLUMNS = {
+    'ts': np.int64,          # momentul citirii cotelor (epoch, secunde)
+    'kickoff': np.int64,     # ora de start a meciului (epoch, secunde; 0 dacă nu se știe)
+    'bookmaker': np.uint8,
+    'team1': np.uint32,      # indici în tabela de ID-uri canonice (team_index)
+    'team2': np.uint32,
+    'odd_1': np.float32,     # NaN dacă cota lipsește
+    'odd_X': np.float32,
+    'odd_2': np.float32,
+}
+
+BOOKMAKERS = ['superbet', 'maxbet', 'spin']
+
+# Fișierele CSV scrise de scraper-e și casa de pariuri căreia îi aparțin
+CSV_SOURCES = {
+    'odds_superbet.csv': 'superbet',
+    'all_football_matches.csv': 'superbet',
+    'odds_maxbet.csv': 'maxbet',
+    'maxbet_meciuri.csv': 'maxbet',
+    'odds_spin.csv': 'spin',
+}
+
+
+def _epoch(dt: datetime) -> int:
+    return int(dt.timestamp())
+
+
+def _price(value) -> float:
+    try:
+        return float(str(value).replace(',', '.'))
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class OddsStore:
+    """
+    Istoric de cote stocat pe coloane: un director cu segmente, fiecare segment având
+    câte un fișier binar per coloană (float32 pentru cote, int64 pentru timpi, întregi
+    pentru echipe și case de pariuri). Scrierea adaugă la sfârșitul fișierelor, iar
+    citirea folosește np.memmap, deci interogările nu copiază datele în memorie.
+    """
+
+    def __init__(self, root: str, segment_rows: int = 1 << 20):
+        self.root = root
+        self.segment_rows = segment_rows
+        os.makedirs(root, exist_ok=True)
+        self._meta_path = os.path.join(root, 'meta.json')
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, encoding='utf-8') as f:
+                self.meta = json.load(f)
+        else:
+            self.meta = {'teams': [], 'bookmakers': list(BOOKMAKERS), 'segments': []}
+        self._team_codes = {t: i for i, t in enumerate(self.meta['teams'])}
+        self._bookmaker_codes = {b: i for i, b in enumerate(self.meta['bookmakers'])}
+        self._repair_last_segment()
+
+    # --- ID-uri ---
+
+    def team_code(self, name: str, create: bool = False):
+        tid = team_id(name)
+        if tid not in self._team_codes:
+            if not create:
+                return None
+            self._team_codes[tid] = len(self.meta['teams'])
+            self.meta['teams'].append(tid)
+        return self._team_codes[tid]
+
+    def bookmaker_code(self, name: str, create: bool = False):
+        name = name.lower()
+        if name not in self._bookmaker_codes:
+            if not create:
+                return None
+            self._bookmaker_codes[name] = len(self.meta['bookmakers'])
+            self.meta['bookmakers'].append(name)
+        return self._bookmaker_codes[name]
+
+    # --- Segmente ---
+
+    def _segment_dir(self, segment: dict) -> str:
+        return os.path.join(self.root, segment['name'])
+
+    def _column_path(self, segment: dict, column: str) -> str:
+        return os.path.join(self._segment_dir(segment), f"{column}.bin")
+
+    def _rows_on_disk(self, segment: dict) -> int:
+        return min(os.path.getsize(self._column_path(segment, c)) // np.dtype(t).itemsize
+                   if os.path.exists(self._column_path(segment, c)) else 0
+                   for c, t in COLUMNS.items())
+
+    def _repair_last_segment(self):
+        # meta.json este scris după coloane, deci numărul de rânduri din el este cel confirmat;
+        # o scriere întreruptă poate lăsa coloane mai lungi sau de lungimi diferite, pe care le tăiem
+        if not self.meta['segments']:
+            return
+        segment = self.meta['segments'][-1]
+        rows = min(segment['rows'], self._rows_on_disk(segment))
+        for column, dtype in COLUMNS.items():
+            path = self._column_path(segment, column)
+            with open(path, 'ab') as f:
+                f.truncate(rows * np.dtype(dtype).itemsize)
+        segment['rows'] = rows
+
+    def _new_segment(self) -> dict:
+        segment = {'name': f"segment-{len(self.meta['segments']):05d}", 'rows': 0, 'ts_min': None, 'ts_max': None}
+        os.makedirs(self._segment_dir(segment), exist_ok=True)
+        # O rulare întreruptă înainte de _save_meta poate lăsa un director cu același nume,
+        # absent din meta.json; coloanele lui se golesc, altfel rândurile noi s-ar adăuga după ele
+        for column in COLUMNS:
+            open(self._column_path(segment, column), 'wb').close()
+        self.meta['segments'].append(segment)
+        return segment
+
+    def _save_meta(self):
+        tmp_path = self._meta_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self._meta_path)
+
+    # --- Scriere ---
+
+    def append(self, rows):
+        """
+        Adaugă instantanee de cote. Fiecare rând este un dict cu bookmaker, team1, team2,
+        odd_1, odd_X, odd_2 și opțional ts și kickoff (datetime sau epoch).
+        Întoarce numărul de rânduri scrise.
+        """
+        now = _epoch(datetime.now())
+        columns = {c: [] for c in COLUMNS}
+        for row in rows:
+            ts, kickoff = row.get('ts') or now, row.get('kickoff') or 0
+            columns['ts'].append(_epoch(ts) if isinstance(ts, datetime) else int(ts))
+            columns['kickoff'].append(_epoch(kickoff) if isinstance(kickoff, datetime) else int(kickoff))
+            columns['bookmaker'].append(self.bookmaker_code(row['bookmaker'], create=True))
+            columns['team1'].append(self.team_code(row['team1'], create=True))
+            columns['team2'].append(self.team_code(row['team2'], create=True))
+            for odd in ('odd_1', 'odd_X', 'odd_2'):
+                columns[odd].append(_price(row.get(odd)))
+
+        total = len(columns['ts'])
+        written = 0
+        while written < total:
+            segment = self.meta['segments'][-1] if self.meta['segments'] else self._new_segment()
+            if segment['rows'] >= self.segment_rows:
+                segment = self._new_segment()
+            n = min(total - written, self.segment_rows - segment['rows'])
+            for column, dtype in COLUMNS.items():
+                chunk = np.asarray(columns[column][written:written + n], dtype=dtype)
+                with open(self._column_path(segment, column), 'ab') as f:
+                    f.write(chunk.tobytes())
+            ts = columns['ts'][written:written + n]
+            segment['rows'] += n
+            segment['ts_min'] = min(ts) if segment['ts_min'] is None else min(segment['ts_min'], min(ts))
+            segment['ts_max'] = max(ts) if segment['ts_max'] is None else max(segment['ts_max'], max(ts))
+            written += n
+
+        if total:
+            self._save_meta()
+        return total
+
+    # --- Citire ---
+
+    def _segment_columns(self, segment: dict) -> dict:
+        if segment['rows'] == 0:
+            return {c: np.empty(0, dtype=t) for c, t in COLUMNS.items()}
+        return {c: np.memmap(self._column_path(segment, c), dtype=t, mode='r', shape=(segment['rows'],))
+                for c, t in COLUMNS.items()}
+
+    def query(self, start=None, end=None, bookmaker: str = None, team1: str = None, team2: str = None,
+              kickoff=None) -> dict:
+        """
+        Rândurile cu ts în [start, end) care se potrivesc filtrelor date, ca dict de coloane NumPy.
+        Segmentele din afara intervalului sunt sărite fără să fie citite.
+        """
+        start = _epoch(start) if isinstance(start, datetime) else start
+        end = _epoch(end) if isinstance(end, datetime) else end
+        kickoff = _epoch(kickoff) if isinstance(kickoff, datetime) else kickoff
+        filters = {}
+        for column, value, lookup in (('bookmaker', bookmaker, self.bookmaker_code),
+                                      ('team1', team1, self.team_code), ('team2', team2, self.team_code)):
+            if value is not None:
+                code = lookup(value)
+                if code is None:
+                    return {c: np.empty(0, dtype=t) for c, t in COLUMNS.items()}
+                filters[column] = code
+
+        parts = []
+        for segment in self.meta['segments']:
+            if segment['rows'] == 0:
+                continue
+            if start is not None and segment['ts_max'] < start:
+                continue
+            if end is not None and segment['ts_min'] >= end:
+                continue
+            cols = self._segment_columns(segment)
+            mask = np.ones(segment['rows'], dtype=bool)
+            if start is not None:
+                mask &= cols['ts'] >= start
+            if end is not None:
+                mask &= cols['ts'] < end
+            if kickoff is not None:
+                mask &= cols['kickoff'] == kickoff
+            for column, code in filters.items():
+                mask &= cols[column] == code
+            parts.append({c: np.asarray(v[mask]) for c, v in cols.items()})
+
+        if not parts:
+            return {c: np.empty(0, dtype=t) for c, t in COLUMNS.items()}
+        return {c: np.concatenate([p[c] for p in parts]) for c in COLUMNS}
+
+    def fixture_history(self, team1: str, team2: str, kickoff=None, bookmaker: str = None) -> dict:
+        """
+        Evoluția cotelor unui meci, ordonată după momentul citirii.
+        """
+        rows = self.query(team1=team1, team2=team2, kickoff=kickoff, bookmaker=bookmaker)
+        order = np.argsort(rows['ts'], kind='stable')
+        return {c: v[order] for c, v in rows.items()}
+
+    def __len__(self):
+        return sum(segment['rows'] for segment in self.meta['segments'])
+
+
+def _parse_kickoff(value: str, ref_date: date):
+    value = (value or '').strip()
+    if not value:
+        return 0
+    for fmt in ("%d/%m/%Y %H:%M", "%d/%m/%Y"):
+        try:
+            return _epoch(datetime.strptime(value, fmt))
+        except ValueError:
+            pass
+    try:
+        return _epoch(parse_match_datetime(value, ref_date))
+    except ValueError:
+        return 0
+
+
+def convert_csv(store: OddsStore, path: str, bookmaker: str = None, ts=None) -> int:
+    """
+    Importă un CSV scris de scraper-e (odds_*.csv, maxbet_meciuri.csv, all_football_matches.csv).
+    Coloanele sunt recunoscute după nume (Data/date/data, team1/echipa1, odd_1/cota_1, updated_at);
+    fără updated_at, momentul citirii este data modificării fișierului.
+    """
+    bookmaker = bookmaker or CSV_SOURCES.get(os.path.basename(path))
+    if bookmaker is None:
+        raise ValueError(f"Nu știu cărei case de pariuri îi aparține '{path}'; dați bookmaker explicit")
+    default_ts = ts if ts is not None else int(os.path.getmtime(path))
+    ref_date = datetime.fromtimestamp(default_ts).date()
+
+    aliases = {
+        'date': ('Data', 'date', 'data'), 'team1': ('team1', 'echipa1'), 'team2': ('team2', 'echipa2'),
+        'odd_1': ('odd_1', 'cota_1'), 'odd_X': ('odd_X', 'cota_X'), 'odd_2': ('odd_2', 'cota_2'),
+    }
+    rows = []
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for raw in csv.DictReader(f):
+            get = lambda field: next((raw[k] for k in aliases[field] if raw.get(k) is not None), None)
+            if not get('team1') or not get('team2'):
+                continue
+            updated_at = raw.get('updated_at')
+            rows.append({
+                'ts': _epoch(datetime.strptime(updated_at, "%Y-%m-%d %H:%M:%S")) if updated_at else default_ts,
+                'kickoff': _parse_kickoff(get('date'), ref_date),
+                'bookmaker': bookmaker,
+                'team1': get('team1'),
+                'team2': get('team2'),
+                'odd_1': get('odd_1'),
+                'odd_X': get('odd_X'),
+                'odd_2': get('odd_2'),
+            })
+    return store.append(rows)
+
+
+if __name__ == '__main__':
+    # python odds_store.py convert <director> <fișier.csv>... | python odds_store.py query <director> <team1> <team2>
+    if len(sys.argv) >= 4 and sys.argv[1] == 'convert':
+        store = OddsStore(sys.argv[2])
+        for path in sys.argv[3:]:
+            print(f"{path}: {convert_csv(store, path)} rânduri importate")
+    elif len(sys.argv) == 5 and sys.argv[1] == 'query':
+        store = OddsStore(sys.argv[2])
+        history = store.fixture_history(sys.argv[3], sys.argv[4])
+        for i in range(len(history['ts'])):
+            print(f"{datetime.fromtimestamp(int(history['ts'][i]))} {store.meta['bookmakers'][history['bookmaker'][i]]:<9} "
+                  f"1={history['odd_1'][i]:.2f} X={history['odd_X'][i]:.2f} 2={history['odd_2'][i]:.2f}")
+    else:
+        print("Usage: python odds_store.py convert <director> <fișier.csv>...")
+        print("       python odds_store.py query <director> <team1> <team2>")
+        sys.exit(1)
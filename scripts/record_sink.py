@@ -0,0 +1,255 @@
+import abc
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from team_index import team_id
+
+
+class RecordSink(abc.ABC):
+    """
+    Scriitor cu buffer comun pentru toate scraper-ele: rândurile sunt adunate în memorie
+    și scrise în loturi, când bufferul ajunge la `max_rows` rânduri, când cel mai vechi rând
+    din buffer așteaptă de `max_delay` secunde (verificat la write, deci un scraper lent nu
+    ține rândurile în memorie până la final) și la close(). Un rând poate fi un dict (cu
+    cheile din `fields`) sau o secvență în ordinea lui `fields`.
+    """
+
+    def __init__(self, fields, max_rows: int = 500, max_delay: float = 5.0):
+        self.fields = list(fields)
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.rows_written = 0
+        self._buffer = []
+        self._buffered_since = None
+        self._closed = False
+
+    def _values(self, row):
+        if isinstance(row, dict):
+            return ['' if row.get(f) is None else row.get(f) for f in self.fields]
+        return list(row)
+
+    def write(self, row):
+        now = time.monotonic()
+        if not self._buffer:
+            self._buffered_since = now
+        self._buffer.append(self._values(row))
+        if len(self._buffer) >= self.max_rows or now - self._buffered_since >= self.max_delay:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        if self._buffer:
+            rows, self._buffer = self._buffer, []
+            self._flush_rows(rows)
+            self.rows_written += len(rows)
+
+    @abc.abstractmethod
+    def _flush_rows(self, rows):
+        """Scrie un lot de rânduri (liste de valori în ordinea lui `fields`)."""
+
+    def close(self, commit: bool = True):
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(commit=exc_type is None)
+
+
+def _write_all(fd: int, data: bytes):
+    while data:
+        data = data[os.write(fd, data):]
+
+
+class _FileSink(RecordSink):
+    """
+    Bază pentru fișierele text. Cu append=True fiecare lot este adăugat la sfârșitul fișierului
+    printr-un singur write cu O_APPEND, deci costul nu depinde de mărimea fișierului, iar mai
+    mulți scriitori pe același fișier (worker-ii orchestratorului, daemonul de reîmprospătare)
+    nu își pierd rândurile. Un fișier nou apare deja cu antetul (creat alături și legat atomic).
+    Cu append=False loturile se adună într-un fișier temporar unic din același director, care
+    înlocuiește fișierul final la close(), deci cititorii (rutele Next.js) văd fie versiunea
+    veche, fie cea nouă, niciodată un fișier pe jumătate scris.
+    """
+
+    def __init__(self, path: str, fields, append: bool = True, **kwargs):
+        super().__init__(fields, **kwargs)
+        self.path = path
+        self.append = append
+        self.tmp_path = None
+
+    @abc.abstractmethod
+    def _write(self, f, rows, header: bool):
+        """Scrie `rows` (și antetul, dacă `header`) în fișierul text `f`."""
+
+    def _encode(self, rows, header: bool) -> bytes:
+        buffer = io.StringIO(newline='')
+        self._write(buffer, rows, header)
+        return buffer.getvalue().encode('utf-8')
+
+    def _mkstemp(self):
+        directory, name = os.path.split(os.path.abspath(self.path))
+        return tempfile.mkstemp(prefix=f".{name}.", suffix='.tmp', dir=directory)
+
+    def _create_with_header(self):
+        # Antetul este scris într-un fișier temporar legat apoi sub numele final: dacă alt
+        # scriitor a creat fișierul între timp, link-ul eșuează și doar adăugăm rânduri
+        fd, tmp_path = self._mkstemp()
+        try:
+            _write_all(fd, self._encode([], header=True))
+            os.close(fd)
+            os.link(tmp_path, self.path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+
+    def _flush_rows(self, rows):
+        if self.append:
+            if not os.path.exists(self.path):
+                self._create_with_header()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+            try:
+                _write_all(fd, self._encode(rows, header=False))
+            finally:
+                os.close(fd)
+            return
+        header = self.tmp_path is None
+        if header:
+            fd, self.tmp_path = self._mkstemp()
+        else:
+            fd = os.open(self.tmp_path, os.O_WRONLY | os.O_APPEND)
+        try:
+            _write_all(fd, self._encode(rows, header))
+        finally:
+            os.close(fd)
+
+    def close(self, commit: bool = True):
+        if self._closed:
+            return
+        if not commit and not self.append:
+            # Rularea a eșuat: păstrăm fișierul anterior neatins
+            self._closed = True
+            if self.tmp_path is not None:
+                os.remove(self.tmp_path)
+            return
+        super().close()
+        if self.append:
+            if not os.path.exists(self.path):
+                self._create_with_header()
+            return
+        if self.tmp_path is None:
+            self._flush_rows([])
+        # mkstemp creează fișierul cu drepturile 0600; fișierul final rămâne citibil de aplicație
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(self.tmp_path, 0o666 & ~umask)
+        os.replace(self.tmp_path, self.path)
+
+
+class CsvSink(_FileSink):
+    def _write(self, f, rows, header: bool):
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(self.fields)
+        writer.writerows(rows)
+
+
+class JsonLinesSink(_FileSink):
+    def _write(self, f, rows, header: bool):
+        f.writelines(json.dumps(dict(zip(self.fields, row)), ensure_ascii=False) + '\n' for row in rows)
+
+
+class SqliteSink(RecordSink):
+    """
+    Înlocuitor local pentru tabela `odds` din Supabase: fiecare lot este scris într-o singură
+    tranzacție cu upsert pe (match_id, bookmaker), deci o cotă actualizată suprascrie rândul vechi.
+    Rândurile au schema scraper-elor (data, team1, team2, odd_1, odd_X, odd_2).
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS odds (
+        match_id TEXT NOT NULL,
+        bookmaker TEXT NOT NULL,
+        team1 TEXT NOT NULL,
+        team2 TEXT NOT NULL,
+        match_date TEXT,
+        home_win REAL,
+        draw REAL,
+        away_win REAL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (match_id, bookmaker)
+    )
+    """
+
+    UPSERT = """
+    INSERT INTO odds (match_id, bookmaker, team1, team2, match_date, home_win, draw, away_win, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (match_id, bookmaker) DO UPDATE SET
+        home_win = excluded.home_win, draw = excluded.draw, away_win = excluded.away_win,
+        updated_at = excluded.updated_at
+    """
+
+    def __init__(self, path: str, bookmaker: str, fields=('Data', 'team1', 'team2', 'odd_1', 'odd_X', 'odd_2'), **kwargs):
+        super().__init__(fields, **kwargs)
+        self.path = path
+        self.bookmaker = bookmaker
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(self.SCHEMA)
+        self.conn.commit()
+
+    @staticmethod
+    def _odd(value):
+        try:
+            return float(str(value).replace(',', '.'))
+        except (TypeError, ValueError):
+            return None
+
+    def _flush_rows(self, rows):
+        now = datetime.now().isoformat(timespec='seconds')
+        params = []
+        for row in rows:
+            match_date, team1, team2, odd_1, odd_x, odd_2 = row[:6]
+            match_id = f"{match_date}|{team_id(team1)}|{team_id(team2)}"
+            params.append((match_id, self.bookmaker, team1, team2, match_date,
+                           self._odd(odd_1), self._odd(odd_x), self._odd(odd_2), now, now))
+        with self.conn:
+            self.conn.executemany(self.UPSERT, params)
+
+    def close(self, commit: bool = True):
+        if self._closed:
+            return
+        if not commit:
+            # Rularea a eșuat: loturile deja scrise au fost confirmate fiecare în tranzacția
+            # lui, dar rândurile rămase în buffer nu mai sunt scrise
+            self._buffer = []
+        super().close(commit)
+        self.conn.close()
+
+
+def open_sink(path: str, fields, bookmaker: str = None, **kwargs) -> RecordSink:
+    """
+    Alege back-end-ul după extensie: .csv, .jsonl sau .db/.sqlite (acesta cere `bookmaker`).
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.db', '.sqlite', '.sqlite3'):
+        if bookmaker is None:
+            raise ValueError("SqliteSink are nevoie de numele casei de pariuri")
+        return SqliteSink(path, bookmaker, fields, **kwargs)
+    if ext == '.jsonl':
+        return JsonLinesSink(path, fields, **kwargs)
+    return CsvSink(path, fields, **kwargs)
@@ -0,0 +1,462 @@
+import csv
+import heapq
+import itertools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from datetime import date, datetime
+
+import telemetry
+from date_parser import parse_match_datetime
+from team_index import team_id
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Listele de meciuri scrise de scraper-ele de ofertă completă (Superbet: all_football_matches.csv
+# cu ultima listă și indexul persistent, care păstrează până la start și meciurile nevăzute în
+# ultima rulare; MaxBet: CSV-ul complet)
+DEFAULT_SOURCES = [
+    os.path.join(os.getcwd(), 'fixture_index.json'),
+    os.path.join(os.getcwd(), 'all_football_matches.csv'),
+    os.path.join(SCRIPTS_DIR, 'maxbet_meciuri.csv'),
+]
+
+# Câte sesiuni Chrome poate folosi simultan daemon-ul pentru fiecare casă de pariuri
+DEFAULT_BUDGETS = {
+    'superbet': 1,
+    'maxbet': 1,
+    'spin': 1,
+}
+
+DATE_FORMAT = "%d/%m/%Y %H:%M"
+
+
+class Fixture:
+    """
+    Un meci din ofertă. `exact` spune dacă ora de start este cunoscută (MaxBet afișează
+    doar ziua în listă); Spin caută după data și ora exacte, deci are nevoie de ea.
+    """
+    __slots__ = ('key', 'team1', 'team2', 'kickoff', 'exact')
+
+    def __init__(self, team1: str, team2: str, kickoff: datetime, exact: bool = True):
+        self.team1, self.team2 = team1, team2
+        self.kickoff, self.exact = kickoff, exact
+        self.key = (team_id(team1), team_id(team2), kickoff.date())
+
+    def __repr__(self):
+        return f"Fixture({self.team1!r}, {self.team2!r}, {self.kickoff:%d/%m/%Y %H:%M})"
+
+
+def _parse_kickoff(value: str, ref_date: date):
+    value = (value or '').strip()
+    try:
+        return datetime.strptime(value, DATE_FORMAT), True
+    except ValueError:
+        pass
+    try:
+        kickoff = parse_match_datetime(value, ref_date)
+    except ValueError:
+        return None, False
+    if ':' not in value:
+        # Doar ziua: meciul rămâne în planificare până la sfârșitul ei
+        return kickoff.replace(hour=23, minute=59), False
+    return kickoff, True
+
+
+def load_fixtures(paths, ref_date: date = None):
+    """
+    Citește meciurile din fixture_index.json (cheile "data\\techipa1\\techipa2") și din
+    CSV-urile listelor (coloanele date/data/Data, team1/echipa1, team2/echipa2).
+    Același meci din mai multe surse (după ID-urile canonice și zi) apare o dată, cu ora
+    exactă dacă o are vreo sursă.
+    """
+    ref_date = ref_date or date.today()
+    fixtures = {}
+
+    def add(date_text, team1, team2):
+        kickoff, exact = _parse_kickoff(date_text, ref_date)
+        if kickoff is None or not team1 or not team2:
+            return
+        fixture = Fixture(team1.strip(), team2.strip(), kickoff, exact)
+        known = fixtures.get(fixture.key)
+        if known is None or (exact and not known.exact):
+            fixtures[fixture.key] = fixture
+
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                for key in json.load(f):
+                    add(*key.split('\t'))
+            continue
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                get = lambda *names: next((row[n] for n in names if row.get(n)), None)
+                add(get('date', 'data', 'Data'), get('team1', 'echipa1'), get('team2', 'echipa2'))
+    return list(fixtures.values())
+
+
+class _Entry:
+    __slots__ = ('fixture', 'bookmaker', 'due', 'scheduled_at', 'version', 'last_refresh', 'last_odds',
+                 'volatility', 'misses', 'in_flight')
+
+    def __init__(self, fixture: Fixture, bookmaker: str, due: float):
+        self.fixture, self.bookmaker, self.due = fixture, bookmaker, due
+        self.scheduled_at = due
+        self.version = 0
+        self.last_refresh = None
+        self.last_odds = None
+        self.volatility = 0.0
+        self.misses = 0
+        self.in_flight = False
+
+
+def _log_odds(odds):
+    try:
+        return tuple(math.log(float(str(odds[k]).replace(',', '.'))) for k in ('1', 'X', '2'))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class RefreshScheduler:
+    """
+    Decide ce cote merită reîmprospătate acum. Fiecare pereche (meci, casă de pariuri) are
+    un moment scadent într-un heap per casă; după fiecare citire momentul următor este
+
+        interval = clamp(timp până la start × horizon_ratio, min_interval, max_interval)
+                   / (1 + volatility_weight × volatilitate)
+
+    unde volatilitatea este media exponențială a variației |Δ log cotă| pe oră observate
+    între citiri. Meciurile apropiate și cele ale căror cote se mișcă sunt deci citite des,
+    cele peste zece zile rar. Meciurile negăsite pe site sunt amânate exponențial.
+    Nu face I/O și primește timpul ca parametru, deci poate fi simulat.
+    """
+
+    def __init__(self, bookmakers=tuple(DEFAULT_BUDGETS), horizon_ratio: float = 0.05,
+                 min_interval: float = 120, max_interval: float = 6 * 3600, volatility_weight: float = 10.0,
+                 volatility_halflife: int = 3, kickoff_grace: float = 600, piggyback: float = 0.25):
+        self.bookmakers = list(bookmakers)
+        self.horizon_ratio = horizon_ratio
+        self.min_interval, self.max_interval = min_interval, max_interval
+        self.volatility_weight = volatility_weight
+        self.volatility_alpha = 1 - 0.5 ** (1 / volatility_halflife)
+        self.kickoff_grace = kickoff_grace
+        self.piggyback = piggyback
+        self._entries = {}                       # (cheie meci, casă) -> _Entry
+        self._heaps = {b: [] for b in self.bookmakers}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = {b: {'lookups': 0, 'refreshed': 0, 'changed': 0, 'not_found': 0, 'errors': 0,
+                          'browser_seconds': 0.0} for b in self.bookmakers}
+
+    def _push(self, entry: _Entry):
+        entry.version += 1
+        heapq.heappush(self._heaps[entry.bookmaker], (entry.due, next(self._seq), entry.version, entry))
+
+    def interval(self, entry: _Entry, now: float) -> float:
+        to_kickoff = max(0.0, entry.fixture.kickoff.timestamp() - now)
+        seconds = min(self.max_interval, max(self.min_interval, to_kickoff * self.horizon_ratio))
+        seconds /= 1 + self.volatility_weight * entry.volatility
+        seconds *= 2 ** min(entry.misses, 4)
+        return max(self.min_interval, min(seconds, self.max_interval))
+
+    def _eligible(self, fixture: Fixture, bookmaker: str) -> bool:
+        return bookmaker != 'spin' or fixture.exact
+
+    def sync(self, fixtures, now: float = None) -> dict:
+        """
+        Aduce planificarea la zi cu lista curentă de meciuri: meciurile noi sunt scadente
+        imediat, cele dispărute din ofertă sau începute sunt scoase. Întoarce {'added', 'removed'}.
+        """
+        now = time.time() if now is None else now
+        wanted = {f.key: f for f in fixtures if f.kickoff.timestamp() + self.kickoff_grace > now}
+        added = removed = 0
+        with self._lock:
+            for (key, bookmaker), entry in list(self._entries.items()):
+                if key not in wanted:
+                    del self._entries[(key, bookmaker)]
+                    entry.version += 1          # intrarea din heap devine invalidă
+                    removed += 1
+                else:
+                    entry.fixture = wanted[key]
+            for key, fixture in wanted.items():
+                for bookmaker in self.bookmakers:
+                    if (key, bookmaker) in self._entries or not self._eligible(fixture, bookmaker):
+                        continue
+                    entry = self._entries[(key, bookmaker)] = _Entry(fixture, bookmaker, now)
+                    self._push(entry)
+                    added += 1
+        return {'added': added, 'removed': removed}
+
+    def _pop_valid(self, bookmaker: str, until: float):
+        heap = self._heaps[bookmaker]
+        while heap and heap[0][0] <= until:
+            item = heapq.heappop(heap)
+            if item[2] == item[3].version and not item[3].in_flight:
+                return item
+        return None
+
+    def next_batch(self, bookmaker: str, batch_size: int = 8, now: float = None):
+        """
+        Cele mai întârziate meciuri scadente pentru `bookmaker` (cel mult `batch_size`).
+        Dacă lotul nu e plin, sunt adăugate și meciuri care au parcurs deja cel puțin
+        1 - `piggyback` din intervalul lor: încărcarea paginii se plătește oricum o dată pe lot.
+        Meciurile întoarse sunt marcate "în curs" până la record()/release().
+        """
+        now = time.time() if now is None else now
+        batch, early = [], []
+        with self._lock:
+            for until in (now, now + self.piggyback * self.max_interval):
+                while len(batch) < batch_size:
+                    item = self._pop_valid(bookmaker, until)
+                    if item is None:
+                        break
+                    entry = item[3]
+                    if entry.fixture.kickoff.timestamp() + self.kickoff_grace <= now:
+                        self._entries.pop((entry.fixture.key, bookmaker), None)
+                        continue
+                    if entry.due - now > self.piggyback * (entry.due - entry.scheduled_at):
+                        early.append(item)
+                        continue
+                    entry.in_flight = True
+                    batch.append(entry)
+            for item in early:
+                heapq.heappush(self._heaps[bookmaker], item)
+        return [entry.fixture for entry in batch]
+
+    def next_due(self, bookmaker: str):
+        """Momentul (epoch) următoarei scadențe pentru `bookmaker`, sau None."""
+        with self._lock:
+            heap = self._heaps[bookmaker]
+            while heap and (heap[0][2] != heap[0][3].version or heap[0][3].in_flight):
+                heapq.heappop(heap)
+            return heap[0][0] if heap else None
+
+    def record(self, bookmaker: str, results: dict, now: float = None, browser_seconds: float = 0.0):
+        """
+        Înregistrează rezultatul unui lot ({meci: cote sau None}), actualizează volatilitatea
+        fiecărui meci și îl replanifică. Întoarce meciurile ale căror cote s-au schimbat.
+        """
+        now = time.time() if now is None else now
+        changed = []
+        with self._lock:
+            stats = self.stats[bookmaker]
+            stats['lookups'] += 1
+            stats['browser_seconds'] += browser_seconds
+            for fixture, odds in results.items():
+                entry = self._entries.get((fixture.key, bookmaker))
+                if entry is None:
+                    continue
+                entry.in_flight = False
+                current = _log_odds(odds) if odds else None
+                if current is None:
+                    entry.misses += 1
+                    stats['not_found'] += 1
+                else:
+                    if entry.last_odds is not None:
+                        hours = max((now - entry.last_refresh) / 3600, 1 / 60)
+                        move = sum(abs(a - b) for a, b in zip(current, entry.last_odds)) / hours
+                        entry.volatility += self.volatility_alpha * (move - entry.volatility)
+                        if move > 0:
+                            changed.append(fixture)
+                            stats['changed'] += 1
+                    entry.last_odds, entry.last_refresh, entry.misses = current, now, 0
+                    stats['refreshed'] += 1
+                entry.due, entry.scheduled_at = now + self.interval(entry, now), now
+                self._push(entry)
+        return changed
+
+    def release(self, bookmaker: str, fixtures, now: float = None, retry_after: float = None):
+        """
+        Lotul a eșuat (ex. eroare WebDriver): meciurile sunt replanificate peste `retry_after`
+        secunde (implicit min_interval), fără să le schimbe istoricul.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self.stats[bookmaker]['errors'] += 1
+            for fixture in fixtures:
+                entry = self._entries.get((fixture.key, bookmaker))
+                if entry is not None:
+                    entry.in_flight = False
+                    entry.due = now + (self.min_interval if retry_after is None else retry_after)
+                    entry.scheduled_at = now
+                    self._push(entry)
+
+    def plan(self, now: float = None, limit: int = 20):
+        """
+        Următoarele scadențe pe fiecare casă: [(casă, scadent peste (s), meci, interval curent (s))].
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = sorted((e for e in self._entries.values() if not e.in_flight), key=lambda e: e.due)
+        return [(e.bookmaker, round(e.due - now), e.fixture, round(self.interval(e, now))) for e in entries[:limit]]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# --- Căutările (un lot, un driver) ---
+
+def _lookup_superbet(fixtures, driver):
+    from scraper_cota_eveniment_superbet import scrape_odds
+    return {f: scrape_odds(f.team1, f.team2, driver=driver) for f in fixtures}
+
+
+def _lookup_maxbet(fixtures, driver):
+    from scraper_cota_eveniment_maxbet import scrape_odds_batch
+    requests = {(f.kickoff.strftime("%d/%m"), f.team1, f.team2): f for f in fixtures}
+    return {requests[r]: odds for r, odds in scrape_odds_batch(list(requests), driver=driver).items()}
+
+
+def _lookup_spin(fixtures, driver):
+    from script_cautare_meci_spin import scrape_odds_batch
+    requests = {(f.kickoff.strftime(DATE_FORMAT), f.team1, f.team2): f for f in fixtures}
+    return {requests[r]: odds for r, odds in scrape_odds_batch(list(requests), driver=driver).items()}
+
+
+LOOKUPS = {
+    'superbet': _lookup_superbet,
+    'maxbet': _lookup_maxbet,
+    'spin': _lookup_spin,
+}
+
+
+class RefreshDaemon:
+    """
+    Rulează planificarea: pentru fiecare casă de pariuri pornește câte un thread per sesiune
+    din buget; fiecare thread ia următorul lot scadent, împrumută un Chrome din DriverPool-ul
+    casei și face căutările în lot. Lista de meciuri este recitită când se schimbă sursele.
+    Cotele citite sunt adăugate în OddsStore, dacă este dat `store_path`.
+    """
+
+    def __init__(self, sources=DEFAULT_SOURCES, budgets=None, batch_size: int = 8, store_path: str = None,
+                 headless: bool = True, reload_every: float = 60, scheduler: RefreshScheduler = None):
+        self.sources = list(sources)
+        self.budgets = dict(budgets or DEFAULT_BUDGETS)
+        self.batch_size = batch_size
+        self.headless = headless
+        self.reload_every = reload_every
+        self.scheduler = scheduler or RefreshScheduler(bookmakers=list(self.budgets))
+        self.store = None
+        if store_path:
+            from odds_store import OddsStore
+            self.store = OddsStore(store_path)
+        self._store_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Condition()
+        self._mtimes = None
+
+    def reload(self) -> bool:
+        mtimes = [os.path.getmtime(p) if os.path.exists(p) else None for p in self.sources]
+        if mtimes == self._mtimes:
+            return False
+        self._mtimes = mtimes
+        changes = self.scheduler.sync(load_fixtures(self.sources))
+        telemetry.log('fixtures_reloaded', fixtures=len(self.scheduler), **changes)
+        print(f"Lista de meciuri recitită: {changes['added']} intrări noi, {changes['removed']} scoase")
+        with self._wake:
+            self._wake.notify_all()
+        return True
+
+    def _save(self, bookmaker: str, results: dict):
+        rows = [{'bookmaker': bookmaker, 'team1': f.team1, 'team2': f.team2, 'kickoff': f.kickoff,
+                 'odd_1': odds.get('1'), 'odd_X': odds.get('X'), 'odd_2': odds.get('2')}
+                for f, odds in results.items() if odds]
+        if rows and self.store is not None:
+            with self._store_lock:
+                self.store.append(rows)
+
+    def _worker(self, bookmaker: str):
+        from driver_pool import get_pool
+
+        pool = get_pool(bookmaker, size=self.budgets[bookmaker], headless=self.headless)
+        while not self._stop.is_set():
+            batch = self.scheduler.next_batch(bookmaker, self.batch_size)
+            if not batch:
+                due = self.scheduler.next_due(bookmaker)
+                wait = self.reload_every if due is None else min(self.reload_every, max(0.5, due - time.time()))
+                with self._wake:
+                    self._wake.wait(wait)
+                continue
+
+            started = time.monotonic()
+            try:
+                with telemetry.span('refresh_batch', bookmaker=bookmaker, fixtures=len(batch)):
+                    with pool.lease() as driver:
+                        results = LOOKUPS[bookmaker](batch, driver)
+            except Exception as e:
+                print(f"[{bookmaker}] lotul de {len(batch)} meciuri a eșuat: {e}")
+                self.scheduler.release(bookmaker, batch)
+                continue
+            elapsed = time.monotonic() - started
+            changed = self.scheduler.record(bookmaker, results, browser_seconds=elapsed)
+            self._save(bookmaker, results)
+            found = sum(1 for odds in results.values() if odds)
+            telemetry.count('refreshed_total', found, bookmaker=bookmaker)
+            telemetry.count('odds_changed_total', len(changed), bookmaker=bookmaker)
+            print(f"[{bookmaker}] {found}/{len(batch)} meciuri citite în {elapsed:.1f}s, {len(changed)} cu cote schimbate")
+
+    def run(self):
+        """
+        Rulează până la stop() (sau Ctrl+C). Sesiunile Chrome sunt închise la ieșire.
+        """
+        from driver_pool import close_all_pools
+
+        self.reload()
+        threads = [threading.Thread(target=self._worker, args=(bookmaker,), name=f"refresh-{bookmaker}-{i}", daemon=True)
+                   for bookmaker, budget in self.budgets.items() for i in range(budget)]
+        for thread in threads:
+            thread.start()
+        try:
+            while not self._stop.wait(self.reload_every):
+                self.reload()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            for thread in threads:
+                thread.join()
+            close_all_pools()
+            print(json.dumps(self.scheduler.stats, indent=2))
+
+    def stop(self):
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+
+
+def _parse_budgets(text: str) -> dict:
+    budgets = {}
+    for part in text.split(','):
+        name, _, value = part.partition('=')
+        if name not in LOOKUPS:
+            raise ValueError(f"Casă de pariuri necunoscută: '{name}'")
+        budgets[name] = int(value or 1)
+    return budgets
+
+
+if __name__ == '__main__':
+    # python refresh_scheduler.py [--sources fixture_index.json,maxbet_meciuri.csv] [--budget superbet=1,maxbet=2]
+    #                             [--batch 8] [--store odds_history] [--headful] [--plan]
+    args = sys.argv[1:]
+
+    def option(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    sources = option('--sources').split(',') if option('--sources') else DEFAULT_SOURCES
+    budgets = _parse_budgets(option('--budget')) if option('--budget') else DEFAULT_BUDGETS
+    if '--plan' in args:
+        # Doar afișează ordinea în care ar fi citite cotele, fără browser
+        scheduler = RefreshScheduler(bookmakers=list(budgets))
+        print(scheduler.sync(load_fixtures(sources)))
+        for bookmaker in budgets:
+            batch = scheduler.next_batch(bookmaker, int(option('--batch', 8)))
+            print(f"Primul lot {bookmaker}: {batch}")
+        sys.exit(0)
+
+    daemon = RefreshDaemon(sources, budgets, int(option('--batch', 8)), option('--store'), '--headful' not in args)
+    daemon.run()
@@ -1,117 +1,62 @@
-import csv
-import time
 from urllib.parse import quote
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from driver_pool import create_driver, accept_superbet_consent
+from waits import wait_for_count_stable
+from extractors import extract_superbet_rows
+from team_index import team_id
+from record_sink import CsvSink
+import telemetry
 
-def scrape_odds(var1: str, var2: str, output_csv: str = 'odds_superbet.csv'):
+@telemetry.traced('scrape', bookmaker='superbet', kind='search')
+def scrape_odds(var1: str, var2: str, output_csv: str = 'odds_superbet.csv', driver=None):
+    """
+    Caută meciul var1 - var2 pe Superbet, scrie cotele găsite în CSV și
+    întoarce cotele primului meci găsit (sau None).
+    """
     # 1) Encode var1 (spații → %20)
     query = quote(var1)
     url = f"https://superbet.ro/cautare?query={query}"
 
-    # 2) Setup Chrome
-    options = webdriver.ChromeOptions()
-    # options.add_argument('--headless')  # dezactivează UI dacă vrei
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument('window-size=1920,1080')
-
-    driver = webdriver.Chrome(options=options)
-    wait = WebDriverWait(driver, 20)
+    # 2) Setup Chrome (sau folosește driverul primit din pool)
+    owns_driver = driver is None
+    if owns_driver:
+        driver = create_driver(bookmaker='superbet')
 
+    first_odds = None
     try:
-        driver.get(url)
-
-        # --- Acceptă cookie-banner ---
-        try:
-            cookie_btn = wait.until(EC.element_to_be_clickable(
-                (By.ID, 'onetrust-accept-btn-handler')
-            ))
-            cookie_btn.click()
-            print("Cookies accepted")
-            time.sleep(1)
-        except:
-            print("No cookie prompt (or already accepted)")
-
-        # --- Mic scroll pentru modal ---
-        driver.execute_script("window.scrollBy(0, 100);")
-        time.sleep(0.1)
+        with telemetry.span('page_load', bookmaker='superbet'):
+            driver.get(url)
 
-        # --- Închide modalul dacă există ---
-        try:
-            close_btn = wait.until(EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, 'button.e2e-close-modal')
-            ))
-            close_btn.click()
-            print("Modal closed")
-            time.sleep(0.1)
-        except:
-            print("No modal to close")
+        # --- Acceptă cookie-banner și închide modalul (pool-ul o face deja) ---
+        if owns_driver:
+            accept_superbet_consent(driver)
 
-        # 3) Găsește toate evenimentele
-        events = driver.find_elements(By.CSS_SELECTOR,
-            "div.event-card.e2e-event-row.event-row-container__event"
-        )
+        # 3) Așteaptă ca lista de rezultate să se stabilizeze, apoi citește toate evenimentele
+        #    (echipe + cote) dintr-un singur apel execute_script
+        event_css = "div.event-card.e2e-event-row.event-row-container__event"
+        with telemetry.span('wait_results', bookmaker='superbet'):
+            wait_for_count_stable(driver, event_css, stable_ms=500, timeout=10)
+        rows = extract_superbet_rows(driver, event_css)
 
-        # 4) Scrie CSV header
-        with open(output_csv, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['team1', 'team2', 'odd_1', 'odd_X', 'odd_2'])
+        # 4) Fișierul de ieșire este înlocuit atomic la final, cu antetul și meciurile găsite
+        with CsvSink(output_csv, ['team1', 'team2', 'odd_1', 'odd_X', 'odd_2'], append=False) as sink:
 
-            # 5) Parcurge evenimentele și extrage cotele
-            for ev in events:
-                try:
-                    # ierarhie exactă pentru numele echipei 2
-                    team2 = ev.find_element(
-                        By.CSS_SELECTOR,
-                        ".event-card__main-content .event__sections .event__competitors-section .event-competitor .event-competitor__name.e2e-event-team2-name"
-                    ).text.strip()
-                except:
+            # 5) Păstrează evenimentele în care ambele echipe sunt cele căutate (comparate după ID canonic)
+            wanted = (team_id(var1), team_id(var2))
+            for row in rows:
+                team1, team2, odds = row['team1'], row['team2'], row['odds']
+                if not team1 or not team2 or (team_id(team1), team_id(team2)) != wanted:
                     continue
 
-                if team2.lower() == var2.lower():
-                    team1 = ev.find_element(
-                        By.CSS_SELECTOR,
-                        ".event-card__main-content .event__sections .event__competitors-section .event-competitor .event-competitor__name.e2e-event-team1-name"
-                    ).text.strip()
-
-                    # extrage cele 3 cote 1, X, 2
-                    buttons = ev.find_elements(
-                        By.CSS_SELECTOR,
-                        "div.odd-offer__odd-button.e2e-odd-pick"
-                    )
-                    odds = {'1': None, 'X': None, '2': None}
-                    try:
-                        for btn in buttons:
-                            try:
-                                name = btn.find_element(
-                                    By.CSS_SELECTOR,
-                                    "span.odd-button__odd-name.e2e-odd-name"
-                                ).text.strip()
-                                print(f"Found odd name: {name}")
-                                
-                                # Use the original selector that was working before
-                                value = btn.find_element(
-                                    By.CSS_SELECTOR,
-                                    "span.odd-button__odd-value-new.e2e-odd-current-value"
-                                ).text.strip()
-                                print(f"Found odd: {name} = {value}")
-                                        
-                                if name in odds:
-                                    odds[name] = value
-                            except Exception as e:
-                                print(f"Could not extract odd: {e}")
-                                continue
-                    except Exception as e:
-                        print(f"Error extracting odds: {e}")
-
-                    print(f"Found {team1} vs {team2} ::: 1: {odds['1']}, X: {odds['X']}, 2: {odds['2']}")
-                    writer.writerow([team1, team2, odds['1'], odds['X'], odds['2']])
+                print(f"Found {team1} vs {team2} ::: 1: {odds['1']}, X: {odds['X']}, 2: {odds['2']}")
+                sink.write([team1, team2, odds['1'], odds['X'], odds['2']])
+                if first_odds is None:
+                    first_odds = odds
     finally:
-        driver.quit()
+        if owns_driver:
+            driver.quit()
+
+    telemetry.count('fixtures_found_total' if first_odds else 'fixtures_not_found_total', bookmaker='superbet')
+    return first_odds
 
 
 if __name__ == "__main__":
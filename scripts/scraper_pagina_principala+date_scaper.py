@@ -1,186 +1,111 @@
-import re
-from datetime import datetime, date, timedelta
-import csv
+from datetime import date
 import os
-import time
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-
-# Set reference date (today)
-REF_DATE = date.today()
-
-# Map Romanian weekday abbreviations (without trailing dot) to integers Mon=0 … Sun=6
-WEEKDAY_MAP = {
-    'lun': 0, 'mar': 1, 'mie': 2, 'joi': 3,
-    'vin': 4, 'sâm': 5, 'sam': 5, 'dum': 6
-}
-
-def parse_match_datetime(s: str, ref_date: date = REF_DATE) -> datetime:
-    s = s.strip()
-    low = s.lower()
-
-    # Case "astăzi, HH:MM"
-    m = re.match(r'^(?:astăzi|azi)\s*,\s*(\d{1,2}):(\d{2})$', low)
-    if m:
-        hh, mm = map(int, m.groups())
-        return datetime(ref_date.year, ref_date.month, ref_date.day, hh, mm)
-
-    # Case "mâine, HH:MM"
-    m = re.match(r'^mâine\s*,\s*(\d{1,2}):(\d{2})$', low)
-    if m:
-        hh, mm = map(int, m.groups())
-        tomorrow = ref_date + timedelta(days=1)
-        return datetime(tomorrow.year, tomorrow.month, tomorrow.day, hh, mm)
-
-    # Case "DD.MM, HH:MM"
-    m = re.match(r'^(\d{1,2})\.(\d{1,2})\s*,\s*(\d{1,2}):(\d{2})$', low)
-    if m:
-        d, mo, hh, mm = map(int, m.groups())
-        return datetime(ref_date.year, mo, d, hh, mm)
-
-    # Case "WEEKDAY DD, HH:MM"
-    m = re.match(r'^([^\d,\.]+)\.?\s*(\d{1,2})\s*,\s*(\d{1,2}):(\d{2})$', low)
-    if m:
-        wd_abbr, day_str, hh_str, mm_str = m.groups()
-        day = int(day_str)
-        hh = int(hh_str)
-        mm = int(mm_str)
-        # Determine month: same month if day >= today.day, else next month
-        mo = ref_date.month
-        yr = ref_date.year
-        if day < ref_date.day:
-            if mo == 12:
-                mo = 1
-                yr += 1
-            else:
-                mo += 1
-        return datetime(yr, mo, day, hh, mm)
-
-    raise ValueError(f"Unrecognized date format: '{s}'")
-
-def format_parsed_date(s: str) -> str:
-    dt = parse_match_datetime(s)
-    return dt.strftime("%d/%m/%Y %H:%M")
-
-def scroll_to_bottom_and_extract(driver, writer, seen,
-                                 scroll_pixels=300, scroll_pause=1.0, max_matches=100):
+from driver_pool import create_driver, accept_superbet_consent
+from waits import scroll_until_no_new_rows
+from extractors import extract_superbet_rows
+from fixture_index import FixtureIndex
+from date_parser import format_match_datetime
+from record_sink import CsvSink
+import telemetry
+
+def format_parsed_date(s: str, ref_date: date = None) -> str:
+    return format_match_datetime(s, ref_date)
+
+def scroll_to_bottom_and_extract(driver, sink, seen, index=None,
+                                 quiet_ms=400, max_matches=None, max_scrolls=500, ref_date=None):
     """
-    Scrolls down the window to bottom, extracts newly visible matches,
-    formats their dates, and writes them to CSV.
-    Stops when bottom reached.
+    Scrolls down the page, extracts newly visible matches,
+    formats their dates, and writes them to the record sink.
+    Every match is written, so the sink holds the full listing; with a FixtureIndex
+    the new matches and those whose odds changed since the previous run are also
+    recorded in the index changelog. `seen` tracks the rows visited in this run.
+    Stops when scrolling no longer reveals new matches.
+    Relative dates are resolved against `ref_date`, fixed once for the whole run.
+    Returns (rows written, new or changed rows).
     """
+    ref_date = ref_date or date.today()
     total_written = 0
-
-    while True:
-        rows = driver.find_elements(By.CSS_SELECTOR, '.event-row-container')
-        for row in rows:
+    total_changed = 0
+
+    def extract_visible(driver):
+        nonlocal total_written, total_changed
+        new_rows = 0
+        # One execute_script call returns every rendered row
+        for row in extract_superbet_rows(driver, '.event-row-container'):
+            # Once the limit is reached no new rows are reported, so scrolling stops
+            if max_matches is not None and total_written >= max_matches:
+                break
+            if not row['date'] or not row['team1'] or not row['team2']:
+                continue
             try:
-                if total_written >= max_matches:
-                    return total_written
-                    
-                main = row.find_element(By.CSS_SELECTOR, '.event-card__main-content')
-                # Extract raw date text
-                try:
-                    raw_date = main.find_element(
-                        By.CSS_SELECTOR, '.event-card-label .capitalize'
-                    ).text.strip()
-                except:
-                    raw_date = main.find_element(
-                        By.CSS_SELECTOR, '.event-card-label'
-                    ).text.strip()
-
-                # Format date
-                formatted_date = format_parsed_date(raw_date)
-
-                # Extract teams
-                team1 = main.find_element(
-                    By.CSS_SELECTOR, '.event-competitor__name.e2e-event-team1-name'
-                ).text.strip()
-                team2 = main.find_element(
-                    By.CSS_SELECTOR, '.event-competitor__name.e2e-event-team2-name'
-                ).text.strip()
-
-                key = (formatted_date, team1, team2)
-                if key not in seen:
-                    seen.add(key)
-                    writer.writerow({
-                        'date': formatted_date,
-                        'team1': team1,
-                        'team2': team2
-                    })
-                    print(f"Added: \"{formatted_date}\",{team1},{team2}")
-                    total_written += 1
-            except:
+                formatted_date = format_parsed_date(row['date'], ref_date)
+            except ValueError:
                 continue
+            team1, team2, odds = row['team1'], row['team2'], row['odds']
 
-        # Scroll down
-        driver.execute_script(f"window.scrollBy(0, {scroll_pixels});")
-        time.sleep(scroll_pause)
-
-        # Check if at bottom
-        at_bottom = driver.execute_script(
-            "return window.innerHeight + window.pageYOffset >= document.body.scrollHeight;"
-        )
-        if at_bottom:
-            time.sleep(1)
-            break
-
-    return total_written
-
-def main():
-    # Setup Chrome
-    opts = webdriver.ChromeOptions()
-    #opts.add_argument('--headless')
-    opts.add_argument('--disable-gpu')
-    opts.add_argument('--no-sandbox')
-    opts.add_argument('--disable-dev-shm-usage')
-    opts.add_argument('window-size=1920,1080')
-
-    driver = webdriver.Chrome(options=opts)
-    wait = WebDriverWait(driver, 0)
-
-    url = 'https://superbet.ro/pariuri-sportive/fotbal/toate'
-    driver.get(url)
-
-    # Accept cookies
-    try:
-        cookie_btn = wait.until(EC.element_to_be_clickable((By.ID, 'onetrust-accept-btn-handler')))
-        cookie_btn.click()
-        print("[OK] Cookies accepted")
-
-        time.sleep(0.1)
-    except:
-        print("[INFO] No cookie prompt")
-
-    # Small scroll to trigger modal
-    driver.execute_script("window.scrollBy(0, 100);")
-    time.sleep(0.1)
+            key = (formatted_date, team1, team2)
+            if key in seen:
+                continue
+            seen.add(key)
+            new_rows += 1
+
+            sink.write({
+                'date': formatted_date,
+                'team1': team1,
+                'team2': team2,
+                'odd_1': odds['1'] or '',
+                'odd_X': odds['X'] or '',
+                'odd_2': odds['2'] or '',
+            })
+            total_written += 1
+
+            status = index.update(formatted_date, team1, team2, odds) if index is not None else 'new'
+            if status is not None:
+                print(f"{status.capitalize()}: \"{formatted_date}\",{team1},{team2}")
+                total_changed += 1
+        return new_rows
+
+    scroll_until_no_new_rows(driver, '.event-row-container', on_step=extract_visible,
+                             max_scrolls=max_scrolls, quiet_ms=quiet_ms)
+
+    return total_written, total_changed
+
+@telemetry.traced('scrape', bookmaker='superbet', kind='listing')
+def main(driver=None):
+    # Setup Chrome (sau folosește driverul primit din pool)
+    owns_driver = driver is None
+    if owns_driver:
+        driver = create_driver(bookmaker='superbet')
 
-    # Close modal if present
     try:
-        close_btn = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'button.e2e-close-modal')))
-        close_btn.click()
-        print("Modal closed")
-        time.sleep(0.1)
-    except:
-        print("No modal to close")
-
-    # Prepare CSV
-    csv_path = os.path.join(os.getcwd(), 'all_football_matches.csv')
-    first = not os.path.exists(csv_path)
-    seen = set()
-    with open(csv_path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['date', 'team1', 'team2'])
-        if first:
-            writer.writeheader()
-
-        # Scroll and extract matches
-        written = scroll_to_bottom_and_extract(driver, writer, seen, scroll_pixels=6000, scroll_pause=0.005, max_matches=100)
-        print(f"Scraping complete. {written} new matches added.")
-
-    driver.quit()
+        url = 'https://superbet.ro/pariuri-sportive/fotbal/toate'
+        with telemetry.span('page_load', bookmaker='superbet'):
+            driver.get(url)
+
+        # Accept cookies and close modal (already done for pooled drivers)
+        if owns_driver:
+            accept_superbet_consent(driver, timeout=0)
+
+        # Persistent index of the fixtures seen by previous runs; new and changed fixtures go to its changelog
+        index = FixtureIndex(os.path.join(os.getcwd(), 'fixture_index.json'),
+                             changelog_path=os.path.join(os.getcwd(), 'fixture_changes.jsonl'))
+
+        # The CSV holds the full listing (the web app replaces its table with it) and is
+        # replaced atomically, so readers never see half a file
+        csv_path = os.path.join(os.getcwd(), 'all_football_matches.csv')
+        seen = set()
+        with CsvSink(csv_path, ['date', 'team1', 'team2', 'odd_1', 'odd_X', 'odd_2'], append=False) as sink:
+            # Scroll and extract matches
+            written, changed = scroll_to_bottom_and_extract(driver, sink, seen, index=index)
+
+        telemetry.count('rows_written_total', written, bookmaker='superbet')
+        removed = index.prune()
+        index.save()
+        print(f"Scraping complete. {written} matches written, {changed} new or changed, "
+              f"{removed} removed from the index.")
+    finally:
+        if owns_driver:
+            driver.quit()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,629 @@
+"""
+Motor asyncio de căutare în mai multe tab-uri ale unui singur Chrome.
+
+Scraper-ele clasice țin câte un Chrome (zeci/sute de MB) pentru fiecare căutare în curs.
+Aici pornim un singur browser (create_driver, profilul 'lean'), ne conectăm la el direct
+prin Chrome DevTools Protocol și rulăm căutările Superbet/MaxBet/Spin în zeci de tab-uri
+în paralel. Toate tab-urile sunt în contextul implicit al browserului, deci împart aceleași
+cookies și același localStorage: consimțământul este acceptat o singură dată per casă
+(cu handler-ele din driver_pool) și poate fi păstrat între rulări într-un fișier JSON.
+Semafoarele limitează tab-urile active în total și per casă, iar căutările pornite pe același
+site sunt distanțate cu `min_gap` secunde.
+
+Extragerea folosește aceleași scripturi ca extractors.py, iar potrivirea meciurilor aceleași
+chei ca scraper-ele (data în formatul casei + ID-urile canonice ale echipelor).
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from datetime import date, datetime
+from urllib.parse import quote, urlsplit
+
+import websocket
+
+import telemetry
+from batch_lookup import group_by_search_term, load_fixtures
+from driver_pool import BOOKMAKER_HOME, CONSENT_HANDLERS, blocked_url_patterns, create_driver
+from extractors import _MAXBET_JS, _SPIN_JS, _SUPERBET_JS
+from scraper_cota_eveniment_maxbet import events_to_found
+from script_cautare_meci_spin import rows_to_found
+from team_index import team_id
+from waits import _NETWORK_TRACKER_JS
+
+DEFAULT_MAX_TABS = 24
+# Câte căutări simultane acceptăm pe fiecare site (politețe față de casa de pariuri)
+DEFAULT_PER_SITE = {'superbet': 8, 'maxbet': 8, 'spin': 8}
+# Pauza minimă (secunde) între două căutări pornite pe același site
+DEFAULT_MIN_GAP = 0.25
+# Pauza dintre caractere la tastare, ca în scraper-ele sincrone
+CHAR_DELAY = {'maxbet': 0.1, 'spin': 0.15}
+
+# Formatul datei din fișierul --batch; MaxBet caută după zi/lună, Superbet ignoră data
+DATE_FORMAT = "%d/%m/%Y %H:%M"
+
+# Așteaptă câmpul `css`, îl focalizează și îl golește
+_FOCUS_JS = """
+const [css, timeoutMs, done] = arguments;
+const start = performance.now();
+(function poll() {
+    const el = document.querySelector(css);
+    if (el) {
+        el.scrollIntoView({block: 'center'});
+        el.click();
+        el.focus();
+        el.value = '';
+        return done(true);
+    }
+    if (performance.now() - start >= timeoutMs) return done(false);
+    setTimeout(poll, 50);
+})();
+"""
+
+# Ca waits.wait_for_results, dar într-un singur apel: rețea liniștită și număr stabil de rânduri
+_RESULTS_JS = """
+const [css, quietMs, timeoutMs, done] = arguments;
+const net = window.__scraperNet;
+const start = performance.now();
+let last = -1, changedAt = start;
+(function poll() {
+    const now = performance.now();
+    const count = document.querySelectorAll(css).length;
+    if (count !== last) { last = count; changedAt = now; }
+    const idle = !net || (net.inflight === 0 && now - net.last >= quietMs);
+    if ((idle && now - changedAt >= quietMs) || now - start >= timeoutMs) return done(count);
+    setTimeout(poll, 50);
+})();
+"""
+
+# După tastare, "liniștea" pe rețea se măsoară de la ultima tastă (site-urile au debounce)
+_MARK_INPUT_JS = "if (window.__scraperNet) window.__scraperNet.last = performance.now();"
+
+_COOKIE_FIELDS = ('name', 'value', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+
+class CdpError(Exception):
+    """Eroare întoarsă de Chrome pentru o comandă CDP (sau o excepție JavaScript din pagină)."""
+
+
+class CdpConnection:
+    """
+    O singură conexiune CDP, la nivel de browser. Comenzile tab-urilor trec prin ea cu
+    `sessionId` (Target.attachToTarget cu flatten), iar evenimentele ajung la cei care
+    le așteaptă prin `expect()`.
+    """
+
+    def __init__(self, ws: websocket.WebSocket):
+        self._ws = ws
+        self._loop = asyncio.get_running_loop()
+        self._next_id = 0
+        self._pending = {}
+        self._waiters = {}
+        self._closing = False
+        self._error = None
+        self.messages = 0
+        # websocket-client este sincron: un thread citește mesajele și le predă buclei asyncio
+        self._reader = threading.Thread(target=self._read_loop, name='cdp-reader', daemon=True)
+        self._reader.start()
+
+    @classmethod
+    async def connect(cls, debugger_address: str):
+        """
+        Se conectează la browserul care ascultă pe `debugger_address` (host:port).
+        """
+        def open_socket():
+            with urllib.request.urlopen(f"http://{debugger_address}/json/version", timeout=10) as response:
+                url = json.load(response)['webSocketDebuggerUrl']
+            # Fără antetul Origin: Chrome refuză altfel conexiunea (--remote-allow-origins)
+            ws = websocket.create_connection(url, timeout=10, suppress_origin=True, enable_multithread=True)
+            ws.settimeout(None)
+            return ws
+
+        return cls(await asyncio.to_thread(open_socket))
+
+    async def send(self, method: str, params: dict = None, session_id: str = None, timeout: float = 30):
+        if self._error:
+            raise self._error
+        self._next_id += 1
+        message_id = self._next_id
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = self._loop.create_future()
+        self._pending[message_id] = future
+        self.messages += 1
+        try:
+            try:
+                await asyncio.to_thread(self._ws.send, json.dumps(message))
+            except (websocket.WebSocketException, OSError) as e:
+                raise ConnectionError(f"Conexiunea CDP s-a întrerupt: {e}") from e
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(message_id, None)
+
+    def expect(self, method: str, session_id: str = None):
+        """
+        Un future rezolvat cu parametrii următorului eveniment `method` al sesiunii.
+        Se creează înainte de comanda care declanșează evenimentul.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault((session_id, method), []).append(future)
+        return future
+
+    def forget(self, session_id: str):
+        for key in [key for key in self._waiters if key[0] == session_id]:
+            for future in self._waiters.pop(key):
+                future.cancel()
+
+    def _read_loop(self):
+        try:
+            while True:
+                text = self._ws.recv()
+                if not text:
+                    raise ConnectionError("Conexiunea WebSocket a fost închisă de browser")
+                self._loop.call_soon_threadsafe(self._dispatch, json.loads(text))
+        except (websocket.WebSocketException, ConnectionError, OSError) as e:
+            if not self._closing:
+                try:
+                    self._loop.call_soon_threadsafe(self._fail, ConnectionError(f"Conexiunea CDP s-a întrerupt: {e}"))
+                except RuntimeError:
+                    pass  # bucla asyncio s-a închis deja
+
+    def _dispatch(self, message: dict):
+        if 'id' in message:
+            future = self._pending.get(message['id'])
+            if future is None or future.done():
+                return
+            if 'error' in message:
+                future.set_exception(CdpError(message['error'].get('message', message['error'])))
+            else:
+                future.set_result(message.get('result', {}))
+            return
+        for future in self._waiters.pop((message.get('sessionId'), message.get('method')), []):
+            if not future.done():
+                future.set_result(message.get('params', {}))
+
+    def _fail(self, error: ConnectionError):
+        self._error = error
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        for futures in self._waiters.values():
+            for future in futures:
+                future.cancel()
+        self._waiters.clear()
+
+    async def close(self):
+        self._closing = True
+        # abort() trezește thread-ul blocat în recv(); browserul tolerează închiderea fără cadrul close
+        self._ws.abort()
+        self._ws.shutdown()
+        await asyncio.to_thread(self._reader.join, 5)
+
+
+class Tab:
+    """
+    Un tab al browserului și sesiunea CDP atașată lui. `page` este casa de pariuri a cărei
+    pagină e încărcată (MaxBet și Spin caută din pagina deja deschisă, fără reîncărcare).
+    """
+
+    def __init__(self, cdp: CdpConnection, target_id: str, session_id: str):
+        self.cdp = cdp
+        self.target_id = target_id
+        self.session_id = session_id
+        self.page = None
+        self.blocked_for = None
+        self.searches = 0
+
+    async def send(self, method: str, params: dict = None, timeout: float = 30):
+        return await self.cdp.send(method, params, self.session_id, timeout)
+
+    async def goto(self, url: str, timeout: float = 30):
+        """
+        Navighează și așteaptă DOMContentLoaded (rândurile se așteaptă explicit după aceea).
+        """
+        loaded = self.cdp.expect('Page.domContentEventFired', self.session_id)
+        result = await self.send('Page.navigate', {'url': url}, timeout)
+        if result.get('errorText'):
+            loaded.cancel()
+            raise CdpError(f"Navigare eșuată ({result['errorText']}): {url}")
+        await asyncio.wait_for(loaded, timeout)
+
+    async def _evaluate(self, expression: str, timeout: float):
+        result = await self.send('Runtime.evaluate', {'expression': expression, 'returnByValue': True,
+                                                      'awaitPromise': True}, timeout)
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise CdpError(details.get('exception', {}).get('description') or details.get('text'))
+        return result['result'].get('value')
+
+    async def call(self, script: str, *args, timeout: float = 30):
+        """
+        Echivalentul execute_script: `script` folosește `arguments` și `return`.
+        """
+        return await self._evaluate(f"(function () {{ {script} }}).apply(null, {json.dumps(args)})", timeout)
+
+    async def call_async(self, script: str, *args, timeout: float = 30):
+        """
+        Echivalentul execute_async_script: callback-ul de terminare este ultimul argument.
+        """
+        return await self._evaluate(
+            f"new Promise(done => (function () {{ {script} }}).apply(null, {json.dumps(args)}.concat([done])))", timeout)
+
+    async def type_into(self, css: str, text: str, char_delay: float = 0.1, enter: bool = False,
+                        timeout: float = 10):
+        """
+        Tastează `text` caracter cu caracter în câmpul `css` (evenimente reale de input),
+        opțional urmat de Enter. Pauzele dintre taste nu țin ocupat niciun alt tab.
+        """
+        if not await self.call_async(_FOCUS_JS, css, int(timeout * 1000), timeout=timeout + 5):
+            raise TimeoutError(f"Câmpul '{css}' nu a apărut în {timeout}s")
+        for char in text:
+            await self.send('Input.insertText', {'text': char})
+            await asyncio.sleep(char_delay)
+        if enter:
+            key = {'key': 'Enter', 'code': 'Enter', 'windowsVirtualKeyCode': 13, 'nativeVirtualKeyCode': 13}
+            await self.send('Input.dispatchKeyEvent', dict(key, type='keyDown', text='\r'))
+            await self.send('Input.dispatchKeyEvent', dict(key, type='keyUp'))
+        await self.call(_MARK_INPUT_JS)
+
+    async def wait_results(self, css: str, quiet_ms: int = 500, timeout: float = 10) -> int:
+        return await self.call_async(_RESULTS_JS, css, quiet_ms, int(timeout * 1000), timeout=timeout + 5)
+
+
+# --- Fluxurile de căutare (un termen, un tab) ---
+# Întorc [(data, echipa1, echipa2, cote)], ca search_events/search_rows din scraper-e
+
+async def _search_superbet(engine, tab, term, ref_date):
+    css = "div.event-card.e2e-event-row.event-row-container__event"
+    await tab.goto(engine.url(f"https://superbet.ro/cautare?query={quote(term)}"))
+    tab.page = 'superbet'
+    await tab.wait_results(css)
+    rows = await tab.call(_SUPERBET_JS, css)
+    return [(None, row['team1'], row['team2'], row['odds']) for row in rows if row['team1'] and row['team2']]
+
+
+async def _search_maxbet(engine, tab, term, ref_date):
+    css = "div.tbody event"
+    if tab.page != 'maxbet':
+        await tab.goto(engine.url(BOOKMAKER_HOME['maxbet']))
+        tab.page = 'maxbet'
+    await tab.type_into("input[type='text'][placeholder='Căutare']", term, CHAR_DELAY['maxbet'], timeout=20)
+    await tab.wait_results(css)
+    return events_to_found(await tab.call(_MAXBET_JS, css))
+
+
+async def _search_spin(engine, tab, term, ref_date):
+    css = "div.contenitoreRiga"
+    if tab.page != 'spin':
+        await tab.goto(engine.url(BOOKMAKER_HOME['spin']))
+        tab.page = 'spin'
+    await tab.type_into("div.widget-ricerca-side input#match-search-input", term, CHAR_DELAY['spin'], enter=True)
+    if not await tab.wait_results(css):
+        return []
+    return rows_to_found(await tab.call(_SPIN_JS, css), ref_date)
+
+
+FLOWS = {
+    'superbet': _search_superbet,
+    'maxbet': _search_maxbet,
+    'spin': _search_spin,
+}
+
+
+def match_key(bookmaker: str, string_data, team1: str, team2: str):
+    """
+    Cheia după care un meci cerut este comparat cu un rând găsit: ID-urile canonice ale
+    echipelor și, în afară de Superbet (care nu afișează data în căutare), data.
+    """
+    if bookmaker == 'superbet':
+        return team_id(team1), team_id(team2)
+    return string_data, team_id(team1), team_id(team2)
+
+
+class TabEngine:
+    """
+    Un Chrome, multe tab-uri. Folosire:
+
+        async with TabEngine(max_tabs=24) as engine:
+            odds = await engine.lookup('maxbet', [('07/06', 'Malta', 'Lituania')])
+
+    `driver` permite refolosirea unei sesiuni existente (altfel se pornește una 'lean');
+    `cookie_jar` este fișierul JSON în care se păstrează cookies-urile cu consimțământul;
+    `rewrite` transformă adresele site-urilor (ex. către serverul local din bench_scrapers).
+    Un tab este închis după o eroare sau după `max_uses` căutări.
+    """
+
+    def __init__(self, max_tabs: int = DEFAULT_MAX_TABS, per_site: dict = None, min_gap: float = DEFAULT_MIN_GAP,
+                 driver=None, headless: bool = True, cookie_jar: str = None, consent_timeout: float = None,
+                 search_timeout: float = 60, max_uses: int = 50, rewrite=None):
+        self.max_tabs = max_tabs
+        self.per_site = dict(DEFAULT_PER_SITE, **(per_site or {}))
+        self.min_gap = min_gap
+        self.driver = driver
+        self.headless = headless
+        self.cookie_jar = cookie_jar
+        self.consent_timeout = consent_timeout
+        self.search_timeout = search_timeout
+        self.max_uses = max_uses
+        self.rewrite = rewrite
+        self.cdp = None
+        self.stats = {'tabs_opened': 0, 'tabs_peak': 0, 'searches': 0, 'errors': 0}
+        self._owns_driver = driver is None
+        self._tabs = set()
+        self._idle = []
+        self._consented = set()
+
+    def url(self, url: str) -> str:
+        return self.rewrite(url) if self.rewrite else url
+
+    async def start(self):
+        if self.driver is None:
+            self.driver = await asyncio.to_thread(create_driver, self.headless, 'lean')
+        address = self.driver.capabilities['goog:chromeOptions']['debuggerAddress']
+        self.cdp = await CdpConnection.connect(address)
+        self._tab_slots = asyncio.Semaphore(self.max_tabs)
+        self._site_slots = {bookmaker: asyncio.Semaphore(n) for bookmaker, n in self.per_site.items()}
+        self._site_gates = {bookmaker: asyncio.Lock() for bookmaker in self.per_site}
+        self._site_last = {}
+        self._driver_lock = asyncio.Lock()
+        if self.cookie_jar and os.path.exists(self.cookie_jar):
+            await self.load_cookies(self.cookie_jar)
+        return self
+
+    async def close(self):
+        for tab in list(self._tabs):
+            await self._close_tab(tab)
+        if self.cdp is not None:
+            await self.cdp.close()
+            self.cdp = None
+        if self._owns_driver and self.driver is not None:
+            await asyncio.to_thread(self.driver.quit)
+            self.driver = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    # --- Cookies și consimțământ ---
+
+    async def load_cookies(self, path: str):
+        """
+        Încarcă în browser cookies-urile salvate cu save_cookies; casele de pariuri care au
+        cookies în fișier nu mai trec prin dialogul de consimțământ.
+        """
+        with open(path, encoding='utf-8') as f:
+            cookies = json.load(f)
+        now = time.time()
+        cookies = [c for c in cookies if c.get('expires', -1) <= 0 or c['expires'] > now]
+        if cookies:
+            await self.cdp.send('Storage.setCookies', {'cookies': cookies})
+        for bookmaker, home in BOOKMAKER_HOME.items():
+            host = urlsplit(self.url(home)).hostname
+            if any(host.endswith(c['domain'].lstrip('.')) for c in cookies):
+                self._consented.add(bookmaker)
+
+    async def save_cookies(self, path: str):
+        cookies = (await self.cdp.send('Storage.getCookies'))['cookies']
+        cookies = [{k: c[k] for k in _COOKIE_FIELDS if k in c and not (k == 'expires' and c.get('session'))}
+                   for c in cookies]
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cookies, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def _ensure_consent(self, bookmaker: str):
+        # Dialogul se acceptă o singură dată, în fereastra driverului; tab-urile văd aceleași cookies
+        async with self._driver_lock:
+            if bookmaker in self._consented:
+                return
+
+            def accept():
+                self.driver.get(self.url(BOOKMAKER_HOME[bookmaker]))
+                if self.consent_timeout is None:
+                    CONSENT_HANDLERS[bookmaker](self.driver)
+                else:
+                    CONSENT_HANDLERS[bookmaker](self.driver, self.consent_timeout)
+
+            with telemetry.span('consent', bookmaker=bookmaker, engine='tabs'):
+                await asyncio.to_thread(accept)
+            self._consented.add(bookmaker)
+            if self.cookie_jar:
+                await self.save_cookies(self.cookie_jar)
+
+    # --- Tab-uri ---
+
+    async def _open_tab(self) -> Tab:
+        target = await self.cdp.send('Target.createTarget', {'url': 'about:blank'})
+        attached = await self.cdp.send('Target.attachToTarget', {'targetId': target['targetId'], 'flatten': True})
+        tab = Tab(self.cdp, target['targetId'], attached['sessionId'])
+        self._tabs.add(tab)
+        # Contorul de cereri este instalat înaintea scripturilor paginii, la fiecare încărcare;
+        # tab-urile din fundal se comportă ca unul focalizat (tastare, timere)
+        await asyncio.gather(tab.send('Page.enable'),
+                             tab.send('Page.addScriptToEvaluateOnNewDocument', {'source': _NETWORK_TRACKER_JS}),
+                             tab.send('Emulation.setFocusEmulationEnabled', {'enabled': True}))
+        self.stats['tabs_opened'] += 1
+        self.stats['tabs_peak'] = max(self.stats['tabs_peak'], len(self._tabs))
+        telemetry.count('tabs_opened_total')
+        return tab
+
+    async def _close_tab(self, tab: Tab):
+        self._tabs.discard(tab)
+        self.cdp.forget(tab.session_id)
+        try:
+            await self.cdp.send('Target.closeTarget', {'targetId': tab.target_id}, timeout=5)
+        except (CdpError, ConnectionError, TimeoutError, asyncio.TimeoutError):
+            pass
+
+    async def _acquire_tab(self, bookmaker: str) -> Tab:
+        # Întâi un tab cu pagina casei deja încărcată, apoi orice tab liber, apoi unul nou
+        tab = next((t for t in self._idle if t.page == bookmaker), None) or (self._idle[0] if self._idle else None)
+        if tab is not None:
+            self._idle.remove(tab)
+        else:
+            tab = await self._open_tab()
+        if tab.blocked_for != bookmaker and getattr(self.driver, 'browser_profile', 'full') == 'lean':
+            # Blocarea resurselor este per tab, cu lista permisă a casei de pariuri
+            if tab.blocked_for is None:
+                await tab.send('Network.enable')
+            await tab.send('Network.setBlockedURLs', {'urls': blocked_url_patterns(bookmaker)})
+            tab.blocked_for = bookmaker
+        return tab
+
+    async def _release_tab(self, tab: Tab, healthy: bool):
+        if healthy and tab.searches < self.max_uses and tab in self._tabs:
+            self._idle.append(tab)
+        else:
+            await self._close_tab(tab)
+
+    async def _polite(self, bookmaker: str):
+        async with self._site_gates[bookmaker]:
+            delay = self._site_last.get(bookmaker, 0.0) + self.min_gap - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._site_last[bookmaker] = time.monotonic()
+
+    async def _search(self, bookmaker: str, term: str, ref_date: date):
+        # Semaforul casei înaintea celui global, ca o casă saturată să nu țină tab-uri ocupate
+        async with self._site_slots[bookmaker], self._tab_slots:
+            await self._polite(bookmaker)
+            tab = await self._acquire_tab(bookmaker)
+            started = time.perf_counter()
+            healthy = False
+            try:
+                rows = await asyncio.wait_for(FLOWS[bookmaker](self, tab, term, ref_date), self.search_timeout)
+                healthy = True
+                return rows
+            except Exception as e:
+                # Orice eroare a fluxului (CDP, timeout, un payload schimbat al extractorului) pierde
+                # doar această căutare: tab-ul este închis, iar gather-ul din lookup continuă
+                print(f"[{bookmaker}] Eroare la căutarea '{term}': {type(e).__name__}: {e}")
+                self.stats['errors'] += 1
+                telemetry.count('tab_search_errors_total', bookmaker=bookmaker)
+                return []
+            finally:
+                tab.searches += 1
+                self.stats['searches'] += 1
+                telemetry.observe('phase_seconds', time.perf_counter() - started, phase='tab_search',
+                                  bookmaker=bookmaker)
+                await self._release_tab(tab, healthy)
+
+    async def lookup(self, bookmaker: str, fixtures, ref_date: date = None) -> dict:
+        """
+        Caută cotele meciurilor (data, echipa1, echipa2) pe `bookmaker`, cu data în formatul
+        scraper-ului casei (Superbet o ignoră). Meciurile sunt grupate după termenul de căutare
+        și fiecare termen rulează în propriul tab, în paralel. Întoarce {meci: cote sau None}.
+        """
+        if bookmaker not in FLOWS:
+            raise ValueError(f"Casă de pariuri necunoscută: '{bookmaker}'")
+        ref_date = ref_date or date.today()
+        results = {fixture: None for fixture in fixtures}
+        pending = {}
+        for fixture in results:
+            pending.setdefault(match_key(bookmaker, *fixture), []).append(fixture)
+        if not results:
+            return results
+
+        await self._ensure_consent(bookmaker)
+        groups = group_by_search_term(list(results), normalize=team_id)
+        found = await asyncio.gather(*(self._search(bookmaker, term, ref_date) for term in groups))
+
+        for rows in found:
+            for string_data, team1, team2, odds in rows:
+                if odds is None:
+                    continue
+                requested = pending.pop(match_key(bookmaker, string_data, team1, team2), None)
+                for fixture in requested or ():
+                    results[fixture] = odds
+        hits = sum(odds is not None for odds in results.values())
+        telemetry.count('fixtures_found_total', hits, bookmaker=bookmaker)
+        telemetry.count('fixtures_not_found_total', len(results) - hits, bookmaker=bookmaker)
+        return results
+
+    async def lookup_many(self, requests: dict, ref_date: date = None) -> dict:
+        """
+        {casă: [meciuri]} -> {casă: {meci: cote sau None}}, toate casele în paralel.
+        """
+        lookups = await asyncio.gather(*(self.lookup(b, fixtures, ref_date) for b, fixtures in requests.items()))
+        return dict(zip(requests, lookups))
+
+
+def scrape_many(requests: dict, **engine_options) -> dict:
+    """
+    Varianta sincronă a TabEngine.lookup_many, pentru apelanții fără buclă asyncio.
+    """
+    async def run():
+        async with TabEngine(**engine_options) as engine:
+            return await engine.lookup_many(requests)
+
+    return asyncio.run(run())
+
+
+def requests_from_fixtures(fixtures, bookmakers=tuple(FLOWS)) -> dict:
+    """
+    Din meciuri (data "zz/ll/aaaa hh:mm", echipa1, echipa2) construiește cererile fiecărei
+    case, cu data în formatul scraper-ului ei. O dată în alt format este trimisă neschimbată.
+    """
+    requests = {bookmaker: [] for bookmaker in bookmakers}
+    for string_data, team1, team2 in fixtures:
+        try:
+            kickoff = datetime.strptime(string_data, DATE_FORMAT)
+        except ValueError:
+            kickoff = None
+        dates = {
+            'superbet': string_data,
+            'maxbet': kickoff.strftime("%d/%m") if kickoff else string_data,
+            'spin': string_data,
+        }
+        for bookmaker in bookmakers:
+            requests[bookmaker].append((dates[bookmaker], team1, team2))
+    return requests
+
+
+@telemetry.run('tab_engine')
+def main(args):
+    def option(name, default=None):
+        return args[args.index(name) + 1] if name in args else default
+
+    bookmakers = option('--bookmakers', ','.join(FLOWS)).split(',')
+    unknown = [b for b in bookmakers if b not in FLOWS]
+    if unknown:
+        print(f"Case de pariuri necunoscute: {unknown}. Disponibile: {', '.join(FLOWS)}")
+        sys.exit(1)
+    requests = requests_from_fixtures(load_fixtures(option('--batch')), bookmakers)
+    per_site = int(option('--per-site', 0))
+    started = time.perf_counter()
+    results = scrape_many(requests, max_tabs=int(option('--tabs', DEFAULT_MAX_TABS)),
+                          per_site={b: per_site for b in FLOWS} if per_site else None,
+                          headless='--headful' not in args, cookie_jar=option('--cookies'))
+    elapsed = time.perf_counter() - started
+
+    output = option('--output')
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    try:
+        for bookmaker, found in results.items():
+            for (string_data, team1, team2), odds in found.items():
+                out.write(json.dumps({'bookmaker': bookmaker, 'date': string_data, 'team1': team1,
+                                      'team2': team2, 'odds': odds}, ensure_ascii=False) + '\n')
+    finally:
+        if output:
+            out.close()
+    total = sum(len(found) for found in results.values())
+    hits = sum(odds is not None for found in results.values() for odds in found.values())
+    print(f"{hits}/{total} cote găsite în {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    # python tab_engine.py --batch meciuri.csv [--bookmakers superbet,maxbet,spin] [--tabs 24]
+    #                      [--per-site 8] [--cookies cookies.json] [--output cote.jsonl] [--headful]
+    if '--batch' not in sys.argv:
+        print("Usage: python tab_engine.py --batch <meciuri.csv> [--bookmakers superbet,maxbet,spin] [--tabs N]")
+        print("       [--per-site N] [--cookies cookies.json] [--output cote.jsonl] [--headful]")
+        sys.exit(1)
+    main(sys.argv[1:])
@@ -0,0 +1,191 @@
+import json
+import os
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'team_aliases.json')
+
+# Cuvinte care nu deosebesc echipele între ele ("FC Barcelona" == "Barcelona")
+_NOISE_TOKENS = {'fc', 'afc', 'cf', 'sc', 'cd', 'fk', 'ac'}
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+# Cuvinte care deosebesc o echipă de echipa mare a clubului: feminin, tineret, a doua echipă.
+# "Chelsea W" sau "Barcelona B" nu sunt niciodată aceeași echipă cu "Chelsea"/"Barcelona".
+_DISTINGUISHING_TOKENS = {'w', 'women', 'womens', 'ladies', 'fem', 'feminin', 'femenino', 'feminine', 'frauen',
+                          'b', 'c', 'ii', 'iii', 'reserve', 'reserves', 'res', 'castilla', 'youth', 'academy',
+                          'junior', 'juniors', 'jun', 'sub', 'olympic'}
+_AGE_TOKEN = re.compile(r'^u\d{2}$')
+
+# Rezultatul unei rezolvări: ID-ul canonic, numele canonic (ca în E0.csv) și încrederea 0..1
+TeamMatch = namedtuple('TeamMatch', ['team_id', 'name', 'score'])
+
+
+@lru_cache(maxsize=8192)
+def fold(name: str) -> str:
+    """
+    Forma normalizată a unui nume de echipă: fără diacritice (inclusiv ș/ş, ț/ţ),
+    litere mici, fără punctuație și fără "FC"/"AFC"/... ("Atlético Madrid" -> "atletico madrid").
+    """
+    decomposed = unicodedata.normalize('NFKD', name.lower())
+    ascii_only = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    tokens = [t for t in _NON_ALNUM.split(ascii_only) if t and t not in _NOISE_TOKENS]
+    return ' '.join(tokens)
+
+
+def distinguishing_tokens(folded: str) -> frozenset:
+    """
+    Cuvintele din numele normalizat care marchează echipa feminină, de tineret sau secundă.
+    """
+    return frozenset(t for t in folded.split() if t in _DISTINGUISHING_TOKENS or _AGE_TOKEN.match(t))
+
+
+def trigrams(folded: str) -> set:
+    padded = f"  {folded} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamIndex:
+    """
+    Index de nume de echipe: tabela de aliasuri (normalizate o singură dată la încărcare)
+    plus un index inversat de trigrame pentru numele care nu apar în tabelă.
+    Orice nume afișat de o casă de pariuri este rezolvat la un ID canonic, astfel încât
+    scraper-ele și predictorul compară ID-uri, nu șiruri.
+
+    ID-ul (cheia după care se unesc cotele caselor) vine doar dintr-un alias exact sau din
+    aceleași cuvinte în altă ordine; scorul pe trigrame doar propune aliasuri (`suggest`),
+    pentru că "Chelsea W" sau "Liverpool U21" seamănă mult cu echipa mare, dar nu sunt ea.
+    """
+
+    def __init__(self, teams: dict, min_score: float = 0.6):
+        self.min_score = min_score
+        self.names = {}            # ID -> nume canonic
+        self._exact = {}           # alias normalizat -> ID
+        self._token_sets = {}      # mulțimea cuvintelor aliasului -> ID
+        self._alias_grams = []     # [(ID, număr de trigrame, cuvinte distinctive)]
+        self._postings = defaultdict(list)  # trigramă -> indici în _alias_grams
+        self._cache = {}           # nume normalizat -> TeamMatch sau None
+        for team_id, info in teams.items():
+            self.names[team_id] = info['name']
+            for alias in [info['name']] + list(info.get('aliases', ())):
+                self.add_alias(team_id, alias)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_ALIASES_PATH, **kwargs):
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    def add_alias(self, team_id: str, alias: str):
+        folded = fold(alias)
+        if not folded or folded in self._exact:
+            return
+        self._exact[folded] = team_id
+        self._token_sets.setdefault(frozenset(folded.split()), team_id)
+        grams = trigrams(folded)
+        slot = len(self._alias_grams)
+        self._alias_grams.append((team_id, len(grams), distinguishing_tokens(folded)))
+        for gram in grams:
+            self._postings[gram].append(slot)
+        self._cache.clear()
+
+    def _match(self, folded: str):
+        team_id = self._exact.get(folded)
+        if team_id is None:
+            team_id = self._token_sets.get(frozenset(folded.split()))
+        if team_id is None:
+            return None
+        return TeamMatch(team_id, self.names[team_id], 1.0)
+
+    def suggest(self, name: str, limit: int = 3, min_score: float = None):
+        """
+        Echipele cunoscute cele mai apropiate de `name` după trigrame, ca propuneri de aliasuri
+        de adăugat în team_aliases.json: [TeamMatch], descrescător după scor. Candidații cu alte
+        cuvinte distinctive (feminin, U21, B, ...) sunt excluși.
+        """
+        folded = fold(name or '')
+        grams = trigrams(folded)
+        marks = distinguishing_tokens(folded)
+        shared = defaultdict(int)
+        for gram in grams:
+            for slot in self._postings.get(gram, ()):
+                shared[slot] += 1
+
+        # Coeficientul Dice pe trigrame; păstrăm cel mai bun scor per echipă
+        best = {}
+        for slot, common in shared.items():
+            candidate, size, candidate_marks = self._alias_grams[slot]
+            if candidate_marks != marks:
+                continue
+            score = 2.0 * common / (len(grams) + size)
+            if score > best.get(candidate, 0.0):
+                best[candidate] = score
+        ranked = sorted(best.items(), key=lambda item: item[1], reverse=True)
+        # Un nume la fel de apropiat de două echipe ("Manchester") este ambiguu
+        if len(ranked) > 1 and ranked[1][1] >= ranked[0][1] - 0.05:
+            ranked[0] = (ranked[0][0], ranked[0][1] / 2)
+            ranked.sort(key=lambda item: item[1], reverse=True)
+        threshold = self.min_score if min_score is None else min_score
+        return [TeamMatch(team_id, self.names[team_id], round(score, 3))
+                for team_id, score in ranked[:limit] if score >= threshold]
+
+    def resolve(self, name: str):
+        """
+        Întoarce TeamMatch(team_id, name, 1.0) pentru un nume afișat pe site care este un
+        alias cunoscut (eventual cu cuvintele în altă ordine), altfel None.
+        """
+        folded = fold(name or '')
+        if folded not in self._cache:
+            self._cache[folded] = self._match(folded) if folded else None
+        return self._cache[folded]
+
+    def resolve_many(self, names):
+        """
+        Rezolvă o listă de nume (ex. toate echipele unei pagini); fiecare nume distinct
+        este căutat o singură dată. Întoarce o listă de TeamMatch sau None, în aceeași ordine.
+        """
+        resolved = {}
+        out = []
+        for name in names:
+            if name not in resolved:
+                resolved[name] = self.resolve(name)
+            out.append(resolved[name])
+        return out
+
+    def team_id(self, name: str) -> str:
+        """
+        ID-ul canonic al echipei; pentru echipele necunoscute, numele normalizat
+        ("Real Sociedad" -> "real_sociedad", "Chelsea W" -> "chelsea_w").
+        """
+        match = self.resolve(name)
+        if match is not None:
+            return match.team_id
+        return fold(name or '').replace(' ', '_')
+
+
+_INDEXES = {}
+
+
+def get_index(path: str = DEFAULT_ALIASES_PATH) -> TeamIndex:
+    """
+    Indexul încărcat o singură dată per proces pentru fișierul de aliasuri dat.
+    """
+    if path not in _INDEXES:
+        _INDEXES[path] = TeamIndex.load(path)
+    return _INDEXES[path]
+
+
+def team_id(name: str) -> str:
+    return get_index().team_id(name)
+
+
+if __name__ == '__main__':
+    import sys
+    # python team_index.py "Manchester Utd" "Atlético Madrid" ...
+    index = get_index()
+    for name in sys.argv[1:]:
+        match = index.resolve(name)
+        if match is not None:
+            print(f"{name!r} -> {match}")
+        else:
+            print(f"{name!r} -> necunoscut ({index.team_id(name)}); aliasuri propuse: {index.suggest(name, min_score=0.0)}")
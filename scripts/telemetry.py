@@ -0,0 +1,468 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Totul e dezactivat implicit; oricare dintre variabilele de mai jos pornește instrumentarea
+ENV_LOG = 'SCRAPER_TELEMETRY_LOG'          # fișier JSON lines ('-' pentru stderr)
+ENV_PORT = 'SCRAPER_TELEMETRY_PORT'        # endpoint Prometheus local: http://127.0.0.1:<port>/metrics
+ENV_STATSD = 'SCRAPER_TELEMETRY_STATSD'    # host:port, metrice trimise prin UDP în format StatsD
+ENV_PROFILE = 'SCRAPER_PROFILE'            # fișier pentru stivele eșantionate ('1' = nume implicit)
+ENV_PROFILE_HZ = 'SCRAPER_PROFILE_HZ'      # eșantioane pe secundă (implicit 100)
+ENV_RUN_ID = 'SCRAPER_RUN_ID'              # moștenit de subprocese, ca ele să scrie în aceeași rulare
+
+# Limitele (secunde) histogramelor de durată
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_enabled = False
+_lock = threading.Lock()
+_local = threading.local()
+_counters = {}
+_histograms = {}
+_run = {'id': None, 'name': None, 'started': None}
+_log_file = None
+_statsd = None
+_exporter = None
+_profiler = None
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * (len(DEFAULT_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        i = 0
+        while i < len(DEFAULT_BUCKETS) and value > DEFAULT_BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _key(name: str, labels: dict):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+def _write_log(record: dict):
+    if _log_file is None:
+        return
+    record = dict(ts=round(time.time(), 3), run_id=_run['id'], pid=os.getpid(), **record)
+    line = json.dumps(record, ensure_ascii=False, default=str) + '\n'
+    with _lock:
+        _log_file.write(line)
+        _log_file.flush()
+
+
+def _send_statsd(name: str, value, kind: str, labels):
+    if _statsd is None:
+        return
+    sock, address = _statsd
+    tags = '|#' + ','.join(f"{k}:{v}" for k, v in labels) if labels else ''
+    try:
+        sock.sendto(f"scraper.{name}:{value}|{kind}{tags}".encode(), address)
+    except OSError:
+        pass
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def count(name: str, value: float = 1, **labels):
+    """
+    Adună `value` la contorul `name` (ex. rânduri extrase, roundtrip-uri WebDriver).
+    """
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+    _send_statsd(name, value, 'c', key[1])
+
+
+def observe(name: str, seconds: float, **labels):
+    """
+    Înregistrează o durată în histograma `name`.
+    """
+    if not _enabled:
+        return
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = _Histogram()
+        histogram.observe(seconds)
+    _send_statsd(name, round(seconds * 1000, 3), 'ms', key[1])
+
+
+def log(event: str, **fields):
+    """
+    Scrie un eveniment structurat în jurnalul JSON lines al rulării.
+    """
+    if _enabled:
+        _write_log(dict(event=event, **fields))
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'attrs', 'parent', 'started')
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.started
+        _local.stack.pop()
+        labels = {'bookmaker': self.attrs.get('bookmaker')}
+        observe('phase_seconds', seconds, phase=self.name, **labels)
+        record = dict(event='span', span=self.name, parent=self.parent, ms=round(seconds * 1000, 2),
+                      thread=threading.current_thread().name, **self.attrs)
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+            count('phase_errors_total', phase=self.name, **labels)
+        _write_log(record)
+        return False
+
+    def set(self, **attrs):
+        """Adaugă atribute (ex. rows=...) care apar în linia de jurnal a span-ului."""
+        self.attrs.update(attrs)
+
+
+def span(name: str, **attrs):
+    """
+    Măsoară o fază (pornire driver, încărcare pagină, consimțământ, căutare, scroll, extragere):
+        with telemetry.span('page_load', bookmaker='spin'):
+            driver.get(url)
+    Durata intră în histograma phase_seconds{phase=name} și în jurnal, cu faza părinte.
+    Dezactivat, întoarce un obiect gol comun, deci costul este un test și un apel.
+    """
+    if not _enabled:
+        return _NOOP_SPAN
+    return _Span(name, attrs)
+
+
+def traced(name: str, **attrs):
+    """
+    Decorator: fiecare apel al funcției este un span `name`.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name, dict(attrs)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _new_run_id() -> str:
+    import uuid
+    return uuid.uuid4().hex[:12]
+
+
+@contextmanager
+def run(name: str, **attrs):
+    """
+    O rulare separată (ex. un fetch_all_odds într-un proces de lungă durată): ID nou, scris
+    în toate liniile de jurnal și moștenit de subprocesele pornite în interior, plus un sumar
+    al contoarelor la final. Se poate folosi și ca decorator.
+    """
+    if not _enabled:
+        yield
+        return
+    previous = dict(_run)
+    previous_env = os.environ.get(ENV_RUN_ID)
+    before = dict(_counters)
+    _run.update(id=_new_run_id(), name=name, started=time.perf_counter())
+    os.environ[ENV_RUN_ID] = _run['id']
+    _write_log(dict(event='run_start', name=name, parent_run=previous['id'], **attrs))
+    try:
+        with _Span(name, dict(attrs)):
+            yield
+    finally:
+        _write_log(dict(event='run_end', name=name, seconds=round(time.perf_counter() - _run['started'], 3),
+                        counters=_counter_summary(before)))
+        _run.update(previous)
+        if previous_env is None:
+            os.environ.pop(ENV_RUN_ID, None)
+        else:
+            os.environ[ENV_RUN_ID] = previous_env
+
+
+def adopt_run(run_id: str):
+    """
+    Scrie liniile următoare în rularea `run_id` a altui proces (ex. un worker persistent,
+    care primește cu fiecare sarcină ID-ul rulării care a trimis-o).
+    """
+    if run_id:
+        _run['id'] = run_id
+        os.environ[ENV_RUN_ID] = run_id
+
+
+def _counter_summary(before=None) -> dict:
+    with _lock:
+        items = list(_counters.items())
+    summary = {}
+    for (name, labels), value in items:
+        value -= (before or {}).get((name, labels), 0)
+        if value:
+            label = ','.join(f"{k}={v}" for k, v in labels)
+            summary[f"{name}{{{label}}}" if label else name] = value
+    return summary
+
+
+def instrument_driver(driver, bookmaker: str = None):
+    """
+    Numără fiecare comandă WebDriver (roundtrip) și durata ei, pe tip de comandă.
+    Toate comenzile, inclusiv cele ale elementelor, trec prin driver.execute.
+    Dezactivat, întoarce driverul neatins.
+    """
+    if not _enabled or getattr(driver, '_telemetry_original_execute', None) is not None:
+        return driver
+    original = driver.execute
+
+    def execute(command, params=None):
+        started = time.perf_counter()
+        try:
+            return original(command, params)
+        finally:
+            count('webdriver_roundtrips_total', command=command, bookmaker=bookmaker)
+            observe('webdriver_command_seconds', time.perf_counter() - started, command=command, bookmaker=bookmaker)
+
+    driver._telemetry_original_execute = original
+    driver.execute = execute
+    return driver
+
+
+# --- Export ---
+
+def render_prometheus() -> str:
+    """
+    Contoarele și histogramele procesului în formatul text Prometheus.
+    """
+    def labels_text(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+        return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+    with _lock:
+        counters = sorted(_counters.items())
+        histograms = sorted((key, list(h.counts), h.sum, h.count) for key, h in _histograms.items())
+    lines, typed = [], set()
+    for (name, labels), value in counters:
+        metric = f"scraper_{name}"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric}{labels_text(labels)} {value}")
+    for (name, labels), counts, total, n in histograms:
+        metric = f"scraper_{name}"
+        if metric not in typed:
+            typed.add(metric)
+            lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, c in zip(list(DEFAULT_BUCKETS) + ['+Inf'], counts):
+            cumulative += c
+            lines.append(f"{metric}_bucket{labels_text(labels, [('le', bound)])} {cumulative}")
+        lines.append(f"{metric}_sum{labels_text(labels)} {total}")
+        lines.append(f"{metric}_count{labels_text(labels)} {n}")
+    return '\n'.join(lines) + '\n'
+
+
+def start_exporter(port: int = 0):
+    """
+    Pornește într-un thread endpoint-ul local /metrics. Întoarce (server, url).
+    """
+    # Importat aici: http.server (prin http.client, ssl, email) dublează timpul de import al modulului
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_response(404)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            body = render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='telemetry-exporter', daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/metrics"
+
+
+class SamplingProfiler:
+    """
+    Eșantionează periodic stivele tuturor thread-urilor (sys._current_frames) și le numără
+    în formatul "collapsed" (funcție;funcție;... număr), citit de flamegraph.pl sau speedscope.
+    Costul este pe thread-ul profiler-ului, nu pe codul măsurat.
+    """
+
+    def __init__(self, hz: float = 100):
+        self.interval = 1.0 / hz
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name='telemetry-profiler', daemon=True)
+
+    def _loop(self):
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                key = ';'.join([names.get(ident, str(ident))] + parts[::-1])
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, n in sorted(self.stacks.items(), key=lambda kv: -kv[1]):
+                f.write(f"{stack} {n}\n")
+
+
+# --- Configurare ---
+
+def configure(log_path: str = None, port: int = None, statsd: str = None, profile_path: str = None,
+              profile_hz: float = 100, run_id: str = None):
+    """
+    Pornește instrumentarea procesului. Apelată automat la import dacă este setată vreuna
+    dintre variabilele SCRAPER_TELEMETRY_* / SCRAPER_PROFILE; la ieșire se scriu sumarul
+    rulării și profilul.
+    """
+    global _enabled, _log_file, _statsd, _exporter, _profiler
+    _run.update(id=run_id or os.environ.get(ENV_RUN_ID) or _new_run_id(), name=os.path.basename(sys.argv[0]),
+                started=time.perf_counter())
+    os.environ[ENV_RUN_ID] = _run['id']
+    if log_path:
+        _log_file = sys.stderr if log_path == '-' else open(log_path, 'a', encoding='utf-8')
+    if statsd:
+        import socket
+        host, _, statsd_port = statsd.rpartition(':')
+        _statsd = (socket.socket(socket.AF_INET, socket.SOCK_DGRAM), (host or '127.0.0.1', int(statsd_port)))
+    if port is not None:
+        _exporter = start_exporter(port)[0]
+    if profile_path:
+        if profile_path == '1':
+            profile_path = f"profile-{_run['id']}-{os.getpid()}.folded"
+        _profiler = (SamplingProfiler(profile_hz).start(), profile_path.format(pid=os.getpid()))
+    _enabled = True
+    _write_log(dict(event='run_start', name=_run['name'], argv=sys.argv[1:]))
+    atexit.register(shutdown)
+
+
+def shutdown():
+    """
+    Scrie sumarul rulării (și profilul, dacă e pornit) și oprește exportul.
+    """
+    global _enabled, _profiler, _exporter, _log_file
+    if not _enabled:
+        return
+    _write_log(dict(event='run_end', name=_run['name'], seconds=round(time.perf_counter() - _run['started'], 3),
+                    counters=_counter_summary()))
+    if _profiler is not None:
+        profiler, path = _profiler
+        profiler.stop()
+        profiler.write(path)
+        _profiler = None
+    if _exporter is not None:
+        _exporter.shutdown()
+        _exporter = None
+    if _log_file is not None and _log_file is not sys.stderr:
+        _log_file.close()
+    _log_file = None
+    _enabled = False
+
+
+def _configure_from_env():
+    env = os.environ
+    if not any(env.get(name) for name in (ENV_LOG, ENV_PORT, ENV_STATSD, ENV_PROFILE)):
+        return
+    configure(log_path=env.get(ENV_LOG) or None,
+              port=int(env[ENV_PORT]) if env.get(ENV_PORT) else None,
+              statsd=env.get(ENV_STATSD) or None,
+              profile_path=env.get(ENV_PROFILE) or None,
+              profile_hz=float(env.get(ENV_PROFILE_HZ) or 100))
+
+
+_configure_from_env()
+
+
+if __name__ == '__main__':
+    # python telemetry.py summary <jurnal.jsonl> [run_id]
+    # Timpul total și numărul de apeluri pe fază (și casă de pariuri) dintr-un jurnal
+    if len(sys.argv) < 3 or sys.argv[1] != 'summary':
+        print("Usage: python telemetry.py summary <jurnal.jsonl> [run_id]")
+        sys.exit(1)
+    wanted = sys.argv[3] if len(sys.argv) > 3 else None
+    phases = {}
+    with open(sys.argv[2], encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get('event') != 'span' or (wanted and record.get('run_id') != wanted):
+                continue
+            key = (record['span'], record.get('bookmaker') or '-')
+            total, calls = phases.get(key, (0.0, 0))
+            phases[key] = (total + record['ms'], calls + 1)
+    for (phase, bookmaker), (total, calls) in sorted(phases.items(), key=lambda kv: -kv[1][0]):
+        print(f"{phase:<20} {bookmaker:<10} {calls:>6} apeluri {total / 1000:>10.3f} s")
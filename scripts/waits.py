@@ -0,0 +1,177 @@
+import time
+
+import telemetry
+
+# Contorizează cererile fetch/XHR în desfășurare, ca să putem aștepta "network idle"
+_NETWORK_TRACKER_JS = """
+if (!window.__scraperNet) {
+    const net = window.__scraperNet = {inflight: 0, last: performance.now()};
+    const begin = () => { net.inflight++; net.last = performance.now(); };
+    const end = () => { net.inflight = Math.max(0, net.inflight - 1); net.last = performance.now(); };
+    if (window.fetch) {
+        const origFetch = window.fetch;
+        window.fetch = function () {
+            begin();
+            return origFetch.apply(this, arguments).finally(end);
+        };
+    }
+    const origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        begin();
+        this.addEventListener('loadend', end, {once: true});
+        return origSend.apply(this, arguments);
+    };
+}
+"""
+
+_NETWORK_IDLE_JS = """
+const [idleMs, timeoutMs, done] = arguments;
+const net = window.__scraperNet;
+const start = performance.now();
+(function poll() {
+    const now = performance.now();
+    if (!net || (net.inflight === 0 && now - net.last >= idleMs)) return done(true);
+    if (now - start >= timeoutMs) return done(false);
+    setTimeout(poll, 50);
+})();
+"""
+
+# Se rezolvă după `quietMs` fără noduri noi care se potrivesc cu `css` (sau la timeout)
+_DOM_QUIET_JS = """
+const [css, quietMs, timeoutMs, done] = arguments;
+let timer = null, hard = null;
+const observer = new MutationObserver((mutations) => {
+    for (const m of mutations) {
+        for (const n of m.addedNodes) {
+            if (n.nodeType === 1 && (!css || n.matches(css) || n.querySelector(css))) {
+                clearTimeout(timer);
+                timer = setTimeout(() => finish(true), quietMs);
+                return;
+            }
+        }
+    }
+});
+function finish(quiet) {
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(hard);
+    done(quiet);
+}
+observer.observe(document.body, {childList: true, subtree: true});
+timer = setTimeout(() => finish(true), quietMs);
+hard = setTimeout(() => finish(false), timeoutMs);
+"""
+
+# Aduce ultimul rând în vizor (pentru liste virtualizate) și apoi derulează până jos
+_SCROLL_JS = """
+const rows = document.querySelectorAll(arguments[0]);
+if (rows.length) rows[rows.length - 1].scrollIntoView({block: 'end'});
+window.scrollTo(0, document.body.scrollHeight);
+return rows.length;
+"""
+
+
+def count_elements(driver, css: str) -> int:
+    """
+    Numără elementele care se potrivesc cu `css` într-un singur apel WebDriver.
+    """
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", css)
+
+
+def _run_async(driver, script, timeout, *args):
+    driver.set_script_timeout(timeout + 2)
+    return driver.execute_async_script(script, *args)
+
+
+def install_network_tracker(driver):
+    """
+    Instalează în pagină contorul de cereri fetch/XHR (idempotent).
+    Trebuie apelat după fiecare încărcare de pagină, înainte de acțiunea urmărită.
+    """
+    driver.execute_script(_NETWORK_TRACKER_JS)
+
+
+def wait_for_network_idle(driver, idle_ms: int = 500, timeout: float = 10) -> bool:
+    """
+    Așteaptă până când nu mai există cereri fetch/XHR în desfășurare de cel puțin
+    `idle_ms` milisecunde. Întoarce False dacă s-a atins timeout-ul.
+    """
+    install_network_tracker(driver)
+    return bool(_run_async(driver, _NETWORK_IDLE_JS, timeout, idle_ms, int(timeout * 1000)))
+
+
+def wait_for_dom_quiet(driver, css: str = None, quiet_ms: int = 500, timeout: float = 10) -> bool:
+    """
+    Așteaptă (prin MutationObserver) până când nu mai apar noduri noi `css`
+    timp de `quiet_ms` milisecunde. Întoarce False dacă s-a atins timeout-ul.
+    """
+    return bool(_run_async(driver, _DOM_QUIET_JS, timeout, css, quiet_ms, int(timeout * 1000)))
+
+
+def wait_for_count_stable(driver, css: str, stable_ms: int = 500, timeout: float = 10,
+                          min_count: int = 1, poll: float = 0.1) -> int:
+    """
+    Așteaptă până când numărul de elemente `css` este cel puțin `min_count` și
+    nu s-a mai schimbat timp de `stable_ms` milisecunde. Întoarce numărul final
+    (chiar dacă s-a atins timeout-ul).
+    """
+    deadline = time.monotonic() + timeout
+    last = count_elements(driver, css)
+    changed_at = time.monotonic()
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        current = count_elements(driver, css)
+        now = time.monotonic()
+        if current != last:
+            last, changed_at = current, now
+        elif current >= min_count and (now - changed_at) * 1000 >= stable_ms:
+            break
+    return last
+
+
+@telemetry.traced('wait_results')
+def wait_for_results(driver, css: str, quiet_ms: int = 500, timeout: float = 10) -> int:
+    """
+    Așteaptă rezultatele unei căutări: mai întâi liniște pe rețea, apoi un număr
+    stabil de rânduri `css`. Întoarce numărul de rânduri găsite (poate fi 0).
+    """
+    wait_for_network_idle(driver, quiet_ms, timeout)
+    return wait_for_count_stable(driver, css, stable_ms=quiet_ms, timeout=timeout, min_count=0)
+
+
+@telemetry.traced('scroll')
+def scroll_until_no_new_rows(driver, css: str, on_step=None, max_scrolls: int = 200,
+                             quiet_ms: int = 400, step_timeout: float = 5, patience: int = 2) -> int:
+    """
+    Derulează pagina până când nu mai apar rânduri noi, în loc de o înălțime sau un timp fix.
+
+    După fiecare scroll așteaptă până când nu mai sunt adăugate noduri `css` timp de
+    `quiet_ms`. Dacă `on_step(driver)` este dat, e apelat înainte de fiecare scroll și
+    după ultimul, și trebuie să întoarcă numărul de rânduri noi procesate (util pentru
+    liste virtualizate, unde numărul de noduri din DOM nu crește). Ne oprim după
+    `patience` scroll-uri consecutive fără rânduri noi. Întoarce numărul de scroll-uri.
+    """
+    install_network_tracker(driver)
+    last_count = count_elements(driver, css)
+    idle = 0
+    scrolls = 0
+    while scrolls < max_scrolls:
+        new_rows = on_step(driver) if on_step else 0
+        driver.execute_script(_SCROLL_JS, css)
+        scrolls += 1
+        wait_for_dom_quiet(driver, css, quiet_ms, step_timeout)
+        wait_for_network_idle(driver, quiet_ms // 2, step_timeout)
+
+        current = count_elements(driver, css)
+        if new_rows or current > last_count:
+            idle = 0
+        else:
+            idle += 1
+        last_count = current
+        if idle >= patience:
+            break
+
+    if on_step:
+        on_step(driver)
+    telemetry.count('scrolls_total', scrolls)
+    return scrolls